@@ -38,6 +38,7 @@ from leasing.models import (
     PlanUnit,
     PlanUnitIntendedUse,
     ServiceUnit,
+    ServiceUnitGroupMapping,
     Tenant,
     TenantContact,
 )
@@ -59,6 +60,13 @@ from plotsearch.models import (
     TargetStatus,
 )
 from users.models import User
+from utils.cache import reset_local_cache_versions
+
+
+@pytest.fixture(autouse=True)
+def reset_cache_versions():
+    # The versions of the rolled back tests must not be used
+    reset_local_cache_versions()
 
 
 @pytest.fixture()
@@ -376,6 +384,12 @@ class GroupFactory(factory.django.DjangoModelFactory):
         model = Group
 
 
+@register
+class ServiceUnitGroupMappingFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ServiceUnitGroupMapping
+
+
 @register
 class ReceivableTypeFactory(factory.django.DjangoModelFactory):
     @factory.lazy_attribute
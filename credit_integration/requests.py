@@ -15,6 +15,13 @@ from credit_integration.types import (
     WatchlistQueryParams,
     WatchListSearchResponse,
 )
+from integrations.http import get_session
+
+ASIAKASTIETO_SESSION_NAME = "asiakastieto"
+
+
+def _get_session() -> requests.Session:
+    return get_session(ASIAKASTIETO_SESSION_NAME)
 
 
 def request_company_decision(business_id, end_user):
@@ -35,7 +42,7 @@ def request_company_decision(business_id, end_user):
         f"&target={target}"
     )
 
-    response = requests.post(url, data=data, headers=headers)
+    response = _get_session().post(url, data=data, headers=headers)
     return response.json()
 
 
@@ -57,7 +64,7 @@ def request_consumer_decision(identity_number, end_user):
         f"&timestamp={timestamp}&checksum={checksum}&target={target}"
     )
 
-    response = requests.post(url, data=data, headers=headers)
+    response = _get_session().post(url, data=data, headers=headers)
     return response.json()
 
 
@@ -95,7 +102,7 @@ def request_company_sanctions(
         "format": "json",
     }
     url += f"?{_build_query_parameters(query_params)}"
-    response = requests.get(url, headers=headers)
+    response = _get_session().get(url, headers=headers)
     data: CompanySanctionsResponse = response.json()
 
     error_message: ErrorMessage = data["companyResponse"].get("errorMessage")
@@ -149,7 +156,7 @@ def request_consumer_sanctions(
     }
     url += f"?{_build_query_parameters(query_params)}"
 
-    response = requests.get(url, headers=headers)
+    response = _get_session().get(url, headers=headers)
     data: WatchListSearchResponse = response.json()
     error_message: ErrorMessage = data["watchListResponse"].get("errorMessage")
     if error_message is not None:
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from file_operations.scan_dispatcher import (
+    get_pending_scan_statuses,
+    scan_pending_files,
+)
+
+
+class Command(BaseCommand):
+    help = """Scan files that have not been scanned yet (PENDING) in concurrent batches.
+    Unlike enqueue_scan_for_pending, the scans are run in this process."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.FILE_SCAN_BATCH_SIZE,
+            help="Number of scan statuses updated at a time",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.FILE_SCAN_MAX_CONCURRENCY,
+            help="Maximum number of files sent to the scan service at a time",
+        )
+
+    def handle(self, *args, **options):
+        pending_scan_status_count = get_pending_scan_statuses().count()
+        self.stdout.write(
+            self.style.SUCCESS(f"About to scan {pending_scan_status_count} files.")
+        )
+
+        processed_count = scan_pending_files(
+            batch_size=options["batch_size"],
+            max_concurrency=options["concurrency"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"DONE, processed {processed_count}"))
@@ -1,12 +1,14 @@
 import logging
 import os
 import uuid
+from typing import Iterable
 
 import requests
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import Case, OuterRef, Q, QuerySet, Subquery, Value, When
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_q.tasks import async_task
@@ -20,6 +22,9 @@ from leasing.models.mixins import TimeStampedModel
 
 logger = logging.getLogger(__name__)
 
+# Attribute for the preloaded result of the latest scan of a file object
+LATEST_SCAN_RESULT_ATTRIBUTE = "latest_filescan_result"
+
 
 class FileScanStatus(TimeStampedModel):
     """
@@ -84,6 +89,17 @@ class FileScanStatus(TimeStampedModel):
             # Feature is not enabled, all files are considered safe.
             return FileScanResult.SAFE
 
+        # Use the result preloaded by `annotate_latest_scan_result` or
+        # `prefetch_latest_scan_results` when available
+        if hasattr(file_object, LATEST_SCAN_RESULT_ATTRIBUTE):
+            preloaded_result = getattr(file_object, LATEST_SCAN_RESULT_ATTRIBUTE)
+            if preloaded_result is None:
+                logger.warning(
+                    f"FileScanStatus not found for object {file_object.pk} of model {file_object._meta.label}"
+                )
+                return FileScanResult.PENDING
+            return FileScanResult(preloaded_result)
+
         # Find the latest filescan status for this file
         content_type = ContentType.objects.get_for_model(file_object)
         scan_status = (
@@ -104,6 +120,23 @@ class FileScanStatus(TimeStampedModel):
 
         return scan_status.scan_result()
 
+    @staticmethod
+    def scan_result_expression() -> Case:
+        """Database-side equivalent of `scan_result()`."""
+        return Case(
+            When(
+                file_deleted_at__isnull=False,
+                then=Value(FileScanResult.UNSAFE.value),
+            ),
+            When(
+                Q(error_message__isnull=False) & ~Q(error_message=""),
+                then=Value(FileScanResult.ERROR.value),
+            ),
+            When(scanned_at__isnull=False, then=Value(FileScanResult.SAFE.value)),
+            default=Value(FileScanResult.PENDING.value),
+            output_field=models.CharField(),
+        )
+
     class Meta:
         verbose_name = _("File Scan Status")
         verbose_name_plural = _("File Scan Statuses")
@@ -116,6 +149,55 @@ class FileScanStatus(TimeStampedModel):
     ]
 
 
+def annotate_latest_scan_result(queryset: QuerySet) -> QuerySet:
+    """Annotates each file object with the result of its latest scan, so that
+    `PrivateFieldFile.open` does not need to query it separately."""
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    latest_scan_result = (
+        FileScanStatus.objects.filter(
+            content_type=content_type, object_id=OuterRef("pk")
+        )
+        .order_by("-id")
+        .annotate(result=FileScanStatus.scan_result_expression())
+        .values("result")[:1]
+    )
+    return queryset.annotate(
+        **{LATEST_SCAN_RESULT_ATTRIBUTE: Subquery(latest_scan_result)}
+    )
+
+
+def prefetch_latest_scan_results(file_objects: Iterable[models.Model]) -> None:
+    """Loads the latest scan results of already fetched file objects, e.g. a
+    page of attachments, with one query per model."""
+    file_scans_are_enabled = getattr(settings, "FLAG_FILE_SCAN", False) is True
+    if file_scans_are_enabled is False:
+        # The scan results are not read when the feature is not enabled
+        return
+
+    objects_by_model: dict[type[models.Model], list[models.Model]] = {}
+    for file_object in file_objects:
+        objects_by_model.setdefault(file_object._meta.model, []).append(file_object)
+
+    for model, model_objects in objects_by_model.items():
+        content_type = ContentType.objects.get_for_model(model)
+        latest_scan_results = dict(
+            FileScanStatus.objects.filter(
+                content_type=content_type,
+                object_id__in=[file_object.pk for file_object in model_objects],
+            )
+            .order_by("object_id", "-id")
+            .distinct("object_id")
+            .annotate(result=FileScanStatus.scan_result_expression())
+            .values_list("object_id", "result")
+        )
+        for file_object in model_objects:
+            setattr(
+                file_object,
+                LATEST_SCAN_RESULT_ATTRIBUTE,
+                latest_scan_results.get(file_object.pk),
+            )
+
+
 def schedule_file_for_virus_scanning(
     file_model_instance: models.Model, file_field_name: str
 ) -> FileScanStatus | None:
@@ -186,21 +268,10 @@ def _scan_file_task(scan_status_id: int) -> FileScanStatus | None:
                 )
                 return scan_status
 
-            response_dict: PlattaClamAvResponse = response.json()
-            if not response_dict.get("success", False):
-                _handle_error(
-                    scan_status,
-                    f"Scanning service failed: {response_dict}",
-                )
-                return scan_status
-
             try:
-                scanning_result = response_dict.get("data", {}).get("result", [])[0]
-            except TypeError:
-                _handle_error(
-                    scan_status,
-                    f"Response from filescan service did not contain a result: {response_dict}",
-                )
+                scanning_result = _get_scanning_result(response.json())
+            except FileScanResponseError as e:
+                _handle_error(scan_status, str(e))
                 return scan_status
 
             return _handle_scanning_result(scan_status, scanning_result)
@@ -209,6 +280,23 @@ def _scan_file_task(scan_status_id: int) -> FileScanStatus | None:
         _handle_error(scan_status, f"An error occurred: {e}")
 
 
+class FileScanResponseError(Exception):
+    """The filescan service responded, but without a scanning result."""
+
+
+def _get_scanning_result(response_dict: PlattaClamAvResponse) -> PlattaClamAvResult:
+    """Extract the result of a single file from the filescan service response."""
+    if not response_dict.get("success", False):
+        raise FileScanResponseError(f"Scanning service failed: {response_dict}")
+
+    try:
+        return response_dict.get("data", {}).get("result", [])[0]
+    except (TypeError, IndexError):
+        raise FileScanResponseError(
+            f"Response from filescan service did not contain a result: {response_dict}"
+        )
+
+
 def _handle_error(scan_status: FileScanStatus, text: str) -> None:
     """Actions after an error happened somewhere along the way."""
     logger.error(text)
@@ -233,6 +321,13 @@ def _handle_scanning_result(
 
 def _delete_infected_file(scan_status: FileScanStatus) -> None:
     """File must be deleted if it was found to contain a virus or malware."""
+    _delete_file_of_scan_status(scan_status)
+
+    scan_status.file_deleted_at = timezone.now()
+    scan_status.save()
+
+
+def _delete_file_of_scan_status(scan_status: FileScanStatus) -> None:
     file_object: models.Model | None = scan_status.content_object
     if file_object is None:
         raise AttributeError
@@ -241,9 +336,6 @@ def _delete_infected_file(scan_status: FileScanStatus) -> None:
     field_file.delete()
     file_object.save()
 
-    scan_status.file_deleted_at = timezone.now()
-    scan_status.save()
-
 
 class GenericAttachmentTestModel(models.Model):
     """
@@ -0,0 +1,154 @@
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterator
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from rest_framework import status as http_status
+
+from file_operations.models.filescan import (
+    FileScanResponseError,
+    FileScanStatus,
+    _delete_file_of_scan_status,
+    _get_scanning_result,
+)
+from file_operations.types import PlattaClamAvResult
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the filescan service to respond to a single file
+FILE_SCAN_REQUEST_TIMEOUT = 120
+
+
+@dataclass
+class FileScanOutcome:
+    result: PlattaClamAvResult | None = None
+    error_message: str | None = None
+
+
+def get_pending_scan_statuses():
+    return FileScanStatus.objects.filter(
+        scanned_at__isnull=True,
+        file_deleted_at__isnull=True,
+    )
+
+
+def _iter_pending_batches(batch_size: int) -> Iterator[list[FileScanStatus]]:
+    """Yields pending scan statuses in batches ordered by id.
+
+    The batches are paginated by id, so statuses that are still pending after
+    a failed scan are not picked up again during the same run."""
+    last_id = 0
+    while True:
+        batch = list(
+            get_pending_scan_statuses()
+            .filter(id__gt=last_id)
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def _create_session(max_concurrency: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _scan_file(session: requests.Session, filepath: str) -> FileScanOutcome:
+    """Sends one file to the filescan service.
+
+    Runs in a worker thread, so it must not use the database. The multipart
+    body is streamed from the file, which is never read fully into memory."""
+    if not filepath or not os.path.exists(filepath):
+        return FileScanOutcome(error_message=f"File not found: {filepath}")
+
+    try:
+        with open(filepath, "rb") as file:
+            encoder = MultipartEncoder(fields={"FILES": (str(uuid.uuid4()), file)})
+            response = session.post(
+                settings.FILE_SCAN_SERVICE_URL,
+                data=encoder,
+                headers={"Content-Type": encoder.content_type},
+                timeout=FILE_SCAN_REQUEST_TIMEOUT,
+            )
+        if not response.status_code == http_status.HTTP_200_OK:
+            return FileScanOutcome(
+                error_message=f"Response from filescan service was not 200: {response.status_code}"
+            )
+        return FileScanOutcome(result=_get_scanning_result(response.json()))
+    except FileScanResponseError as e:
+        return FileScanOutcome(error_message=str(e))
+    except Exception as e:
+        return FileScanOutcome(error_message=f"An error occurred: {e}")
+
+
+def _apply_outcomes(
+    scan_statuses: list[FileScanStatus], outcomes: list[FileScanOutcome]
+) -> None:
+    now = timezone.now()
+    for scan_status, outcome in zip(scan_statuses, outcomes):
+        scan_status.modified_at = now
+
+        if outcome.result is None:
+            logger.error(outcome.error_message)
+            scan_status.error_message = outcome.error_message
+            continue
+
+        scan_status.scanned_at = now
+        scan_status.error_message = None
+        if outcome.result["is_infected"]:
+            try:
+                _delete_file_of_scan_status(scan_status)
+            except Exception as e:
+                # The file is still on disk, so it is shown as an error
+                # instead of as deleted
+                scan_status.error_message = f"Failed to delete infected file: {e}"
+                logger.error(scan_status.error_message)
+                continue
+            scan_status.file_deleted_at = now
+
+    FileScanStatus.objects.bulk_update(
+        scan_statuses,
+        ["scanned_at", "file_deleted_at", "error_message", "modified_at"],
+    )
+
+
+def scan_pending_files(
+    batch_size: int | None = None, max_concurrency: int | None = None
+) -> int:
+    """Scans all pending files in batches.
+
+    Each batch is scanned concurrently, up to `max_concurrency` files at a time,
+    over one pooled HTTP session, and the statuses of the batch are updated with
+    a single bulk update. Returns the number of processed scan statuses."""
+    batch_size = batch_size or settings.FILE_SCAN_BATCH_SIZE
+    max_concurrency = max_concurrency or settings.FILE_SCAN_MAX_CONCURRENCY
+
+    processed_count = 0
+    with (
+        _create_session(max_concurrency) as session,
+        ThreadPoolExecutor(max_workers=max_concurrency) as executor,
+    ):
+        for batch in _iter_pending_batches(batch_size):
+            outcomes = list(
+                executor.map(
+                    partial(_scan_file, session),
+                    [scan_status.filepath for scan_status in batch],
+                )
+            )
+            _apply_outcomes(batch, outcomes)
+            processed_count += len(batch)
+
+    return processed_count
@@ -16,6 +16,8 @@ from file_operations.models.filescan import (
     GenericSafeDeleteAttachmentTestModel,
     _delete_infected_file,
     _scan_file_task,
+    annotate_latest_scan_result,
+    prefetch_latest_scan_results,
     schedule_file_for_virus_scanning,
 )
 from file_operations.private_files import PrivateFieldFile
@@ -265,3 +267,58 @@ def test_safedelete_delete_does_not_trigger_filescan(
     assert not FileScanStatus.objects.filter(
         content_type=content_type, object_id=attachment_safedelete.pk
     ).exists()
+
+
+@override_settings(FLAG_FILE_SCAN=True)
+@pytest.mark.django_db
+def test_preloaded_latest_scan_result(
+    django_db_setup,
+    generic_test_data,
+    file_scan_status_factory,
+    django_assert_num_queries,
+):
+    """
+    The latest scan result can be preloaded for many file objects at once,
+    after which checking the result needs no queries.
+    """
+    attachment = generic_test_data["attachment"]
+    unscanned_attachment = GenericAttachmentTestModel.objects.create(
+        file_attachment=SimpleUploadedFile(
+            name="unscanned.pdf", content=b"test", content_type="application/pdf"
+        )
+    )
+    file_scan_status_factory(
+        content_object=attachment,
+        filepath=attachment.file_attachment.name,
+        filefield_name="file_attachment",
+        scanned_at=timezone.now(),
+    )
+
+    annotated = {
+        file_object.pk: file_object
+        for file_object in annotate_latest_scan_result(
+            GenericAttachmentTestModel.objects.filter(
+                pk__in=[attachment.pk, unscanned_attachment.pk]
+            )
+        )
+    }
+    prefetched = [
+        GenericAttachmentTestModel.objects.get(pk=attachment.pk),
+        GenericAttachmentTestModel.objects.get(pk=unscanned_attachment.pk),
+    ]
+    with django_assert_num_queries(1):
+        prefetch_latest_scan_results(prefetched)
+
+    with django_assert_num_queries(0):
+        for file_objects in (
+            [annotated[attachment.pk], annotated[unscanned_attachment.pk]],
+            prefetched,
+        ):
+            assert (
+                FileScanStatus.filefield_latest_scan_result(file_objects[0])
+                == FileScanResult.SAFE
+            )
+            assert (
+                FileScanStatus.filefield_latest_scan_result(file_objects[1])
+                == FileScanResult.PENDING
+            )
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from file_operations import scan_dispatcher
+from file_operations.models.filescan import (
+    FileScanResult,
+    FileScanStatus,
+    GenericAttachmentTestModel,
+)
+from file_operations.scan_dispatcher import scan_pending_files
+
+INFECTED_CONTENT = b"X5O!P%@AP[4\\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!"
+
+
+class FakeScanServiceHandler(BaseHTTPRequestHandler):
+    """Mimics Platta's ClamAV API: reports files containing the EICAR test
+    signature as infected."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.request_count += 1
+        is_infected = INFECTED_CONTENT in body
+        response = {
+            "success": True,
+            "data": {
+                "result": [
+                    {
+                        "name": "file",
+                        "is_infected": is_infected,
+                        "viruses": ["Eicar-Signature"] if is_infected else [],
+                    }
+                ]
+            },
+        }
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_scan_service():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeScanServiceHandler)
+    server.request_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _create_pending_scan(file_scan_status_factory, content: bytes) -> FileScanStatus:
+    attachment = GenericAttachmentTestModel.objects.create(
+        file_attachment=SimpleUploadedFile(
+            name="attachment.pdf", content=content, content_type="application/pdf"
+        )
+    )
+    return file_scan_status_factory(
+        content_object=attachment,
+        filepath=attachment.file_attachment.path,
+        filefield_name="file_attachment",
+    )
+
+
+@override_settings(FLAG_FILE_SCAN=False)
+@pytest.mark.django_db
+def test_scan_pending_files_in_batches(
+    django_db_setup, file_scan_status_factory, fake_scan_service
+):
+    clean_scans = [
+        _create_pending_scan(file_scan_status_factory, b"clean") for _ in range(4)
+    ]
+    infected_scan = _create_pending_scan(file_scan_status_factory, INFECTED_CONTENT)
+
+    host, port = fake_scan_service.server_address
+    with override_settings(FILE_SCAN_SERVICE_URL=f"http://{host}:{port}/"):
+        processed_count = scan_pending_files(batch_size=2, max_concurrency=2)
+
+    assert processed_count == 5
+    assert fake_scan_service.request_count == 5
+
+    for scan in clean_scans:
+        scan.refresh_from_db()
+        assert scan.scan_result() == FileScanResult.SAFE
+
+    infected_scan.refresh_from_db()
+    assert infected_scan.scan_result() == FileScanResult.UNSAFE
+    assert not infected_scan.content_object.file_attachment
+
+
+@override_settings(FLAG_FILE_SCAN=False)
+@pytest.mark.django_db
+def test_scan_pending_files_records_missing_file(
+    django_db_setup, file_scan_status_factory, fake_scan_service
+):
+    scan = _create_pending_scan(file_scan_status_factory, b"clean")
+    scan.filepath = "/nonexistent/attachment.pdf"
+    scan.save()
+
+    host, port = fake_scan_service.server_address
+    with override_settings(FILE_SCAN_SERVICE_URL=f"http://{host}:{port}/"):
+        scan_pending_files()
+
+    scan.refresh_from_db()
+    assert scan.scan_result() == FileScanResult.ERROR
+    assert fake_scan_service.request_count == 0
+
+
+@override_settings(FLAG_FILE_SCAN=False)
+@pytest.mark.django_db
+def test_scan_pending_files_deletes_infected_file(
+    django_db_setup, file_scan_status_factory, fake_scan_service
+):
+    scan = _create_pending_scan(file_scan_status_factory, INFECTED_CONTENT)
+    filepath = scan.filepath
+
+    host, port = fake_scan_service.server_address
+    with override_settings(FILE_SCAN_SERVICE_URL=f"http://{host}:{port}/"):
+        scan_pending_files()
+
+    scan.refresh_from_db()
+    assert scan.scan_result() == FileScanResult.UNSAFE
+    assert scan.file_deleted_at is not None
+    assert scan.error_message is None
+    assert not os.path.exists(filepath)
+
+
+@override_settings(FLAG_FILE_SCAN=False)
+@pytest.mark.django_db
+def test_scan_pending_files_records_failed_deletion(
+    django_db_setup, file_scan_status_factory, fake_scan_service
+):
+    scan = _create_pending_scan(file_scan_status_factory, INFECTED_CONTENT)
+    filepath = scan.filepath
+
+    host, port = fake_scan_service.server_address
+    with (
+        override_settings(FILE_SCAN_SERVICE_URL=f"http://{host}:{port}/"),
+        patch.object(
+            scan_dispatcher,
+            "_delete_file_of_scan_status",
+            side_effect=OSError("Permission denied"),
+        ),
+    ):
+        scan_pending_files()
+
+    # The file is left on disk, which is shown to the admins
+    scan.refresh_from_db()
+    assert scan.scan_result() == FileScanResult.ERROR
+    assert scan.file_deleted_at is None
+    assert scan.error_message == "Failed to delete infected file: Permission denied"
+    assert os.path.exists(filepath)
@@ -55,7 +55,21 @@ MAX_FILE_SIZE_MB = 20
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 
 
-class FileDownloadMixin:
+class LatestFileScanResultMixin:
+    """Preloads the latest virus scan result of the object to be downloaded,
+    to avoid a separate query when the file is opened."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        file_scans_are_enabled = getattr(settings, "FLAG_FILE_SCAN", False) is True
+        if file_scans_are_enabled and getattr(self, "action", None) == "download":
+            from file_operations.models.filescan import annotate_latest_scan_result
+
+            queryset = annotate_latest_scan_result(queryset)
+        return queryset
+
+
+class FileDownloadMixin(LatestFileScanResultMixin):
     # We import "action" in each class separately, because otherwise this import
     # creates a circular dependency through rest_framework.decorators and
     # leasing.metadata
@@ -121,7 +135,7 @@ def get_filescan_error_response(error: Exception) -> Response:
         )
 
 
-class FileMixin:
+class FileMixin(LatestFileScanResultMixin):
     from rest_framework.decorators import action
 
     def create(self, request, *args, **kwargs):
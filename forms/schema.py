@@ -0,0 +1,286 @@
+import dataclasses
+import datetime
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone, translation
+from modeltranslation.utils import get_language
+
+from forms.models import Choice, Field, Form, Section
+
+# The number of compiled forms that are kept in the cache of the process
+COMPILED_FORM_CACHE_SIZE = 128
+
+_compiled_forms: OrderedDict[int, "CompiledForm"] = OrderedDict()
+_compiled_forms_lock = threading.Lock()
+
+# The form elements whose forms are touched at the end of the outermost
+# `defer_form_touches` block, if one is active
+_deferred_touches: ContextVar["FormTouches | None"] = ContextVar(
+    "deferred_form_touches", default=None
+)
+
+# The serialized data of a form element in each language
+Representations = Mapping[str, Mapping[str, Any]]
+
+
+def _get_representation(representations: Representations) -> dict:
+    return dict(
+        representations.get(get_language()) or representations[settings.LANGUAGE_CODE]
+    )
+
+
+@dataclass(frozen=True)
+class CompiledChoice:
+    id: int
+    value: str
+    representations: Representations
+
+    def render(self) -> dict:
+        return _get_representation(self.representations)
+
+
+@dataclass(frozen=True)
+class CompiledField:
+    id: int
+    identifier: str
+    type: str
+    required: bool
+    section_identifier: str
+    choices: tuple[CompiledChoice, ...]
+    representations: Representations
+
+    def render(self) -> dict:
+        data = _get_representation(self.representations)
+        data["choices"] = [choice.render() for choice in self.choices]
+        return data
+
+
+@dataclass(frozen=True)
+class CompiledSection:
+    id: int
+    identifier: str
+    parent_id: int | None
+    subsections: tuple["CompiledSection", ...]
+    fields: tuple[CompiledField, ...]
+    representations: Representations
+
+    def render(self) -> dict:
+        data = _get_representation(self.representations)
+        data["subsections"] = [section.render() for section in self.subsections]
+        data["fields"] = [field.render() for field in self.fields]
+        return data
+
+
+@dataclass(frozen=True)
+class CompiledForm:
+    """An immutable tree of the sections, fields and choices of a form.
+
+    The tree is compiled from the database with one query per model, and
+    cached per process by `get_compiled_form` until the form is modified."""
+
+    id: int
+    version: datetime.datetime
+    # The root sections of the form
+    sections: tuple[CompiledSection, ...]
+    fields_by_id: Mapping[int, CompiledField]
+    # The fields by (section identifier, field identifier)
+    fields_by_identifier: Mapping[tuple[str, str], CompiledField]
+
+    def render_sections(self) -> list[dict]:
+        """The root sections of the form in the format of `SectionSerializer`
+        in the active language"""
+        return [section.render() for section in self.sections]
+
+    def get_field(
+        self, section_identifier: str, field_identifier: str
+    ) -> CompiledField | None:
+        return self.fields_by_identifier.get((section_identifier, field_identifier))
+
+    def get_field_keys(self, **attributes) -> frozenset[tuple[str, str]]:
+        """The (section identifier, field identifier) pairs of the fields that
+        have the given attribute values"""
+        return frozenset(
+            key
+            for key, field in self.fields_by_identifier.items()
+            if all(getattr(field, name) == value for name, value in attributes.items())
+        )
+
+
+def _get_representations(serializer_class, instance) -> Representations:
+    representations = {}
+    for language, _name in settings.LANGUAGES:
+        # The translated fields are read in the active language
+        with translation.override(language):
+            representations[language] = MappingProxyType(
+                dict(serializer_class(instance).data)
+            )
+    return MappingProxyType(representations)
+
+
+def compile_form(form_id: int, version: datetime.datetime) -> CompiledForm:
+    from forms.serializers.form import (
+        ChoiceSerializer,
+        CompiledFieldSerializer,
+        CompiledSectionSerializer,
+    )
+
+    sections = list(
+        Section.objects.filter(form_id=form_id).order_by("sort_order", "id")
+    )
+    fields = list(
+        Field.objects.filter(section__form_id=form_id).order_by("sort_order", "id")
+    )
+    choices = list(
+        Choice.objects.filter(field__section__form_id=form_id).order_by("id")
+    )
+
+    choices_by_field_id: dict[int, list[CompiledChoice]] = {}
+    for choice in choices:
+        choices_by_field_id.setdefault(choice.field_id, []).append(
+            CompiledChoice(
+                id=choice.id,
+                value=choice.value,
+                representations=_get_representations(ChoiceSerializer, choice),
+            )
+        )
+
+    section_identifiers = {section.id: section.identifier for section in sections}
+    fields_by_section_id: dict[int, list[CompiledField]] = {}
+    for field in fields:
+        fields_by_section_id.setdefault(field.section_id, []).append(
+            CompiledField(
+                id=field.id,
+                identifier=field.identifier,
+                type=field.type,
+                required=field.required,
+                section_identifier=section_identifiers[field.section_id],
+                choices=tuple(choices_by_field_id.get(field.id, [])),
+                representations=_get_representations(CompiledFieldSerializer, field),
+            )
+        )
+
+    subsections_by_parent_id: dict[int | None, list[Section]] = {}
+    for section in sections:
+        subsections_by_parent_id.setdefault(section.parent_id, []).append(section)
+
+    def compile_section(section: Section) -> CompiledSection:
+        return CompiledSection(
+            id=section.id,
+            identifier=section.identifier,
+            parent_id=section.parent_id,
+            subsections=tuple(
+                compile_section(subsection)
+                for subsection in subsections_by_parent_id.get(section.id, [])
+            ),
+            fields=tuple(fields_by_section_id.get(section.id, [])),
+            representations=_get_representations(CompiledSectionSerializer, section),
+        )
+
+    compiled_fields = [
+        field
+        for section_fields in fields_by_section_id.values()
+        for field in section_fields
+    ]
+    return CompiledForm(
+        id=form_id,
+        version=version,
+        sections=tuple(
+            compile_section(section)
+            for section in subsections_by_parent_id.get(None, [])
+        ),
+        fields_by_id=MappingProxyType({field.id: field for field in compiled_fields}),
+        fields_by_identifier=MappingProxyType(
+            {
+                (field.section_identifier, field.identifier): field
+                for field in compiled_fields
+            }
+        ),
+    )
+
+
+def get_compiled_form(form_id: int) -> CompiledForm:
+    """Returns the compiled form from the cache of the process, or compiles it
+    if the form has been modified since it was cached.
+
+    The modification time of the form is read from the database on every call,
+    so that the changes made by the other processes are noticed. It is updated
+    by the signals of the sections, fields and choices as well."""
+    version = Form.objects.values_list("modified_at", flat=True).get(pk=form_id)
+
+    with _compiled_forms_lock:
+        compiled_form = _compiled_forms.get(form_id)
+        if compiled_form is not None and compiled_form.version == version:
+            _compiled_forms.move_to_end(form_id)
+            return compiled_form
+
+    compiled_form = compile_form(form_id, version)
+
+    with _compiled_forms_lock:
+        _compiled_forms[form_id] = compiled_form
+        _compiled_forms.move_to_end(form_id)
+        while len(_compiled_forms) > COMPILED_FORM_CACHE_SIZE:
+            _compiled_forms.popitem(last=False)
+
+    return compiled_form
+
+
+@dataclass
+class FormTouches:
+    """The forms, and the sections and fields of the forms, whose forms have
+    changed"""
+
+    form_ids: set[int] = dataclasses.field(default_factory=set)
+    section_ids: set[int] = dataclasses.field(default_factory=set)
+    field_ids: set[int] = dataclasses.field(default_factory=set)
+
+    def update(self, other: "FormTouches") -> None:
+        self.form_ids.update(other.form_ids)
+        self.section_ids.update(other.section_ids)
+        self.field_ids.update(other.field_ids)
+
+
+def touch_forms(touches: FormTouches) -> None:
+    """Changes the version of the compiled schemas of the forms, so that they
+    are compiled again on the next `get_compiled_form`.
+
+    Inside `defer_form_touches` the forms are touched at the end of the block
+    instead."""
+    deferred_touches = _deferred_touches.get()
+    if deferred_touches is not None:
+        deferred_touches.update(touches)
+        return
+
+    if not (touches.form_ids or touches.section_ids or touches.field_ids):
+        return
+
+    Form.objects.filter(
+        Q(pk__in=touches.form_ids)
+        | Q(sections__in=touches.section_ids)
+        | Q(sections__fields__in=touches.field_ids)
+    ).update(modified_at=timezone.now())
+
+
+@contextmanager
+def defer_form_touches():
+    """Touches the changed forms once at the end of the block, instead of
+    once for every section, field and choice saved in the block"""
+    if _deferred_touches.get() is not None:
+        # The outermost block touches the forms
+        yield
+        return
+
+    touches = FormTouches()
+    token = _deferred_touches.set(touches)
+    try:
+        yield
+    finally:
+        _deferred_touches.reset(token)
+        touch_forms(touches)
@@ -2,6 +2,8 @@ from ast import literal_eval
 from collections import OrderedDict
 
 from deepmerge import always_merger
+from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
 from enumfields.drf.serializers import EnumSerializerField
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
@@ -9,7 +11,7 @@ from rest_framework.fields import SkipField
 from rest_framework.relations import PKOnlyObject
 from rest_framework_gis.fields import GeometryField
 
-from leasing.models import Financing, Hitas, Management
+from leasing.models import Financing, Hitas, LeaseAreaAddress, Management
 from leasing.serializers.utils import InstanceDictPrimaryKeyRelatedField
 from plotsearch.enums import DeclineReason
 from plotsearch.models import (
@@ -20,13 +22,14 @@ from plotsearch.models import (
     TargetStatus,
 )
 from plotsearch.models.plot_search import MeetingMemo, ProposedFinancingManagement
-from plotsearch.utils import get_applicant
+from plotsearch.utils import get_applicant, prefetch_applicants
 from users.models import User
 from users.serializers import UserSerializer
 
 from ..enums import ApplicantType, FormState
 from ..models import Answer, Choice, Entry, Field, Form, Section
 from ..models.form import AnswerOpeningRecord, Attachment, EntrySection
+from ..schema import defer_form_touches, get_compiled_form
 from ..validators.answer import (
     ControlShareValidation,
     FieldRegexValidator,
@@ -36,6 +39,68 @@ from ..validators.answer import (
 # These fields include sensitive or unnecessary data for the public API
 EXCLUDED_ATTACHMENT_FIELDS = ["attachment", "created_at"]
 
+TARGET_ADDRESSES_ATTRIBUTE = "preloaded_target_addresses"
+
+
+def prefetch_target_status_details(target_statuses):
+    """Loads the targets, their addresses and the other related data that
+    `TargetStatusSerializer` shows for many target statuses with a fixed
+    number of queries"""
+    prefetch_related_objects(
+        list(target_statuses),
+        Prefetch(
+            "plot_search_target",
+            queryset=PlotSearchTarget.objects.select_related(
+                "plan_unit__lease_area", "custom_detailed_plan__lease_area"
+            ),
+        ),
+        Prefetch(
+            "plot_search_target__plan_unit__lease_area__addresses",
+            queryset=LeaseAreaAddress.objects.order_by("-is_primary", "id"),
+            to_attr=TARGET_ADDRESSES_ATTRIBUTE,
+        ),
+        "proposed_managements",
+        Prefetch("meeting_memos", queryset=MeetingMemo.objects.select_related("user")),
+    )
+
+
+class AnswerSummaryListSerializer(serializers.ListSerializer):
+    """Loads the applicants and the target statuses of a page of answers with
+    a fixed number of queries"""
+
+    def to_representation(self, data):
+        answers = list(
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        prefetch_applicants(answers)
+        prefetch_related_objects(answers, "statuses", "opening_record")
+        prefetch_target_status_details(
+            [status for answer in answers for status in answer.statuses.all()]
+        )
+        return super().to_representation(answers)
+
+
+class TargetStatusSummaryListSerializer(serializers.ListSerializer):
+    """Loads the targets and the applicants of a page of target statuses with
+    a fixed number of queries"""
+
+    def to_representation(self, data):
+        target_statuses = list(
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        prefetch_related_objects(
+            target_statuses,
+            "answer",
+            Prefetch(
+                "plot_search_target",
+                queryset=PlotSearchTarget.objects.select_related(
+                    "plan_unit", "custom_detailed_plan"
+                ),
+            ),
+        )
+        prefetch_applicants(target_status.answer for target_status in target_statuses)
+        return super().to_representation(target_statuses)
+
 
 class RecursiveSerializer(serializers.Serializer):
     def to_representation(self, value):
@@ -124,6 +189,17 @@ class FieldSerializer(serializers.ModelSerializer):
         return super(FieldSerializer, self).update(instance, validated_data)
 
 
+class CompiledFieldSerializer(FieldSerializer):
+    """Serializes a field without its choices, which are added by the
+    compiled form schema"""
+
+    choices = serializers.SerializerMethodField(method_name="get_placeholder")
+
+    @staticmethod
+    def get_placeholder(obj):
+        return None
+
+
 class SectionSerializer(serializers.ModelSerializer):
 
     subsections = RecursiveSerializer(many=True, required=False, allow_null=True)
@@ -156,6 +232,11 @@ class SectionSerializer(serializers.ModelSerializer):
         validators = []
 
     def create(self, validated_data):
+        # The form is touched once for the nested fields and subsections
+        with defer_form_touches():
+            return self._create(validated_data)
+
+    def _create(self, validated_data):
         fields = validated_data.pop("fields", [])
         subsections = validated_data.pop("subsections", [])
         section = super().create(validated_data)
@@ -216,18 +297,32 @@ class SectionSerializer(serializers.ModelSerializer):
             s_section.delete()
 
     def update(self, instance, validated_data):
-        subsections = validated_data.pop("subsections", [])
-        self.update_subsections(instance, subsections)
+        # The form is touched once for the nested fields and subsections
+        with defer_form_touches():
+            subsections = validated_data.pop("subsections", [])
+            self.update_subsections(instance, subsections)
 
-        fields = validated_data.pop("fields", [])
-        self.update_fields(instance, fields)
+            fields = validated_data.pop("fields", [])
+            self.update_fields(instance, fields)
 
-        for k, v in validated_data.items():
-            setattr(instance, k, v)
-        instance.save()
+            for k, v in validated_data.items():
+                setattr(instance, k, v)
+            instance.save()
         return instance
 
 
+class CompiledSectionSerializer(SectionSerializer):
+    """Serializes a section without its subsections and fields, which are
+    added by the compiled form schema"""
+
+    subsections = serializers.SerializerMethodField(method_name="get_placeholder")
+    fields = serializers.SerializerMethodField(method_name="get_placeholder")
+
+    @staticmethod
+    def get_placeholder(obj):
+        return None
+
+
 class FormSerializer(serializers.ModelSerializer):
     sections = SectionSerializer(many=True)
     state = EnumSerializerField(FormState)
@@ -252,8 +347,20 @@ class FormSerializer(serializers.ModelSerializer):
         sections = Section.objects.filter(form=instance, parent=None)
         return {section.id: section for section in sections}
 
+    @property
+    def _readable_fields(self):
+        # The sections are rendered in to_representation
+        for field in super()._readable_fields:
+            if field.field_name != "sections":
+                yield field
+
     def to_representation(self, instance):
-        data = super(FormSerializer, self).to_representation(instance)
+        """
+        The sections are rendered from the compiled form schema, which is
+        cached until the form is modified.
+        """
+        data = super().to_representation(instance)
+        data["sections"] = get_compiled_form(instance.id).render_sections()
         return self.filter_subsections(data)
 
     @staticmethod
@@ -266,23 +373,26 @@ class FormSerializer(serializers.ModelSerializer):
         return data
 
     def update(self, instance, validated_data):
-        prev_sections = self.get_sections(instance)
-        s_serializer = SectionSerializer()
-        for section in validated_data.pop("sections", []):
-            try:
-                s = Section.objects.get(pk=section["id"])
-                s_serializer.update(s, section)
-                prev_sections.pop(section["id"])
-            except KeyError:
-                section["form_id"] = instance.id
-                if "parent" not in section:
-                    section["parent"] = None
-                s_serializer.create(section)
+        # The form is touched once for all the nested sections, fields and
+        # choices
+        with defer_form_touches():
+            prev_sections = self.get_sections(instance)
+            s_serializer = SectionSerializer()
+            for section in validated_data.pop("sections", []):
+                try:
+                    s = Section.objects.get(pk=section["id"])
+                    s_serializer.update(s, section)
+                    prev_sections.pop(section["id"])
+                except KeyError:
+                    section["form_id"] = instance.id
+                    if "parent" not in section:
+                        section["parent"] = None
+                    s_serializer.create(section)
 
-        # Check if any section is deleted
-        for k, section in prev_sections.items():
-            section.delete()
-        return super(FormSerializer, self).update(instance, validated_data)
+            # Check if any section is deleted
+            for k, section in prev_sections.items():
+                section.delete()
+            return super(FormSerializer, self).update(instance, validated_data)
 
 
 class EntrySerializer(serializers.ModelSerializer):
@@ -399,7 +509,15 @@ class TargetStatusSerializer(TargetStatusUpdateSerializer):
     def get_address(self, obj):
         target_address = None
 
-        if obj.plot_search_target.plan_unit is not None:
+        lease_area = (
+            obj.plot_search_target.plan_unit.lease_area
+            if obj.plot_search_target.plan_unit is not None
+            else None
+        )
+        if lease_area is not None and hasattr(lease_area, TARGET_ADDRESSES_ATTRIBUTE):
+            addresses = getattr(lease_area, TARGET_ADDRESSES_ATTRIBUTE)
+            target_address = {"address": addresses[0].address} if addresses else None
+        elif obj.plot_search_target.plan_unit is not None:
             target_address = (
                 obj.plot_search_target.plan_unit.lease_area.addresses.all()
                 .order_by("-is_primary")
@@ -460,6 +578,7 @@ class TargetStatusListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TargetStatus
+        list_serializer_class = TargetStatusSummaryListSerializer
         fields = (
             "application_identifier",
             "target_identifier",
@@ -673,17 +792,29 @@ class AnswerSerializer(serializers.ModelSerializer):
             if check_for_none is None:
                 ret[field.field_name] = None
             elif field.label == "Entries data":
-                ret[field.field_name] = self.create_entry(attribute)
+                ret[field.field_name] = self.create_entry(
+                    attribute, get_compiled_form(instance.form_id)
+                )
             else:
                 ret[field.field_name] = field.to_representation(attribute)
 
         return ret
 
     @staticmethod
-    def create_entry(attribute):
+    def create_entry(attribute, compiled_form=None):
         entries_dict = dict()
         for entry_section in attribute.all():
             for entry in entry_section.entries.all():
+                compiled_field = (
+                    compiled_form.fields_by_id.get(entry.field_id)
+                    if compiled_form is not None
+                    else None
+                )
+                field_identifier = (
+                    compiled_field.identifier
+                    if compiled_field is not None
+                    else entry.field.identifier
+                )
                 path_parts = entry.path.split(sep=".")
                 try:
                     entry_value = literal_eval(entry.value)
@@ -702,7 +833,7 @@ class AnswerSerializer(serializers.ModelSerializer):
 
                     help_dict[part] = {
                         "fields": {
-                            entry.field.identifier: {
+                            field_identifier: {
                                 "value": entry_value,
                                 "extra_value": entry.extra_value,
                             }
@@ -729,14 +860,9 @@ class AnswerSerializer(serializers.ModelSerializer):
         return entry_section
 
     @staticmethod
-    def get_field(field_identifier, section_identifier, validated_data):
-        try:
-            field = Field.objects.get(
-                identifier=field_identifier,
-                section__identifier=section_identifier,
-                section__form=validated_data.get("form"),
-            )
-        except Field.DoesNotExist:
+    def get_field(field_identifier, section_identifier, compiled_form):
+        field = compiled_form.get_field(section_identifier, field_identifier)
+        if field is None:
             raise ValueError
         return field
 
@@ -750,6 +876,7 @@ class AnswerSerializer(serializers.ModelSerializer):
         for target in targets:
             answer.targets.add(target)
 
+        compiled_form = get_compiled_form(answer.form_id)
         for (
             field_identifier,
             section_identifier,
@@ -757,7 +884,7 @@ class AnswerSerializer(serializers.ModelSerializer):
             metadata,
             path,
         ) in self.entry_generator(entries_data):
-            field = self.get_field(field_identifier, section_identifier, validated_data)
+            field = self.get_field(field_identifier, section_identifier, compiled_form)
 
             if field.type == "uploadfiles":
                 Attachment.objects.filter(id__in=value["value"]).update(path=path)
@@ -769,7 +896,7 @@ class AnswerSerializer(serializers.ModelSerializer):
             )
             Entry.objects.create(
                 entry_section=entry_section,
-                field=field,
+                field_id=field.id,
                 value=value["value"],
                 extra_value=value["extraValue"],
                 path=path,
@@ -784,6 +911,8 @@ class AnswerSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         entries_data = validated_data.pop("entries", [])
         Attachment.objects.filter(answer=instance).update(path=None)
+        form = validated_data.get("form", instance.form)
+        compiled_form = get_compiled_form(form.id)
         for (
             field_identifier,
             section_identifier,
@@ -791,7 +920,7 @@ class AnswerSerializer(serializers.ModelSerializer):
             metadata,
             path,
         ) in self.entry_generator(entries_data):
-            field = self.get_field(field_identifier, section_identifier, validated_data)
+            field = self.get_field(field_identifier, section_identifier, compiled_form)
 
             if field.type == "uploadfiles":
                 Attachment.objects.filter(id__in=value["value"]).update(path=path)
@@ -803,7 +932,7 @@ class AnswerSerializer(serializers.ModelSerializer):
             )
             Entry.objects.update_or_create(
                 entry_section=entry_section,
-                field=field,
+                field_id=field.id,
                 defaults={"value": value["value"], "extra_value": value["extraValue"]},
                 path=path,
             )
@@ -851,6 +980,7 @@ class AnswerListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Answer
+        list_serializer_class = AnswerSummaryListSerializer
         fields = (
             "id",
             "plot_search",
@@ -4,7 +4,8 @@ from django.db import models
 from django.db.models.fields.files import FieldFile
 from django.dispatch import receiver
 
-from forms.models.form import Attachment
+from forms.models.form import Attachment, Choice, Field, Section
+from forms.schema import FormTouches, touch_forms
 
 
 @receiver(models.signals.post_delete, sender=Attachment)
@@ -34,3 +35,24 @@ def auto_delete_file_on_change(sender, instance: Attachment, **kwargs):
         # Attachment was changed --> delete the previous attachment file
         if os.path.isfile(old_file.path):
             os.remove(old_file.path)
+
+
+@receiver(models.signals.post_save, sender=Section)
+@receiver(models.signals.post_delete, sender=Section)
+def touch_form_on_section_change(sender, instance: Section, **kwargs):
+    """Changes the version of the compiled form schema"""
+    touch_forms(FormTouches(form_ids={instance.form_id}))
+
+
+@receiver(models.signals.post_save, sender=Field)
+@receiver(models.signals.post_delete, sender=Field)
+def touch_form_on_field_change(sender, instance: Field, **kwargs):
+    """Changes the version of the compiled form schema"""
+    touch_forms(FormTouches(section_ids={instance.section_id}))
+
+
+@receiver(models.signals.post_save, sender=Choice)
+@receiver(models.signals.post_delete, sender=Choice)
+def touch_form_on_choice_change(sender, instance: Choice, **kwargs):
+    """Changes the version of the compiled form schema"""
+    touch_forms(FormTouches(field_ids={instance.field_id}))
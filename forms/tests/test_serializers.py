@@ -6,8 +6,17 @@ from rest_framework.exceptions import ValidationError
 
 from plotsearch.enums import DeclineReason
 from plotsearch.models import TargetStatus
-
-from ..serializers.form import AnswerSerializer, FormSerializer, TargetStatusSerializer
+from plotsearch.utils import get_applicant
+
+from ..models import Answer, Field
+from ..schema import defer_form_touches, get_compiled_form
+from ..serializers.form import (
+    AnswerListSerializer,
+    AnswerSerializer,
+    FormSerializer,
+    SectionSerializer,
+    TargetStatusSerializer,
+)
 
 fake = Faker("fi_FI")
 
@@ -33,6 +42,71 @@ def test_form_serializer(basic_template_form):
     assert find("choices", serializer.data)
 
 
+@pytest.mark.django_db
+def test_form_serializer_renders_compiled_form(
+    django_assert_max_num_queries, basic_template_form
+):
+    root_sections = basic_template_form.sections.filter(parent__isnull=True)
+    expected_sections = [SectionSerializer(section).data for section in root_sections]
+
+    assert get_compiled_form(basic_template_form.id).render_sections() == (
+        expected_sections
+    )
+
+    # The cached schema is used until the form is modified
+    with django_assert_max_num_queries(2):
+        data = FormSerializer(basic_template_form).data
+    assert data["sections"] == expected_sections
+
+    field = Field.objects.filter(section__form=basic_template_form).first()
+    field.label = "Changed label"
+    field.save()
+
+    compiled_form = get_compiled_form(basic_template_form.id)
+    assert compiled_form.fields_by_id[field.id].render()["label"] == "Changed label"
+
+
+@pytest.mark.django_db
+def test_deferred_form_touches_update_form_once(
+    django_assert_num_queries, basic_template_form
+):
+    fields = list(Field.objects.filter(section__form=basic_template_form)[:2])
+
+    # Two field updates and a single form update
+    with django_assert_num_queries(3):
+        with defer_form_touches():
+            for field in fields:
+                field.label = "Changed label"
+                field.save(update_fields=["label"])
+
+    basic_template_form.refresh_from_db()
+    compiled_form = get_compiled_form(basic_template_form.id)
+    for field in fields:
+        assert compiled_form.fields_by_id[field.id].render()["label"] == "Changed label"
+
+
+@pytest.mark.django_db
+def test_answer_list_serializer_preloads_applicants(
+    django_assert_max_num_queries, answer_with_email
+):
+    answer = Answer.objects.get(id=answer_with_email["answer"]["id"])
+    applicants = []
+    get_applicant(answer, applicants)
+    assert applicants == [
+        "Sepposen Betoni Oy",
+        "Hattulan kultakaivos Oy",
+        "Kuusamon bajamajat Ky",
+    ]
+
+    answers = Answer.objects.filter(id=answer.id).select_related(
+        "form__plotsearch__subtype__plot_search_type"
+    )
+    # The answers, the applicants, the target statuses and the opening records
+    with django_assert_max_num_queries(4):
+        data = AnswerListSerializer(answers, many=True).data
+    assert data[0]["applicants"] == applicants
+
+
 @pytest.mark.django_db
 def test_answer_serializer(basic_answer):
     serializer = AnswerSerializer(basic_answer)
@@ -14,7 +14,7 @@ from rest_framework_gis.filters import InBBoxFilter
 
 from forms.enums import AnswerType
 from utils.email import EmailMessageInput, send_email
-from utils.pdf import PDFGenerationError, generate_pdf
+from utils.pdf import PDFGenerationError, generate_cached_pdf, generate_pdfs
 
 logger = logging.getLogger(__name__)
 
@@ -599,16 +599,22 @@ def _generate_applicant_target_status_email(answer: "Answer") -> EmailMessageInp
     )
     email_body = render_to_string("target_status/email_detail.txt", context)
 
-    for target_status in target_statuses.all():
-        context["object"] = target_status
-        context = build_pdf_context(context)
-        try:
-            pdf: BytesIO = generate_pdf(context, "target_status/detail.html")
-        except PDFGenerationError as e:
-            logger.error(f"PDF generation failed: {e}")
-            pdf = BytesIO()
+    target_status_list = list(target_statuses.all())
+    # Sent from a background task, so the PDFs can be rendered in parallel
+    pdfs: List[BytesIO | None] = generate_pdfs(
+        (
+            (
+                build_pdf_context({**context, "object": target_status}),
+                "target_status/detail.html",
+            )
+            for target_status in target_status_list
+        ),
+        max_workers=settings.PDF_RENDER_MAX_WORKERS,
+    )
 
-        email_pdf: bytes = pdf.getvalue()
+    for target_status, pdf in zip(target_status_list, pdfs):
+        # The failed PDFs are attached empty
+        email_pdf: bytes = pdf.getvalue() if pdf is not None else b""
         attachment_filename = f"{target_status.application_identifier}.pdf"
         attachments.append([attachment_filename, email_pdf, "application/pdf"])
 
@@ -637,7 +643,7 @@ def _generate_applicant_area_search_email(answer: "Answer") -> EmailMessageInput
     )
     email_body = render_to_string("area_search/email_detail.txt", context)
     try:
-        pdf: BytesIO = generate_pdf(context, "area_search/detail.html")
+        pdf: BytesIO = generate_cached_pdf(context, "area_search/detail.html")
     except PDFGenerationError as e:
         logger.error(f"PDF generation failed: {e}")
         pdf = BytesIO()
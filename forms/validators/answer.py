@@ -3,7 +3,7 @@ from typing import Iterable
 
 from rest_framework.serializers import ValidationError
 
-from forms.models import Field
+from forms.schema import get_compiled_form
 
 SSN_CHECK = [
     "0",
@@ -53,8 +53,8 @@ class FieldRegexValidator:
     def __call__(self, value):
         self.regex_validator(
             value["entries"],
-            Field.objects.filter(
-                section__form=value["form"], identifier=self._identifier
+            get_compiled_form(value["form"].id).get_field_keys(
+                identifier=self._identifier
             ),
         )
 
@@ -88,9 +88,7 @@ class FieldRegexValidator:
             )
 
     def regex_checker(self, entries, entry, regex_fields, section_identifier):
-        if regex_fields.filter(
-            section__identifier=section_identifier, identifier=entry
-        ).exists():
+        if (section_identifier, entry) in regex_fields:
             if entries[entry]["value"] == "":
                 return
 
@@ -112,7 +110,7 @@ class RequiredFormFieldValidator:
     def __call__(self, value):
         self.required_validator(
             value["entries"],
-            Field.objects.filter(section__form=value["form"], required=True),
+            get_compiled_form(value["form"].id).get_field_keys(required=True),
         )
 
     def required_validator(
@@ -134,11 +132,8 @@ class RequiredFormFieldValidator:
             return
         if section_identifier is not None:
             for entry in entries:
-                if (
-                    required_fields.filter(
-                        section__identifier=section_identifier, identifier=entry
-                    ).exists()
-                    and entries[entry]["value"] in self.EMPTY_VALUES
+                if (section_identifier, entry) in required_fields and (
+                    entries[entry]["value"] in self.EMPTY_VALUES
                 ):
                     raise ValidationError(code="required")
         for entry in entries:
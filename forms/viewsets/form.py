@@ -1,4 +1,3 @@
-from django.db.models import Prefetch
 from django.utils.translation import get_language_from_request
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, viewsets
@@ -9,7 +8,7 @@ from rest_framework.response import Response
 
 from file_operations.viewsets.mixins import FileDownloadMixin, FileExtensionFileMixin
 from forms.filter import AnswerFilterSet, TargetStatusFilterSet
-from forms.models import Answer, Entry, Form
+from forms.models import Answer, Form
 from forms.models.form import AnswerOpeningRecord, Attachment
 from forms.permissions import (
     AnswerPermissions,
@@ -51,12 +50,8 @@ class FormViewSet(
     permission_classes = (MvjDjangoModelPermissions,)
 
     def get_queryset(self):
-        queryset = Form.objects.prefetch_related(
-            "sections__fields__choices",
-            "sections__subsections__fields__choices",
-            "sections__subsections__subsections__fields__choices",
-            "sections__subsections__subsections__subsections",
-        )
+        # The sections are rendered from the compiled form schema
+        queryset = Form.objects.select_related("plotsearch")
         return queryset
 
 
@@ -67,9 +62,7 @@ class AnswerViewSet(viewsets.ModelViewSet):
             "entry_sections",
             "targets",
             "statuses",
-            Prefetch(
-                "entry_sections__entries", Entry.objects.all().select_related("field")
-            ),
+            "entry_sections__entries",
         )
         .select_related(
             "form__plotsearch__subtype__plot_search_type",
@@ -106,6 +99,15 @@ class AnswerViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         if self.action == "retrieve":
             return Answer.objects.all()
+        if self.action == "list":
+            # The entries are not listed, and the applicants are loaded by
+            # AnswerListSerializer
+            return (
+                super()
+                .get_queryset()
+                .prefetch_related(None)
+                .prefetch_related("statuses")
+            )
         return super().get_queryset()
 
     def get_serializer_class(self):
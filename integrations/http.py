@@ -0,0 +1,219 @@
+import os
+import tempfile
+import threading
+from typing import IO, Any, Iterable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Multipart parts larger than this are spooled from memory to a temporary file
+MULTIPART_PART_MAX_MEMORY_SIZE = 1024 * 1024
+MULTIPART_CHUNK_SIZE = 64 * 1024
+
+_sessions: dict[tuple[int, str], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests without one."""
+
+    def __init__(self, *args: Any, timeout: float = DEFAULT_TIMEOUT, **kwargs: Any):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> requests.Session:
+    """Creates a session that keeps connections alive and retries failures.
+
+    At most `max_connections` connections are opened per host, and further
+    requests wait for a free connection. Failed connections are retried for
+    all methods, as the request was never sent, but read errors and error
+    statuses only for idempotent methods, so that e.g. a billed credit
+    decision is not requested twice."""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        max_retries=retry,
+        pool_connections=max_connections,
+        pool_maxsize=max_connections,
+        pool_block=True,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(name: str, **session_options: Any) -> requests.Session:
+    """Returns the shared session of this process for the named service.
+
+    Sessions are keyed by process id as well, so that forked workers never
+    share the connections of their parent process."""
+    key = (os.getpid(), name)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = create_session(**session_options)
+            _sessions[key] = session
+    return session
+
+
+class _ChunkReader:
+    """Buffers an iterator of byte chunks for the multipart parser."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self.buffer = b""
+
+    def fill(self) -> bool:
+        """Reads the next chunk into the buffer. Returns False at the end."""
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer += chunk
+                return True
+        return False
+
+    def read_until(self, separator: bytes) -> int:
+        """Fills the buffer until it contains the separator, and returns its
+        index or -1 if the stream ended first."""
+        index = self.buffer.find(separator)
+        while index == -1 and self.fill():
+            index = self.buffer.find(separator)
+        return index
+
+    def skip_until(self, separator: bytes) -> int:
+        """Like `read_until`, but discards the data before the separator while
+        reading, so that skipped parts are not accumulated in memory."""
+        index = self.buffer.find(separator)
+        while index == -1:
+            keep = len(separator) - 1
+            self.buffer = self.buffer[-keep:] if keep else b""
+            if not self.fill():
+                return -1
+            index = self.buffer.find(separator)
+        return index
+
+
+def detect_multipart_boundary(reader: _ChunkReader) -> bytes | None:
+    """Detects the boundary from the first delimiter line of the body, for
+    responses whose Content-Type header omits it."""
+    line_end = reader.read_until(b"\r\n")
+    first_line = reader.buffer if line_end == -1 else reader.buffer[:line_end]
+    if not first_line.startswith(b"--"):
+        return None
+    return first_line[2:].rstrip(b"\r\n")
+
+
+def _copy_part_body(reader: _ChunkReader, body_delimiter: bytes) -> IO[bytes]:
+    part_file = tempfile.SpooledTemporaryFile(max_size=MULTIPART_PART_MAX_MEMORY_SIZE)
+    while True:
+        index = reader.buffer.find(body_delimiter)
+        if index != -1:
+            part_file.write(reader.buffer[:index])
+            break
+        # Keep the tail, which may hold the beginning of the delimiter
+        safe_length = len(reader.buffer) - len(body_delimiter)
+        if safe_length > 0:
+            part_file.write(reader.buffer[:safe_length])
+            reader.buffer = reader.buffer[safe_length:]
+        if not reader.fill():
+            # Unterminated part, keep what was received
+            part_file.write(reader.buffer.rstrip(b"\r\n"))
+            break
+
+    part_file.seek(0)
+    return part_file
+
+
+def extract_multipart_part(
+    chunks: Iterable[bytes], boundary: bytes | None, media_type: str
+) -> IO[bytes] | None:
+    """Copies the body of the first part whose headers mention `media_type`
+    into a temporary file, reading the multipart body incrementally.
+
+    Only a buffer of about one chunk is held in memory, whatever the size of
+    the parts. Returns the file positioned at its start, or None if no part
+    matched."""
+    reader = _ChunkReader(chunks)
+    if boundary is None:
+        boundary = detect_multipart_boundary(reader)
+        if boundary is None:
+            return None
+
+    delimiter = b"--" + boundary
+    target = media_type.lower().encode("utf-8")
+
+    while True:
+        # Skip to the start of the next part
+        index = reader.skip_until(delimiter)
+        if index == -1:
+            return None
+        reader.buffer = reader.buffer[index + len(delimiter) :]
+        while len(reader.buffer) < 2 and reader.fill():
+            pass
+        if reader.buffer.startswith(b"--"):
+            # Closing delimiter
+            return None
+
+        headers_end = reader.read_until(b"\r\n\r\n")
+        if headers_end == -1:
+            return None
+        headers = reader.buffer[:headers_end].lower()
+        reader.buffer = reader.buffer[headers_end + 4 :]
+        if target not in headers:
+            continue
+
+        return _copy_part_body(reader, b"\r\n" + delimiter)
+
+
+def release_response_connection(response: requests.Response) -> None:
+    """Reads the rest of a partially read streamed response, and returns its
+    connection to the pool, so that the connection can be reused."""
+    drain_conn = getattr(response.raw, "drain_conn", None)
+    if drain_conn is not None:
+        drain_conn()
+    release_conn = getattr(response.raw, "release_conn", None)
+    if release_conn is not None:
+        release_conn()
+
+
+def replace_response_body(
+    response: requests.Response, body: IO[bytes], content_type: str
+) -> None:
+    """Makes the response read its content from `body` instead of the
+    connection, both for `content` and `iter_content`.
+
+    The connection is released to the pool first, as the pool of a session
+    blocks when all of its connections are held."""
+    release_response_connection(response)
+    response.raw = body
+    response._content = False
+    response._content_consumed = False
+    response.headers["Content-Type"] = content_type
+    response.headers.pop("Content-Length", None)
@@ -10,7 +10,16 @@ from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from rest_framework import status
 
+from integrations.http import (
+    MULTIPART_CHUNK_SIZE,
+    extract_multipart_part,
+    get_session,
+    release_response_connection,
+    replace_response_body,
+)
+
 RYYTI_ACCESS_TOKEN_CACHE_KEY = "ryyti_access_token"
+RYYTI_SESSION_NAME = "ryyti"
 
 
 class RyytiException(Exception):
@@ -120,7 +129,7 @@ class RyytiClient:
         auth_header_b64 = base64.b64encode(auth_header).decode("utf-8")
 
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 self.auth_url,
                 headers={
                     "Accept": "application/json",
@@ -159,19 +168,18 @@ class RyytiClient:
         """Remove keys with None values from the parameters dictionary."""
         return {k: v for k, v in params.items() if v is not None}
 
+    def _get_session(self) -> requests.Session:
+        return get_session(RYYTI_SESSION_NAME)
+
     def _extract_boundary(self, response: requests.Response) -> bytes | None:
-        """Extract the multipart boundary from headers or detect it from content."""
-        # 1. Try to find the boundary in the Content-Type header
+        """Extract the multipart boundary from the Content-Type header."""
         content_type = response.headers.get("Content-Type", "")
         boundary_match = re.search(r"boundary=([^; ]+)", content_type)
         if boundary_match:
             return boundary_match.group(1).strip().strip('"').encode("utf-8")
 
-        # 2. Fallback: Detect from content (some APIs are non-compliant and omit the header parameter)
-        if response.content.startswith(b"--"):
-            first_line = response.content.split(b"\r\n", 1)[0]
-            return first_line[2:].rstrip(b"\r\n")
-
+        # Some APIs are non-compliant and omit the header parameter, in which
+        # case the boundary is detected from the content while parsing it
         return None
 
     def _get(
@@ -188,7 +196,7 @@ class RyytiClient:
         options.setdefault("stream", False)
 
         try:
-            response = requests.get(
+            response = self._get_session().get(
                 url,
                 headers={
                     "Authorization": f"Bearer {token}",
@@ -208,30 +216,20 @@ class RyytiClient:
             response.status_code == status.HTTP_200_OK
             and MediaType.MULTIPART_FORM_DATA in content_type
         ):
-            boundary = self._extract_boundary(response)
-
-            if boundary:
-                # Note: Accessing response.content stores it in memory,
-                # when streaming the response the data comes from memory, negating any memory savings from streaming.
-                parts = response.content.split(b"--" + boundary)
-                target_content_type = accept.lower().encode("utf-8")
-
-                for part in parts:
-                    if b"\r\n\r\n" not in part:
-                        continue
-
-                    # Split headers and content
-                    header_body = part.split(b"\r\n\r\n", 1)
-                    if len(header_body) < 2:
-                        continue
-
-                    headers_raw, body = header_body
-                    if target_content_type in headers_raw.lower():
-                        # Clean up the body (parts often end with \r\n)
-                        # The last part is expected to have \r\n at the end before the closing boundary
-                        response._content = body.rstrip(b"\r\n")
-                        response.headers["Content-Type"] = accept
-                        break
+            # The parts are parsed incrementally from the response stream, and
+            # the requested part is spooled to a temporary file, from which the
+            # response content is then read.
+            part = extract_multipart_part(
+                response.iter_content(chunk_size=MULTIPART_CHUNK_SIZE),
+                self._extract_boundary(response),
+                accept,
+            )
+            if part is None:
+                release_response_connection(response)
+                raise RyytiException(
+                    f"Ryyti API response did not contain a part of type {accept}"
+                )
+            replace_response_body(response, part, accept)
 
         return response
 
@@ -0,0 +1,134 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from integrations.http import (
+    create_session,
+    extract_multipart_part,
+    get_session,
+    replace_response_body,
+)
+
+BOUNDARY = "test-boundary"
+LARGE_PDF = b"%PDF-1.4-" + b"x" * 500_000
+MULTIPART_BODY = (
+    (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="metadata"\r\n'
+        "Content-Type: application/json\r\n\r\n"
+        '{"numberOfResults": 1}\r\n'
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="1.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    + LARGE_PDF
+    + f"\r\n--{BOUNDARY}--\r\n".encode()
+)
+
+
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.request_count += 1
+        if self.path == "/unavailable" and self.server.request_count == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/form-data; boundary={BOUNDARY}")
+        self.send_header("Content-Length", str(len(MULTIPART_BODY)))
+        self.end_headers()
+        self.wfile.write(MULTIPART_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_service():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeServiceHandler)
+    server.request_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    server.url = f"http://{host}:{port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_extract_multipart_part(chunk_size):
+    chunks = [
+        MULTIPART_BODY[i : i + chunk_size]
+        for i in range(0, len(MULTIPART_BODY), chunk_size)
+    ]
+
+    part = extract_multipart_part(chunks, BOUNDARY.encode(), "application/pdf")
+
+    assert part.read() == LARGE_PDF
+
+
+def test_extract_multipart_part_detects_boundary():
+    part = extract_multipart_part([MULTIPART_BODY], None, "application/json")
+
+    assert part.read() == b'{"numberOfResults": 1}'
+
+
+def test_extract_multipart_part_no_matching_part():
+    assert extract_multipart_part([MULTIPART_BODY], None, "text/plain") is None
+
+
+def test_get_session_is_shared():
+    assert get_session("test") is get_session("test")
+    assert get_session("test") is not get_session("other")
+
+
+def test_session_streams_multipart_part(fake_service):
+    session = get_session("test-streaming")
+
+    with session.get(f"{fake_service.url}/extract", stream=True) as response:
+        part = extract_multipart_part(
+            response.iter_content(chunk_size=1024), None, "application/pdf"
+        )
+
+    assert part.read() == LARGE_PDF
+
+
+def test_replaced_response_body_releases_connection(fake_service):
+    max_connections = 2
+    session = create_session(max_connections=max_connections)
+    results = []
+
+    def get_parts():
+        for _ in range(max_connections + 2):
+            response = session.get(f"{fake_service.url}/extract", stream=True)
+            # The metadata part is the first one, so the rest of the body is
+            # left unread on the connection
+            part = extract_multipart_part(
+                response.iter_content(chunk_size=1024), None, "application/json"
+            )
+            replace_response_body(response, part, "application/json")
+            results.append(response.content)
+
+    # The pool blocks when all the connections are held, so the calls are
+    # made in a thread that must finish
+    thread = threading.Thread(target=get_parts, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert results == [b'{"numberOfResults": 1}'] * (max_connections + 2)
+
+
+def test_session_retries_unavailable_service(fake_service):
+    session = get_session("test-retry", backoff_factor=0)
+
+    response = session.get(f"{fake_service.url}/unavailable")
+
+    assert response.status_code == 200
+    assert fake_service.request_count == 2
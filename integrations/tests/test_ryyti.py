@@ -1,3 +1,4 @@
+import io
 from unittest.mock import ANY, MagicMock, patch
 
 import pytest
@@ -52,7 +53,7 @@ def test_init_missing_config():
 
 
 def test_get_access_token_success(ryyti_client):
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
@@ -71,7 +72,7 @@ def test_get_access_token_success(ryyti_client):
 def test_get_access_token_cached(ryyti_client):
     cache.set("ryyti_access_token", "cached_token", 3600)
 
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         token = ryyti_client.get_access_token()
 
         assert token == "cached_token"
@@ -79,7 +80,7 @@ def test_get_access_token_cached(ryyti_client):
 
 
 def test_get_access_token_failure(ryyti_client):
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_response = MagicMock()
         mock_response.status_code = 401
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
@@ -93,7 +94,7 @@ def test_get_access_token_failure(ryyti_client):
 
 def test_get_company_info_success(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"name": "Test Company"}
@@ -118,7 +119,7 @@ def test_get_company_info_success(ryyti_client):
 
 def test_get_company_info_404(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 404
             # A Response object with status_code 404 is falsy
@@ -133,7 +134,7 @@ def test_get_company_info_404(ryyti_client):
 
 def test_get_trade_register_extract_success(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"trade_name": "Test Trade Name"}
@@ -160,7 +161,7 @@ def test_get_trade_register_extract_success(ryyti_client):
 
 def test_get_pdf_document_success(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.content = b"PDF_CONTENT"
@@ -194,7 +195,7 @@ def test_get_pdf_document_success(ryyti_client):
 
 def test_get_exception_handling(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 500
             mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
@@ -208,7 +209,7 @@ def test_get_exception_handling(ryyti_client):
 
 def test_get_notifications_success(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"notifications": []}
@@ -255,7 +256,7 @@ def test_get_trade_register_extract_json_validation(ryyti_client):
 
 def test_get_trade_register_extract_pdf_success(ryyti_client):
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.content = b"PDF_CONTENT"
@@ -310,13 +311,13 @@ def test_get_trade_register_extract_pdf_multipart(ryyti_client):
     ).encode("utf-8")
 
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = requests.Response()
             mock_response.status_code = 200
             mock_response.headers["Content-Type"] = (
                 f"multipart/form-data; boundary={boundary}"
             )
-            mock_response._content = content
+            mock_response.raw = io.BytesIO(content)
             mock_get.return_value = mock_response
 
             result = ryyti_client.get_trade_register_extract_pdf(
@@ -339,12 +340,12 @@ def test_get_trade_register_extract_pdf_multipart_no_boundary_header(ryyti_clien
     ).encode("utf-8")
 
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = requests.Response()
             mock_response.status_code = 200
             # Missing boundary in header
             mock_response.headers["Content-Type"] = "multipart/form-data;charset=UTF-8"
-            mock_response._content = content
+            mock_response.raw = io.BytesIO(content)
             mock_get.return_value = mock_response
 
             result = ryyti_client.get_trade_register_extract_pdf(
@@ -367,13 +368,13 @@ def test_get_trade_register_extract_json_multipart(ryyti_client):
     ).encode("utf-8")
 
     with patch.object(RyytiClient, "get_access_token", return_value="token"):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = requests.Response()
             mock_response.status_code = 200
             mock_response.headers["Content-Type"] = (
                 f"multipart/form-data; boundary={boundary}"
             )
-            mock_response._content = content
+            mock_response.raw = io.BytesIO(content)
             mock_get.return_value = mock_response
 
             result = ryyti_client.get_trade_register_extract_json(
@@ -0,0 +1,75 @@
+from typing import Iterable
+
+from django.db.models import Prefetch, prefetch_related_objects
+
+from leasing.models import Lease
+from leasing.models.rent import (
+    CALCULATION_CONTEXT_ATTRIBUTE,
+    ContractRent,
+    FixedInitialYearRent,
+    Index,
+    RentAdjustment,
+)
+
+
+class RentCalculationContext:
+    """Preloads everything that the rent amount calculation of the leases
+    reads from the database, so that the rents of many leases can be
+    calculated for any number of periods without further queries.
+
+    The types of the leases, and the rents with their due dates, contract
+    rents, fixed initial year rents and rent adjustments are prefetched with
+    one query each, and the yearly indexes are read once and shared by all the
+    rents and periods. The subventions of the rent adjustments are not read by
+    the calculation, so they are not prefetched. The context is attached
+    to the leases and their rents, whose calculation methods then filter the
+    preloaded items in memory.
+
+    The preloaded data is not refreshed, so the context should only be used
+    for dry run calculations."""
+
+    def __init__(self, leases: Iterable[Lease]):
+        self.leases = list(leases)
+
+        prefetch_related_objects(
+            self.leases,
+            "type",
+            "rents",
+            "rents__due_dates",
+            Prefetch(
+                "rents__contract_rents",
+                queryset=ContractRent.objects.select_related(
+                    "intended_use", "index"
+                ).order_by("id"),
+            ),
+            Prefetch(
+                "rents__fixed_initial_year_rents",
+                queryset=FixedInitialYearRent.objects.select_related(
+                    "intended_use"
+                ).order_by("id"),
+            ),
+            Prefetch(
+                "rents__rent_adjustments",
+                queryset=RentAdjustment.objects.select_related("intended_use").order_by(
+                    "id"
+                ),
+            ),
+        )
+
+        # The yearly average indexes, latest first
+        self.yearly_indexes = list(
+            Index.objects.filter(month__isnull=True).order_by("-year")
+        )
+
+        for lease in self.leases:
+            setattr(lease, CALCULATION_CONTEXT_ATTRIBUTE, self)
+            for rent in lease.rents.all():
+                setattr(rent, CALCULATION_CONTEXT_ATTRIBUTE, self)
+
+    def get_latest_index_for_year(self, year: int) -> Index | None:
+        """Same as `Index.objects.get_latest_for_year`"""
+        for index in self.yearly_indexes:
+            if index.year <= year - 1:
+                return index
+
+        return None
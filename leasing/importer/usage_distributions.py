@@ -1,9 +1,10 @@
 import logging
 import sys
+from collections import defaultdict
 from itertools import groupby
-from typing import List
 
 from django.conf import settings
+from django.db import transaction
 
 from leasing.importer.base import BaseImporter
 from leasing.importer.utils import rows_to_dict_list
@@ -19,11 +20,18 @@ logger.setLevel(logging.INFO)
 class UsageDistributionImporter(BaseImporter):
     type_name = "usage_distributions"
 
-    def __init__(self, stdout=None, stderr=None):
+    def __init__(self, stdout=None, stderr=None, connection=None):
         self.stdout = stdout
         self.stderr = stderr
+        # A DB-API connection to use instead of the Facta database, e.g. a
+        # local fixture database in tests
+        self.connection = connection
 
     def initialize_importer(self):
+        if self.connection is not None:
+            self.cursor = self.connection.cursor()
+            return
+
         import oracledb
 
         connection = oracledb.connect(
@@ -82,9 +90,81 @@ class UsageDistributionImporter(BaseImporter):
 
         cursor.execute(query)
 
-        usage_distribution_rows = rows_to_dict_list(cursor)
+        # Oracle returns the unquoted column names in upper case, other
+        # databases may not
+        usage_distribution_rows = [
+            {column.upper(): value for column, value in row.items()}
+            for row in rows_to_dict_list(cursor)
+        ]
         logger.info(f"Fetched {len(usage_distribution_rows)} rows")
 
+        self.apply_usage_distributions(usage_distribution_rows)
+
+    def apply_usage_distributions(self, usage_distribution_rows: list[dict]):
+        """Makes the usage distributions of the plan units match the rows.
+
+        The plan units are resolved and their current usage distributions read
+        with one query each, and the difference to the rows is written with
+        bulk inserts, updates and deletes."""
+        target_keys_by_identifier = self._get_target_usage_distribution_keys(
+            usage_distribution_rows
+        )
+
+        plan_unit_ids_by_identifier: dict[str, list[int]] = defaultdict(list)
+        for plan_unit_id, identifier in PlanUnit.objects.filter(
+            identifier__in=target_keys_by_identifier.keys()
+        ).values_list("id", "identifier"):
+            plan_unit_ids_by_identifier[identifier].append(plan_unit_id)
+
+        target_keys_by_plan_unit_id = {
+            plan_unit_id: target_keys_by_identifier[identifier]
+            for identifier, plan_unit_ids in plan_unit_ids_by_identifier.items()
+            for plan_unit_id in plan_unit_ids
+        }
+
+        existing_by_plan_unit_id: dict[int, list[UsageDistribution]] = defaultdict(list)
+        for usage_distribution in UsageDistribution.objects.filter(
+            plan_unit_id__in=target_keys_by_plan_unit_id.keys()
+        ).order_by("id"):
+            existing_by_plan_unit_id[usage_distribution.plan_unit_id].append(
+                usage_distribution
+            )
+
+        to_create: list[UsageDistribution] = []
+        to_update: list[UsageDistribution] = []
+        to_delete: list[UsageDistribution] = []
+        for plan_unit_id, target_keys in target_keys_by_plan_unit_id.items():
+            created, updated, deleted = self._diff_usage_distributions(
+                plan_unit_id, target_keys, existing_by_plan_unit_id[plan_unit_id]
+            )
+            to_create.extend(created)
+            to_update.extend(updated)
+            to_delete.extend(deleted)
+
+        with transaction.atomic():
+            UsageDistribution.objects.filter(
+                id__in=[usage_distribution.id for usage_distribution in to_delete]
+            ).delete()
+            UsageDistribution.objects.bulk_update(
+                to_update, ["distribution", "build_permission"], batch_size=1000
+            )
+            UsageDistribution.objects.bulk_create(to_create, batch_size=1000)
+
+        logger.info(
+            f"Usage distributions of {len(target_keys_by_plan_unit_id)} plan units: "
+            f"{len(to_create)} created, {len(to_update)} updated, "
+            f"{len(to_delete)} deleted"
+        )
+
+    def _get_target_usage_distribution_keys(
+        self, usage_distribution_rows: list[dict]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Returns the distinct (distribution, build permission) pairs of the
+        rows by normalized plan unit identifier.
+
+        If several Facta identifiers normalize to the same identifier, the
+        last one wins, as the rows are ordered by the Facta identifier."""
+        target_keys_by_identifier = {}
         # Ensure that the rows are ordered by KAAVAYKSIKKOTUNNUS for itertools.groupby()
         for row_plan_unit_identifier, usage_distributions_group in groupby(
             usage_distribution_rows, key=lambda row: row["KAAVAYKSIKKOTUNNUS"]
@@ -92,44 +172,56 @@ class UsageDistributionImporter(BaseImporter):
             plan_unit_identifier = self._strip_leading_zeros_from_identifier(
                 row_plan_unit_identifier
             )
-
-            plan_unit_qs = PlanUnit.objects.filter(identifier=plan_unit_identifier)
-            # Make iterator a list so it can be reused
-            grouped_usage_distributions_list = list(usage_distributions_group)
-
-            for plan_unit in plan_unit_qs:
-                # Usage distribution ids that existed already or were created
-                existing_or_created_usage_distributions_ids: List[int] = []
-
-                for usage_distribution_row in grouped_usage_distributions_list:
-                    usage_distribution, _created = (
-                        UsageDistribution.objects.get_or_create(
-                            plan_unit=plan_unit,
-                            distribution=usage_distribution_row["C_KAYTJAKAUMA"] or "-",
-                            build_permission=self._get_build_permission_value(
-                                usage_distribution_row
-                            ),
-                        )
+            target_keys_by_identifier[plan_unit_identifier] = list(
+                dict.fromkeys(
+                    (
+                        row["C_KAYTJAKAUMA"] or "-",
+                        self._get_build_permission_value(row),
                     )
+                    for row in usage_distributions_group
+                )
+            )
+        return target_keys_by_identifier
+
+    def _diff_usage_distributions(
+        self,
+        plan_unit_id: int,
+        target_keys: list[tuple[str, str]],
+        existing_usage_distributions: list[UsageDistribution],
+    ) -> tuple[
+        list[UsageDistribution], list[UsageDistribution], list[UsageDistribution]
+    ]:
+        """Returns the usage distributions of one plan unit to create, update
+        and delete. Existing usage distributions matching a target are kept
+        and the redundant ones are reused for the missing targets before the
+        rest are deleted."""
+        missing_keys = dict.fromkeys(target_keys)
+        redundant = []
+        for usage_distribution in existing_usage_distributions:
+            key = (usage_distribution.distribution, usage_distribution.build_permission)
+            if key in missing_keys:
+                del missing_keys[key]
+            else:
+                redundant.append(usage_distribution)
 
-                    existing_or_created_usage_distributions_ids.append(
-                        usage_distribution.id
+        updated = []
+        created = []
+        for distribution, build_permission in missing_keys:
+            if redundant:
+                usage_distribution = redundant.pop(0)
+                usage_distribution.distribution = distribution
+                usage_distribution.build_permission = build_permission
+                updated.append(usage_distribution)
+            else:
+                created.append(
+                    UsageDistribution(
+                        plan_unit_id=plan_unit_id,
+                        distribution=distribution,
+                        build_permission=build_permission,
                     )
-                    if _created:
-                        logger.info(
-                            f"Created a usage distribution with id {usage_distribution.id} "
-                            f"for plan unit {plan_unit.identifier}"
-                        )
-
-                redundant_usage_distributions = plan_unit.usage_distributions.exclude(
-                    id__in=existing_or_created_usage_distributions_ids
                 )
-                if redundant_usage_distributions.exists():
-                    logger.info(
-                        f"Deleting {redundant_usage_distributions.count()} redundant "
-                        f"usage distributions from plan unit {plan_unit.identifier}"
-                    )
-                redundant_usage_distributions.delete()
+
+        return created, updated, redundant
 
     def _strip_leading_zeros_from_identifier(self, identifier: str) -> str:
         """
@@ -1,14 +1,16 @@
 import logging
 import sys
+from collections import defaultdict
 
 from django.contrib.gis.geos.error import GEOSException
 from django.core.management.base import BaseCommand
-from django.db import InternalError
+from django.db import InternalError, connection
 from django.utils import timezone
 
 from leasing.enums import AreaType, PlotType
 from leasing.models import Area, Lease
 from leasing.models.land_area import (
+    LeaseArea,
     PlanUnit,
     PlanUnitIntendedUse,
     PlanUnitState,
@@ -20,9 +22,385 @@ from leasing.models.land_area import (
 LOG = logging.getLogger(__name__)
 
 
+# Finds the areas of the given type that intersect the given lease area areas,
+# excluding the ones that only touch them, with one spatial join.
+INTERSECTING_AREAS_SQL = """
+    SELECT lease_area_area.id, intersecting_area.id
+    FROM leasing_area lease_area_area
+    INNER JOIN leasing_area intersecting_area
+        ON ST_Intersects(intersecting_area.geometry, lease_area_area.geometry)
+        AND NOT ST_Touches(intersecting_area.geometry, lease_area_area.geometry)
+    WHERE lease_area_area.id = ANY(%s)
+    AND intersecting_area.type = %s
+    ORDER BY lease_area_area.id, intersecting_area.id
+"""
+
+# Finds the plot division that intersects each of the given plan unit areas the
+# most, with one spatial join.
+PLOT_DIVISIONS_SQL = """
+    SELECT DISTINCT ON (plan_unit_area.id)
+        plan_unit_area.id,
+        plot_division_area.id,
+        ST_Area(
+            ST_Transform(
+                ST_Intersection(
+                    plot_division_area.geometry, plan_unit_area.geometry
+                ),
+                3879
+            )
+        ) AS interarea
+    FROM leasing_area plan_unit_area
+    INNER JOIN leasing_area plot_division_area
+        ON ST_Intersects(plot_division_area.geometry, plan_unit_area.geometry)
+    WHERE plan_unit_area.id = ANY(%s)
+    AND plot_division_area.type = %s
+    ORDER BY plan_unit_area.id, interarea DESC
+"""
+
+# The area types that are attached to the lease areas as plots or plan units
+INTERSECTING_AREA_TYPES = [
+    AreaType.REAL_PROPERTY,
+    AreaType.UNSEPARATED_PARCEL,
+    AreaType.PLAN_UNIT,
+]
+
+
+class NamedObjectCache:
+    """Preloaded name-to-object lookup for the small name tables, which
+    creates the missing objects like get_or_create."""
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.objects = {obj.name: obj for obj in model_class.objects.all()}
+
+    def get(self, name):
+        if name not in self.objects:
+            self.objects[name] = self.model_class.objects.create(name=name)
+        return self.objects[name]
+
+
+class BulkAreaAttacher:
+    """Attaches the areas to the lease areas of all leases with a few spatial
+    joins, and writes the plots and plan units in bulk."""
+
+    def __init__(self):
+        self.now = timezone.now()
+        self.plot_division_states = NamedObjectCache(PlotDivisionState)
+        self.plan_unit_types = NamedObjectCache(PlanUnitType)
+        self.plan_unit_states = NamedObjectCache(PlanUnitState)
+        self.plan_unit_intended_uses = NamedObjectCache(PlanUnitIntendedUse)
+
+        # Master plots and plan units of the processed lease areas by their
+        # get_or_create match data
+        self.plots = {}
+        self.plan_units = {}
+        self.handled_plot_keys = set()
+        self.handled_plan_unit_keys = set()
+
+    def get_lease_areas_by_area(self):
+        """Matches the lease area areas to the lease areas by the lease and
+        the land identifier. Returns a dict of lease areas by area."""
+        lease_areas_by_lease = defaultdict(dict)
+        for lease_area in LeaseArea.objects.select_related(
+            "lease__identifier__type",
+            "lease__identifier__municipality",
+            "lease__identifier__district",
+        ).filter(lease__deleted__isnull=True):
+            if lease_area.lease.identifier is None:
+                continue
+            lease_areas_by_lease[str(lease_area.lease.identifier)][
+                lease_area.get_normalized_identifier()
+            ] = lease_area
+
+        lease_areas_by_area = {}
+        for area in Area.objects.filter(
+            type=AreaType.LEASE_AREA, identifier__in=lease_areas_by_lease.keys()
+        ).order_by("id"):
+            lease_area = lease_areas_by_lease[area.identifier].get(
+                area.get_normalized_identifier()
+            )
+            if lease_area is None:
+                LOG.debug(
+                    "Lease %s: Area id %s not in lease areas of lease!",
+                    area.identifier,
+                    area.get_normalized_identifier(),
+                )
+                continue
+            lease_areas_by_area[area] = lease_area
+
+        return lease_areas_by_area
+
+    def get_intersecting_area_ids(self, area_ids, area_type):
+        intersecting_area_ids = defaultdict(list)
+        with connection.cursor() as cursor:
+            cursor.execute(INTERSECTING_AREAS_SQL, [area_ids, area_type.value])
+            for area_id, intersecting_area_id in cursor.fetchall():
+                intersecting_area_ids[area_id].append(intersecting_area_id)
+        return intersecting_area_ids
+
+    def get_plot_divisions(self, plan_unit_area_ids):
+        """Returns the plot division area that intersects the most, and the
+        area of the intersection, by plan unit area id."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                PLOT_DIVISIONS_SQL,
+                [plan_unit_area_ids, AreaType.PLOT_DIVISION.value],
+            )
+            rows = cursor.fetchall()
+
+        plot_division_areas = Area.objects.in_bulk(
+            {plot_division_id for _, plot_division_id, _ in rows}
+        )
+        return {
+            plan_unit_area_id: (plot_division_areas[plot_division_id], interarea)
+            for plan_unit_area_id, plot_division_id, interarea in rows
+        }
+
+    def get_detailed_plan_identifiers(self, plan_unit_areas):
+        identifiers = {
+            area.metadata.get("detailed_plan_identifier") for area in plan_unit_areas
+        }
+        detailed_plan_identifiers = set(
+            Area.objects.filter(
+                type=AreaType.DETAILED_PLAN, identifier__in=identifiers
+            ).values_list("identifier", flat=True)
+        )
+        return detailed_plan_identifiers
+
+    def load_master_items(self, lease_areas):
+        for plot in Plot.objects.filter(lease_area__in=lease_areas, is_master=True):
+            self.plots.setdefault(
+                (plot.lease_area_id, plot.type, plot.identifier), plot
+            )
+        for plan_unit in PlanUnit.objects.filter(
+            lease_area__in=lease_areas, is_master=True
+        ):
+            self.plan_units.setdefault(
+                (plan_unit.lease_area_id, plan_unit.identifier), plan_unit
+            )
+
+    def get_intersection_area(self, intersect_area, area, lease_area):
+        if not intersect_area.metadata.get("area"):
+            LOG.debug(
+                "Lease area #%s: DISCARD area %s: no 'area' value in metadata",
+                lease_area.id,
+                intersect_area.id,
+            )
+            return None
+
+        try:
+            intersection = intersect_area.geometry & area.geometry
+            intersection.transform(3879)
+        except GEOSException as e:
+            LOG.exception("Discarding too small intersect area failed %s", e)
+            return None
+
+        if intersection.area < 1:
+            LOG.debug(
+                "Lease area #%s: DISCARD area %s: intersection area too small",
+                lease_area.id,
+                intersect_area.id,
+            )
+            return None
+
+        return intersection.area
+
+    def set_master_item(self, items, key, model_class, data):
+        item = items.get(key)
+        if item is None:
+            items[key] = model_class(master_timestamp=self.now, **data)
+            return
+
+        for attr, value in data.items():
+            setattr(item, attr, value)
+
+    def set_plot(self, lease_area, intersect_area, section_area):
+        plot_type = PlotType[intersect_area.type.value.upper()]
+        identifier = intersect_area.get_denormalized_identifier()
+        key = (lease_area.id, plot_type, identifier)
+        self.set_master_item(
+            self.plots,
+            key,
+            Plot,
+            {
+                "lease_area": lease_area,
+                "type": plot_type,
+                "identifier": identifier,
+                "is_master": True,
+                "area": float(intersect_area.metadata.get("area")),
+                "section_area": section_area,
+                "registration_date": intersect_area.metadata.get("registration_date"),
+                "repeal_date": intersect_area.metadata.get("repeal_date"),
+                "geometry": intersect_area.geometry,
+            },
+        )
+        self.handled_plot_keys.add(key)
+
+    def set_plan_unit(
+        self,
+        lease_area,
+        intersect_area,
+        section_area,
+        plot_division_area,
+        detailed_plan_identifiers,
+    ):
+        metadata = intersect_area.metadata
+        detailed_plan_identifier = metadata.get("detailed_plan_identifier")
+        if detailed_plan_identifier not in detailed_plan_identifiers:
+            detailed_plan_identifier = None
+
+        plan_unit_state = self.plan_unit_states.get(metadata.get("state_name"))
+        plan_unit_intended_use = None
+        if metadata.get("intended_use_name"):
+            plan_unit_intended_use = self.plan_unit_intended_uses.get(
+                metadata.get("intended_use_name")
+            )
+
+        identifier = intersect_area.get_denormalized_identifier()
+        data = {
+            "lease_area": lease_area,
+            "identifier": identifier,
+            "is_master": True,
+            "area": float(metadata.get("area")),
+            "section_area": section_area,
+            "geometry": intersect_area.geometry,
+            "plot_division_identifier": plot_division_area.identifier,
+            "plot_division_date_of_approval": plot_division_area.metadata.get(
+                "date_of_approval"
+            ),
+            "plot_division_effective_date": plot_division_area.metadata.get(
+                "effective_date"
+            ),
+            "plot_division_state": self.plot_division_states.get(
+                plot_division_area.metadata.get("state_name")
+            ),
+            "detailed_plan_identifier": detailed_plan_identifier,
+            "detailed_plan_latest_processing_date": None,
+            "plan_unit_type": self.plan_unit_types.get(metadata.get("type_name")),
+            "plan_unit_state": plan_unit_state,
+            "plan_unit_intended_use": plan_unit_intended_use,
+        }
+        if plan_unit_state.to_enum() is not None:
+            data["plan_unit_status"] = plan_unit_state.to_enum()
+
+        key = (lease_area.id, identifier)
+        self.set_master_item(self.plan_units, key, PlanUnit, data)
+        self.handled_plan_unit_keys.add(key)
+
+    def save_master_items(self, model_class, items, handled_keys):
+        new_items = []
+        changed_items = []
+        for key in handled_keys:
+            item = items[key]
+            if item.pk is None:
+                new_items.append(item)
+                continue
+            # Like MasterLandItemMixin.save()
+            if item.tracker.changed():
+                item.master_timestamp = self.now
+            item.modified_at = self.now
+            changed_items.append(item)
+
+        model_class.objects.bulk_create(new_items, batch_size=1000)
+        update_fields = [
+            field.name
+            for field in model_class._meta.concrete_fields
+            if not field.primary_key and field.name != "created_at"
+        ]
+        model_class.objects.bulk_update(changed_items, update_fields, batch_size=1000)
+
+        return [items[key].pk for key in handled_keys]
+
+    def run(self):
+        lease_areas_by_area = self.get_lease_areas_by_area()
+        LOG.info("Matched %s lease area areas.", len(lease_areas_by_area))
+
+        lease_areas_by_id = {}
+        for area, lease_area in lease_areas_by_area.items():
+            lease_area.geometry = area.geometry
+            lease_areas_by_id[lease_area.id] = lease_area
+        lease_areas = list(lease_areas_by_id.values())
+        LeaseArea.objects.bulk_update(lease_areas, ["geometry"], batch_size=1000)
+        self.load_master_items(lease_areas)
+
+        area_ids = [area.id for area in lease_areas_by_area.keys()]
+        areas_by_id = {area.id: area for area in lease_areas_by_area.keys()}
+        for area_type in INTERSECTING_AREA_TYPES:
+            intersecting_area_ids = self.get_intersecting_area_ids(area_ids, area_type)
+            intersecting_areas = Area.objects.in_bulk(
+                {
+                    area_id
+                    for area_ids_of_area in intersecting_area_ids.values()
+                    for area_id in area_ids_of_area
+                }
+            )
+            LOG.info("Found %s %s areas.", len(intersecting_areas), area_type.value)
+
+            if area_type == AreaType.PLAN_UNIT:
+                plot_divisions = self.get_plot_divisions(list(intersecting_areas))
+                detailed_plan_identifiers = self.get_detailed_plan_identifiers(
+                    intersecting_areas.values()
+                )
+
+            for area_id, area_ids_of_area in intersecting_area_ids.items():
+                area = areas_by_id[area_id]
+                lease_area = lease_areas_by_area[area]
+                for intersecting_area_id in area_ids_of_area:
+                    intersect_area = intersecting_areas[intersecting_area_id]
+                    section_area = self.get_intersection_area(
+                        intersect_area, area, lease_area
+                    )
+                    if section_area is None:
+                        continue
+
+                    if area_type != AreaType.PLAN_UNIT:
+                        self.set_plot(lease_area, intersect_area, section_area)
+                        continue
+
+                    plot_division_area, interarea = plot_divisions.get(
+                        intersect_area.id, (None, 0)
+                    )
+                    if plot_division_area and interarea > 0:
+                        self.set_plan_unit(
+                            lease_area,
+                            intersect_area,
+                            section_area,
+                            plot_division_area,
+                            detailed_plan_identifiers,
+                        )
+
+        handled_plot_ids = self.save_master_items(
+            Plot, self.plots, self.handled_plot_keys
+        )
+        handled_plan_unit_ids = self.save_master_items(
+            PlanUnit, self.plan_units, self.handled_plan_unit_keys
+        )
+
+        # Only delete handled objects that do not belong to contracts.
+        delete_filters = {"lease_area__in": lease_areas, "in_contract": False}
+        Plot.objects.filter(**delete_filters).exclude(id__in=handled_plot_ids).delete()
+        PlanUnit.objects.filter(**delete_filters).exclude(
+            id__in=handled_plan_unit_ids
+        ).delete()
+
+        LOG.info(
+            "Saved %s plots and %s plan units.",
+            len(handled_plot_ids),
+            len(handled_plan_unit_ids),
+        )
+
+
 class Command(BaseCommand):
     help = "Attach areas"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Match all areas with a few spatial queries and save the plots "
+            "and plan units in bulk",
+        )
+
     def handle(self, *args, **options):  # noqa: C901 TODO
         from auditlog.registry import auditlog
 
@@ -38,6 +416,10 @@ class Command(BaseCommand):
         for model in list(auditlog._registry.keys()):
             auditlog.unregister(model)
 
+        if options.get("bulk"):
+            BulkAreaAttacher().run()
+            return
+
         leases = Lease.objects.all()
 
         LOG.info("Processing %s leases.", leases.count())
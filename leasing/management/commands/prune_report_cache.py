@@ -0,0 +1,26 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from leasing.report.cache import prune_report_cache
+
+
+class Command(BaseCommand):
+    help = """Remove cached reports that have not been written within the given number of hours.
+    Cached reports are not read after their timeout, and the entries of changed data are never read again."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=24,
+            help="Remove cached reports older than this many hours",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - datetime.timedelta(hours=options["hours"])
+        removed_count = prune_report_cache(older_than)
+        self.stdout.write(
+            self.style.SUCCESS(f"Removed {removed_count} cached report files.")
+        )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from leasing.models.rent_forecast import refresh_lease_rent_forecasts
+
+
+class Command(BaseCommand):
+    help = (
+        "Calculate the yearly rent forecasts of the leases that have changed since "
+        "their forecasts were calculated, or of all the leases with --rebuild"
+    )
+
+    def add_arguments(self, parser):
+        this_year = timezone.now().year
+        parser.add_argument(
+            "--start-year",
+            type=int,
+            default=this_year,
+            help="First year to calculate (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--end-year",
+            type=int,
+            default=this_year + 5,
+            help="Last year to calculate (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Calculate the forecasts of all the leases, and report the number "
+            "of forecasts that differed from the previous ones",
+        )
+
+    def handle(self, *args, **options):
+        if options["end_year"] < options["start_year"]:
+            raise CommandError("End year must not be before start year")
+
+        years = range(options["start_year"], options["end_year"] + 1)
+        result = refresh_lease_rent_forecasts(years, rebuild=options["rebuild"])
+
+        self.stdout.write(
+            "Rent forecasts of {} leases calculated, {} forecasts changed".format(
+                result.lease_count, result.changed_count
+            )
+        )
@@ -6,6 +6,8 @@ from django.apps import apps
 from django.contrib.auth.models import Group, Permission
 from django.core.management.base import BaseCommand, CommandError
 
+from users.permissions import bump_permission_generation
+
 
 class UserGroup(IntEnum):
     SELAILIJA = 1
@@ -723,6 +725,9 @@ class Command(BaseCommand):
 
         # Save the desired field permissions for the groups
         Group.permissions.through.objects.bulk_create(group_permissions)
+        # bulk_create does not send the signals that invalidate the cached
+        # permissions
+        bump_permission_generation()
 
         # Logging
         permissions_by_group = defaultdict(list)
@@ -1,54 +1,127 @@
+import datetime
+
 from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
 
 from leasing.enums import AreaType, DetailedPlanClass
 from leasing.models import Area, DetailedPlan
 
+DETAILED_PLAN_FIELDS = [
+    "acceptor",
+    "detailed_plan_class",
+    "plan_stage",
+    "diary_number",
+    "lawfulness_date",
+]
+
+
+def parse_metadata_date(value):
+    """Dates are stored in the area metadata as ISO formatted strings."""
+    if not value:
+        return None
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def get_detailed_plan_data(metadata, pre_detailed_plan_metadata):
+    detailed_plan_class = None
+    if metadata.get("state_name") == "Vireillä":
+        detailed_plan_class = DetailedPlanClass.PENDING
+    if metadata.get("state_name") == "Voimassa":
+        detailed_plan_class = DetailedPlanClass.EFFECTIVE
+
+    acceptor = ""
+    plan_stage = ""
+    diary_number = ""
+    if pre_detailed_plan_metadata is not None:
+        acceptor = pre_detailed_plan_metadata.get("acceptor") or ""
+        plan_stage = pre_detailed_plan_metadata.get("plan_stage") or ""
+        diary_number = pre_detailed_plan_metadata.get("diary_number") or ""
+
+    return {
+        "acceptor": acceptor,
+        "detailed_plan_class": detailed_plan_class,
+        "plan_stage": plan_stage,
+        "diary_number": diary_number,
+        "lawfulness_date": parse_metadata_date(metadata.get("final_date")),
+    }
+
 
 class Command(BaseCommand):
     help = "Update detailed plans"
 
-    def handle(self, *args, **options):  # noqa: C901 TODO
+    def handle(self, *args, **options):
         from auditlog.registry import auditlog
 
         # Unregister all models from auditlog when importing
         for model in list(auditlog._registry.keys()):
             auditlog.unregister(model)
 
-        detailed_plans = Area.objects.filter(type=AreaType.DETAILED_PLAN)
+        # The detailed plans joined with the metadata of their pre-detailed
+        # plans in one query
+        detailed_plan_areas = (
+            Area.objects.filter(type=AreaType.DETAILED_PLAN)
+            .annotate(
+                pre_detailed_plan_metadata=Subquery(
+                    Area.objects.filter(
+                        type=AreaType.PRE_DETAILED_PLAN,
+                        identifier=OuterRef("identifier"),
+                    )
+                    .order_by("id")
+                    .values("metadata")[:1]
+                )
+            )
+            .order_by("id")
+            .values("identifier", "metadata", "pre_detailed_plan_metadata")
+        )
 
-        if not detailed_plans:
+        if not detailed_plan_areas:
             self.stdout.write("Detailed plan: No detailed plans found in area table")
             return
 
-        for detailed_plan in detailed_plans:
-            match_data = {
-                "identifier": detailed_plan.identifier,
-            }
-
-            detailed_plan_class = None
-            if detailed_plan.metadata.get("state_name") == "Vireillä":
-                detailed_plan_class = DetailedPlanClass.PENDING
-            if detailed_plan.metadata.get("state_name") == "Voimassa":
-                detailed_plan_class = DetailedPlanClass.EFFECTIVE
-            lawfulness_date = detailed_plan.metadata.get("final_date")
-
-            acceptor = ""
-            plan_stage = ""
-            diary_number = ""
-            pre_detailed_plan = Area.objects.filter(
-                type=AreaType.PRE_DETAILED_PLAN, identifier=detailed_plan.identifier
+        existing_detailed_plans = {}
+        for detailed_plan in DetailedPlan.objects.order_by("-id"):
+            existing_detailed_plans[detailed_plan.identifier] = detailed_plan
+
+        # When there are several areas with the same identifier, the last one
+        # wins, like when updating the rows one by one
+        new_detailed_plans = {}
+        changed_detailed_plans = {}
+        now = timezone.now()
+        for detailed_plan_area in detailed_plan_areas:
+            identifier = detailed_plan_area["identifier"]
+            data = get_detailed_plan_data(
+                detailed_plan_area["metadata"] or {},
+                detailed_plan_area["pre_detailed_plan_metadata"],
+            )
+
+            detailed_plan = existing_detailed_plans.get(identifier)
+            if detailed_plan is None:
+                new_detailed_plans[identifier] = DetailedPlan(
+                    identifier=identifier, **data
+                )
+                continue
+
+            if any(
+                getattr(detailed_plan, field_name) != value
+                for field_name, value in data.items()
+            ):
+                for field_name, value in data.items():
+                    setattr(detailed_plan, field_name, value)
+                detailed_plan.modified_at = now
+                changed_detailed_plans[identifier] = detailed_plan
+
+        DetailedPlan.objects.bulk_create(new_detailed_plans.values(), batch_size=1000)
+        DetailedPlan.objects.bulk_update(
+            changed_detailed_plans.values(),
+            DETAILED_PLAN_FIELDS + ["modified_at"],
+            batch_size=1000,
+        )
+
+        self.stdout.write(
+            "Detailed plan: {} created, {} updated".format(
+                len(new_detailed_plans), len(changed_detailed_plans)
             )
-            if pre_detailed_plan:
-                acceptor = pre_detailed_plan.metadata.get("acceptor")
-                plan_stage = pre_detailed_plan.metadata.get("plan_stage")
-                diary_number = pre_detailed_plan.metadata.get("diary_number")
-
-            other_data = {
-                "acceptor": acceptor,
-                "detailed_plan_class": detailed_plan_class,
-                "plan_stage": plan_stage,
-                "diary_number": diary_number,
-                "lawfulness_date": lawfulness_date,
-            }
-
-            DetailedPlan.objects.update_or_create(defaults=other_data, **match_data)
+        )
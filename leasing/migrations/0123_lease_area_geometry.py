@@ -0,0 +1,106 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+# The union of the lease area geometries is stored on the lease and kept up to
+# date by a trigger on the lease areas, so that it is correct also after bulk
+# updates and raw SQL. Updates to the column from anywhere else, e.g. saving a
+# lease instance loaded before its areas changed, are ignored by a trigger on
+# the leases, which only lets through updates made from within another
+# trigger.
+CREATE_TRIGGERS_SQL = """
+CREATE FUNCTION leasing_refresh_lease_area_geometry(refreshed_lease_id integer)
+RETURNS void AS $$
+    UPDATE leasing_lease
+    SET area_geometry = (
+        SELECT ST_Multi(ST_CollectionExtract(ST_Union(la.geometry), 3))
+        FROM leasing_leasearea la
+        WHERE la.lease_id = refreshed_lease_id
+        AND la.deleted IS NULL
+        AND la.geometry IS NOT NULL
+    )
+    WHERE id = refreshed_lease_id;
+$$ LANGUAGE sql;
+
+CREATE FUNCTION leasing_leasearea_geometry_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM leasing_refresh_lease_area_geometry(NEW.lease_id);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM leasing_refresh_lease_area_geometry(OLD.lease_id);
+    ELSE
+        PERFORM leasing_refresh_lease_area_geometry(NEW.lease_id);
+        IF NEW.lease_id <> OLD.lease_id THEN
+            PERFORM leasing_refresh_lease_area_geometry(OLD.lease_id);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER leasing_leasearea_geometry_changed
+AFTER INSERT OR DELETE OR UPDATE OF geometry, lease_id, deleted
+ON leasing_leasearea
+FOR EACH ROW EXECUTE FUNCTION leasing_leasearea_geometry_changed();
+
+CREATE FUNCTION leasing_lease_keep_area_geometry() RETURNS trigger AS $$
+BEGIN
+    IF pg_trigger_depth() = 1 THEN
+        NEW.area_geometry := OLD.area_geometry;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+UPDATE leasing_lease l
+SET area_geometry = (
+    SELECT ST_Multi(ST_CollectionExtract(ST_Union(la.geometry), 3))
+    FROM leasing_leasearea la
+    WHERE la.lease_id = l.id
+    AND la.deleted IS NULL
+    AND la.geometry IS NOT NULL
+)
+WHERE EXISTS (
+    SELECT 1
+    FROM leasing_leasearea la
+    WHERE la.lease_id = l.id
+    AND la.deleted IS NULL
+    AND la.geometry IS NOT NULL
+);
+
+CREATE TRIGGER leasing_lease_keep_area_geometry
+BEFORE UPDATE OF area_geometry ON leasing_lease
+FOR EACH ROW EXECUTE FUNCTION leasing_lease_keep_area_geometry();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS leasing_lease_keep_area_geometry ON leasing_lease;
+DROP FUNCTION IF EXISTS leasing_lease_keep_area_geometry();
+DROP TRIGGER IF EXISTS leasing_leasearea_geometry_changed ON leasing_leasearea;
+DROP FUNCTION IF EXISTS leasing_leasearea_geometry_changed();
+DROP FUNCTION IF EXISTS leasing_refresh_lease_area_geometry(integer);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "leasing",
+            "0122_alter_helptext_for_serviceunit_use_rent_override_receivable_type",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lease",
+            name="area_geometry",
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(
+                blank=True,
+                editable=False,
+                null=True,
+                srid=4326,
+                verbose_name="Combined geometry of the lease areas",
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+# Earlier saves only checked for an existing master item in application code,
+# so concurrent saves may have created duplicate masters. Keep the newest one.
+DEMOTE_DUPLICATE_MASTERS_SQL = """
+UPDATE {table} item
+SET is_master = false
+WHERE item.is_master
+AND EXISTS (
+    SELECT 1 FROM {table} other
+    WHERE other.is_master
+    AND other.lease_area_id = item.lease_area_id
+    AND other.identifier = item.identifier
+    AND other.id > item.id
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leasing", "0123_lease_area_geometry"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            DEMOTE_DUPLICATE_MASTERS_SQL.format(table="leasing_plot"),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            DEMOTE_DUPLICATE_MASTERS_SQL.format(table="leasing_planunit"),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="plot",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_master", True)),
+                fields=("lease_area", "identifier"),
+                name="leasing_plot_unique_master",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="planunit",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_master", True)),
+                fields=("lease_area", "identifier"),
+                name="leasing_planunit_unique_master",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leasing", "0124_master_land_item_unique_constraint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="collateral",
+            name="modified_at",
+            field=models.DateTimeField(
+                auto_now=True, null=True, verbose_name="Time modified"
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leasing", "0125_collateral_modified_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaseRentForecast",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField(verbose_name="Year")),
+                (
+                    "amount",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=6,
+                        max_digits=18,
+                        null=True,
+                        verbose_name="Amount",
+                    ),
+                ),
+                (
+                    "index_version",
+                    models.CharField(max_length=64, verbose_name="Index version"),
+                ),
+                (
+                    "calculated_at",
+                    models.DateTimeField(verbose_name="Time calculated"),
+                ),
+                (
+                    "lease",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rent_forecasts",
+                        to="leasing.lease",
+                        verbose_name="Lease",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Lease rent forecast",
+                "verbose_name_plural": "Lease rent forecasts",
+                "unique_together": {("lease", "year")},
+            },
+        ),
+    ]
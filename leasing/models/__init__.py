@@ -99,6 +99,7 @@ from .rent import (
     RentIntendedUse,
     TemporarySubvention,
 )
+from .rent_forecast import LeaseRentForecast
 from .service_unit import ServiceUnit, ServiceUnitGroupMapping
 from .tenant import Tenant, TenantContact, TenantRentShare
 from .ui_data import UiData
@@ -171,6 +172,7 @@ __all__ = [
     "LeaseholdTransferParty",
     "LeaseholdTransferProperty",
     "LeaseIdentifier",
+    "LeaseRentForecast",
     "LeaseStateLog",
     "LeaseType",
     "LegacyIndex",
@@ -214,6 +214,12 @@ class Collateral(models.Model):
     # In Finnish: Huomautus
     note = models.TextField(verbose_name=_("Note"), null=True, blank=True)
 
+    # The data version of the cached reports. Null for the collaterals that
+    # have not been modified since the field was added.
+    modified_at = models.DateTimeField(
+        auto_now=True, null=True, verbose_name=_("Time modified")
+    )
+
     recursive_get_related_skip_relations = ["contract"]
 
     class Meta:
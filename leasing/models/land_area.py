@@ -1,6 +1,8 @@
+from typing import Iterable
+
 from auditlog.registry import auditlog
 from django.contrib.gis.db import models
-from django.db.models import F
+from django.db.models import F, OuterRef, Q, QuerySet, Subquery
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
@@ -53,6 +55,11 @@ class AbstractAddress(TimeStampedModel):
         abstract = True
 
 
+# Names of the attributes set by `annotate_master` and `prefetch_masters`
+MASTER_ID_ATTRIBUTE = "preloaded_master_id"
+MASTER_TIMESTAMP_ATTRIBUTE = "preloaded_master_timestamp"
+
+
 class MasterLandItemMixin(models.Model):
 
     # In Finnish: Alkuperäiskappale
@@ -66,23 +73,30 @@ class MasterLandItemMixin(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def get_master_constraint(cls, name):
+        """Only one master item can be per lease area and identifier"""
+        return models.UniqueConstraint(
+            fields=["lease_area", "identifier"],
+            condition=Q(is_master=True),
+            name=name,
+        )
+
     def get_tracker(self):
         # Workaround for Tracker issue: https://github.com/jazzband/django-model-utils/pull/80
         return self.tracker
 
+    def _get_master_queryset(self):
+        return self._meta.model.objects.filter(
+            lease_area_id=self.lease_area_id,
+            identifier=self.identifier,
+            is_master=True,
+        )
+
     def save(self, *args, **kwargs):
         if self.is_master:
             # Only one master item can be per lease area and identifier
-            master_item_count = (
-                self._meta.model.objects.filter(
-                    lease_area=self.lease_area,
-                    identifier=self.identifier,
-                    is_master=True,
-                )
-                .exclude(id=self.id)
-                .count()
-            )
-            if master_item_count:
+            if self._get_master_queryset().exclude(id=self.id).exists():
                 raise Exception(
                     _(
                         "The master land item has already created. "
@@ -100,34 +114,82 @@ class MasterLandItemMixin(models.Model):
         if self.is_master:
             return self
         else:
-            return self._meta.model.objects.filter(
-                lease_area=self.lease_area, identifier=self.identifier, is_master=True
-            ).first()
+            return self._get_master_queryset().first()
+
+    def get_master_id(self):
+        if self.is_master:
+            return self.id
+        if hasattr(self, MASTER_ID_ATTRIBUTE):
+            return getattr(self, MASTER_ID_ATTRIBUTE)
+        return self._get_master_queryset().values_list("id", flat=True).first()
 
     @property
     def master_exists(self):
         if self.is_master:
             return True
-        return (
-            self._meta.model.objects.filter(
-                lease_area=self.lease_area, identifier=self.identifier, is_master=True
-            ).count()
-            > 0
-        )
+        return self.get_master_id() is not None
 
     @property
     def is_master_newer(self):
         if self.is_master:
             return False
-        if not self.is_master:
-            master_item = self._meta.model.objects.filter(
-                lease_area=self.lease_area, identifier=self.identifier, is_master=True
-            ).first()
-            if master_item:
-                return master_item.master_timestamp > self.master_timestamp
+        if hasattr(self, MASTER_TIMESTAMP_ATTRIBUTE):
+            master_timestamp = getattr(self, MASTER_TIMESTAMP_ATTRIBUTE)
+        else:
+            master_timestamp = (
+                self._get_master_queryset()
+                .values_list("master_timestamp", flat=True)
+                .first()
+            )
+        if master_timestamp:
+            return master_timestamp > self.master_timestamp
         return False
 
 
+def annotate_master(queryset: QuerySet) -> QuerySet:
+    """Annotates each plot or plan unit with the id and the timestamp of its
+    master item, so that the master properties need no queries of their own."""
+    masters = queryset.model.objects.filter(
+        lease_area_id=OuterRef("lease_area_id"),
+        identifier=OuterRef("identifier"),
+        is_master=True,
+    )
+    return queryset.annotate(
+        **{
+            MASTER_ID_ATTRIBUTE: Subquery(masters.values("id")[:1]),
+            MASTER_TIMESTAMP_ATTRIBUTE: Subquery(
+                masters.values("master_timestamp")[:1]
+            ),
+        }
+    )
+
+
+def prefetch_masters(items: Iterable[MasterLandItemMixin]) -> None:
+    """Loads the master ids and timestamps of already fetched plots or plan
+    units with one query per model."""
+    items_by_model: dict[type[models.Model], list[MasterLandItemMixin]] = {}
+    for item in items:
+        items_by_model.setdefault(item._meta.model, []).append(item)
+
+    for model, model_items in items_by_model.items():
+        masters = {
+            (lease_area_id, identifier): (master_id, master_timestamp)
+            for lease_area_id, identifier, master_id, master_timestamp in (
+                model.objects.filter(
+                    lease_area_id__in={item.lease_area_id for item in model_items},
+                    identifier__in={item.identifier for item in model_items},
+                    is_master=True,
+                ).values_list("lease_area_id", "identifier", "id", "master_timestamp")
+            )
+        }
+        for item in model_items:
+            master_id, master_timestamp = masters.get(
+                (item.lease_area_id, item.identifier), (None, None)
+            )
+            setattr(item, MASTER_ID_ATTRIBUTE, master_id)
+            setattr(item, MASTER_TIMESTAMP_ATTRIBUTE, master_timestamp)
+
+
 class Land(TimeStampedModel):
     """Land is an abstract class with common fields for leased land,
     real properties, unseparated parcels, and plan units.
@@ -421,6 +483,9 @@ class Plot(Land, MasterLandItemMixin):
     class Meta:
         verbose_name = pgettext_lazy("Model name", "Plot")
         verbose_name_plural = pgettext_lazy("Model name", "Plots")
+        constraints = [
+            MasterLandItemMixin.get_master_constraint("leasing_plot_unique_master")
+        ]
 
 
 class PlanUnitType(NameModel):
@@ -587,6 +652,9 @@ class PlanUnit(Land, MasterLandItemMixin):
     class Meta:
         verbose_name = pgettext_lazy("Model name", "Plan unit")
         verbose_name_plural = pgettext_lazy("Model name", "Plan units")
+        constraints = [
+            MasterLandItemMixin.get_master_constraint("leasing_planunit_unique_master")
+        ]
 
     def identifier_type(self):
         return "plan_unit"
@@ -11,9 +11,11 @@ from typing import TYPE_CHECKING
 from auditlog.registry import auditlog
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.contrib.gis.db.models import MultiPolygonField
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import connection, models, transaction
 from django.db.models import Max, Q, QuerySet, UniqueConstraint
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
@@ -39,7 +41,7 @@ from leasing.models.mixins import (
     TimeStampedModel,
     TimeStampedSafeDeleteModel,
 )
-from leasing.models.rent import Rent
+from leasing.models.rent import CALCULATION_CONTEXT_ATTRIBUTE, Rent
 from leasing.models.types import (
     BillingPeriod,
     CalculationAmountsByContact,
@@ -722,6 +724,16 @@ class Lease(TimeStampedSafeDeleteModel):
         "ApplicationMetadata", related_name="+", on_delete=models.PROTECT, null=True
     )
 
+    # Union of the geometries of the lease areas. Maintained by a database
+    # trigger on the lease areas, and changes made to it here are ignored.
+    area_geometry = MultiPolygonField(
+        srid=4326,
+        verbose_name=_("Combined geometry of the lease areas"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
     objects = LeaseManager()
 
     recursive_get_related_skip_relations = [
@@ -945,7 +957,19 @@ class Lease(TimeStampedSafeDeleteModel):
 
     def get_active_rents_on_period(
         self, date_range_start: datetime.date, date_range_end: datetime.date
-    ) -> QuerySet[Rent]:
+    ) -> QuerySet[Rent] | list[Rent]:
+        if hasattr(self, CALCULATION_CONTEXT_ATTRIBUTE):
+            # The rents have been preloaded for the calculation
+            if (self.end_date and self.end_date < date_range_start) or (
+                self.start_date and self.start_date > date_range_end
+            ):
+                return []
+            return [
+                rent
+                for rent in self.rents.all()
+                if rent.is_active_in_period(date_range_start, date_range_end)
+            ]
+
         rent_range_filter = Q(
             Q(Q(end_date=None) | Q(end_date__gte=date_range_start))
             & Q(Q(start_date=None) | Q(start_date__lte=date_range_end))
@@ -1643,6 +1667,102 @@ class ApplicationMetadata(models.Model):
     )
 
 
+class RelatedLeaseGraph:
+    """The relations around a lease, in both directions of the succession.
+
+    Holds the transitive closure of the predecessors and successors of the
+    lease as adjacency lists of relations, keyed by the lease id."""
+
+    def __init__(self, lease_id: int, relations: list["RelatedLease"]):
+        self.lease_id = lease_id
+        self.relations = {relation.id: relation for relation in relations}
+        self.relations_from: dict[int, list[RelatedLease]] = defaultdict(list)
+        self.relations_to: dict[int, list[RelatedLease]] = defaultdict(list)
+        for relation in relations:
+            self.relations_from[relation.from_lease_id].append(relation)
+            self.relations_to[relation.to_lease_id].append(relation)
+
+    def _walk(self, relations_by_lease, next_lease_attribute) -> set["RelatedLease"]:
+        result = set()
+        visited = set()
+        lease_ids = [self.lease_id]
+        while lease_ids:
+            lease_id = lease_ids.pop()
+            if lease_id in visited:
+                continue
+            visited.add(lease_id)
+
+            for relation in relations_by_lease.get(lease_id, []):
+                result.add(relation)
+                lease_ids.append(getattr(relation, next_lease_attribute))
+        return result
+
+    def get_predecessor_relations(self) -> set["RelatedLease"]:
+        """All relations leading to the lease, directly or transitively"""
+        return self._walk(self.relations_to, "from_lease_id")
+
+    def get_successor_relations(self) -> set["RelatedLease"]:
+        """All relations leading from the lease, directly or transitively"""
+        return self._walk(self.relations_from, "to_lease_id")
+
+    def get_immediate_successor_relations(self) -> set["RelatedLease"]:
+        return set(self.relations_from.get(self.lease_id, []))
+
+
+class RelatedLeaseManager(SafeDeleteManager):
+    # Walks the relations from the lease to both directions. UNION discards the
+    # rows already found, so the recursion ends also when the relations form
+    # a cycle.
+    graph_relation_ids_sql = """
+        WITH RECURSIVE closure(lease_id, direction) AS (
+            SELECT %s::integer, 'predecessor'::text
+            UNION
+            SELECT %s::integer, 'successor'::text
+            UNION
+            SELECT
+                CASE
+                    WHEN c.direction = 'predecessor' THEN rl.from_lease_id
+                    ELSE rl.to_lease_id
+                END,
+                c.direction
+            FROM closure c
+            INNER JOIN leasing_relatedlease rl ON (
+                (c.direction = 'predecessor' AND rl.to_lease_id = c.lease_id)
+                OR (c.direction = 'successor' AND rl.from_lease_id = c.lease_id)
+            )
+            WHERE rl.deleted IS NULL
+        )
+        SELECT rl.id
+        FROM leasing_relatedlease rl
+        INNER JOIN closure c ON (
+            (c.direction = 'predecessor' AND rl.to_lease_id = c.lease_id)
+            OR (c.direction = 'successor' AND rl.from_lease_id = c.lease_id)
+        )
+        WHERE rl.deleted IS NULL
+    """
+
+    def get_graph(self, lease_id: int) -> RelatedLeaseGraph:
+        """Fetches all predecessor and successor relations of the lease with
+        one recursive query."""
+        relations = list(
+            self.get_queryset()
+            .filter(id__in=RawSQL(self.graph_relation_ids_sql, (lease_id, lease_id)))
+            .select_related(
+                "from_lease",
+                "from_lease__type",
+                "from_lease__municipality",
+                "from_lease__district",
+                "from_lease__identifier",
+                "to_lease",
+                "to_lease__type",
+                "to_lease__municipality",
+                "to_lease__district",
+                "to_lease__identifier",
+            )
+        )
+        return RelatedLeaseGraph(lease_id, relations)
+
+
 class RelatedLease(TimeStampedSafeDeleteModel):
     from_lease = models.ForeignKey(
         Lease,
@@ -1666,6 +1786,8 @@ class RelatedLease(TimeStampedSafeDeleteModel):
     start_date = models.DateField(verbose_name=_("Start date"), null=True, blank=True)
     end_date = models.DateField(verbose_name=_("End date"), null=True, blank=True)
 
+    objects = RelatedLeaseManager()
+
     recursive_get_related_skip_relations = ["from_lease", "to_lease"]
 
     class Meta:
@@ -1684,5 +1806,6 @@ field_permissions.register(
         "leases",
         "invoicesets",
         "leasestatelog",
+        "area_geometry",
     ],
 )
@@ -2,6 +2,7 @@ import datetime
 import logging
 import sys
 from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable
 
 from auditlog.registry import auditlog
 from dateutil.relativedelta import relativedelta
@@ -89,6 +90,14 @@ FIXED_DUE_DATES: dict[str, dict[int, list[DayMonth]]] = {
     },
 }
 
+# Default of `Rent.get_related_items_for_date_range` for not filtering by
+# intended use, as None is a valid intended use
+ANY_INTENDED_USE = object()
+
+# Name of the attribute that `RentCalculationContext` sets on the leases and
+# rents whose calculation data it has preloaded
+CALCULATION_CONTEXT_ATTRIBUTE = "calculation_context"
+
 logger = logging.getLogger(__name__)
 stdout_handler = logging.StreamHandler(stream=sys.stdout)
 logger.addHandler(stdout_handler)
@@ -380,22 +389,58 @@ class Rent(TimeStampedSafeDeleteModel):
 
         self.save()
 
+    def get_related_items_for_date_range(
+        self,
+        related_name,
+        date_range_start,
+        date_range_end,
+        intended_use=ANY_INTENDED_USE,
+    ):
+        """Returns the related items (e.g. contract rents) of the rent that are
+        active during the date range, optionally only for the intended use.
+
+        If the rent belongs to a calculation context, the items have been
+        preloaded and are filtered in memory instead of in the database."""
+        related_manager = getattr(self, related_name)
+
+        if not hasattr(self, CALCULATION_CONTEXT_ATTRIBUTE):
+            range_filtering = Q(
+                Q(Q(end_date=None) | Q(end_date__gte=date_range_start))
+                & Q(Q(start_date=None) | Q(start_date__lte=date_range_end))
+            )
+            if intended_use is not ANY_INTENDED_USE:
+                range_filtering &= Q(intended_use=intended_use)
+            return related_manager.filter(range_filtering)
+
+        return [
+            item
+            for item in related_manager.all()
+            if (item.end_date is None or item.end_date >= date_range_start)
+            and (item.start_date is None or item.start_date <= date_range_end)
+            and (
+                intended_use is ANY_INTENDED_USE
+                or item.intended_use_id == getattr(intended_use, "id", None)
+            )
+        ]
+
     def get_intended_uses_for_date_range(self, date_range_start, date_range_end):
         intended_uses = set()
 
-        range_filtering = Q(
-            Q(Q(end_date=None) | Q(end_date__gte=date_range_start))
-            & Q(Q(start_date=None) | Q(start_date__lte=date_range_end))
-        )
-
         intended_uses.update(
             [
                 fiyr.intended_use
-                for fiyr in self.fixed_initial_year_rents.filter(range_filtering)
+                for fiyr in self.get_related_items_for_date_range(
+                    "fixed_initial_year_rents", date_range_start, date_range_end
+                )
             ]
         )
         intended_uses.update(
-            [cr.intended_use for cr in self.contract_rents.filter(range_filtering)]
+            [
+                cr.intended_use
+                for cr in self.get_related_items_for_date_range(
+                    "contract_rents", date_range_start, date_range_end
+                )
+            ]
         )
 
         return intended_uses
@@ -485,13 +530,12 @@ class Rent(TimeStampedSafeDeleteModel):
             dry_run (bool, optional): **Note:** Despite the function name suggesting a pure calculation, setting
                 `dry_run=False` (default) can result in database modifications!
         """
-        fixed_initial_year_rents: QuerySet[FixedInitialYearRent] = (
-            self.fixed_initial_year_rents.filter(
-                Q(
-                    Q(Q(end_date=None) | Q(end_date__gte=date_range_start))
-                    & Q(Q(start_date=None) | Q(start_date__lte=date_range_end))
-                )
-                & Q(intended_use=intended_use)
+        fixed_initial_year_rents: Iterable[FixedInitialYearRent] = (
+            self.get_related_items_for_date_range(
+                "fixed_initial_year_rents",
+                date_range_start,
+                date_range_end,
+                intended_use=intended_use,
             )
         )
 
@@ -546,12 +590,11 @@ class Rent(TimeStampedSafeDeleteModel):
             date_range_start=date_range_start, date_range_end=date_range_end
         )
 
-        contract_rents: QuerySet[ContractRent] = self.contract_rents.filter(
-            Q(
-                Q(Q(end_date=None) | Q(end_date__gte=date_range_start))
-                & Q(Q(start_date=None) | Q(start_date__lte=date_range_end))
-            )
-            & Q(intended_use=intended_use)
+        contract_rents: Iterable[ContractRent] = self.get_related_items_for_date_range(
+            "contract_rents",
+            date_range_start,
+            date_range_end,
+            intended_use=intended_use,
         )
 
         for contract_rent in contract_rents:
@@ -732,12 +775,9 @@ class Rent(TimeStampedSafeDeleteModel):
     ) -> list["RentAdjustment"]:
         applicable_adjustments = []
 
-        range_filtering = Q(
-            Q(Q(end_date=None) | Q(end_date__gte=date_range_start))
-            & Q(Q(start_date=None) | Q(start_date__lte=date_range_end))
-        )
-
-        for rent_adjustment in self.rent_adjustments.filter(range_filtering):
+        for rent_adjustment in self.get_related_items_for_date_range(
+            "rent_adjustments", date_range_start, date_range_end
+        ):
             if rent_adjustment.intended_use != intended_use:
                 continue
 
@@ -760,7 +800,11 @@ class Rent(TimeStampedSafeDeleteModel):
             return []
 
         due_dates: QuerySet[RentDueDate] = self.due_dates
-        return [dd.as_daymonth() for dd in due_dates.all().order_by("month", "day")]
+        # Sorted in Python, so that prefetched due dates are used
+        return [
+            dd.as_daymonth()
+            for dd in sorted(due_dates.all(), key=lambda dd: (dd.month, dd.day))
+        ]
 
     def get_due_dates_as_daymonths(self) -> list[DayMonth]:
         due_dates = []
@@ -903,7 +947,13 @@ class Rent(TimeStampedSafeDeleteModel):
         return the_date.year
 
     def get_index_for_date(self, the_date):
-        return Index.objects.get_latest_for_year(self.get_rent_year_for_date(the_date))
+        year = self.get_rent_year_for_date(the_date)
+        if hasattr(self, CALCULATION_CONTEXT_ATTRIBUTE):
+            return getattr(
+                self, CALCULATION_CONTEXT_ATTRIBUTE
+            ).get_latest_index_for_year(year)
+
+        return Index.objects.get_latest_for_year(year)
 
     def is_correct_index_for_date(self, index, the_date):
         """Check if the provided index is the previous years average index"""
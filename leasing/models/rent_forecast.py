@@ -0,0 +1,286 @@
+import datetime
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import pgettext_lazy
+
+from leasing.enums import LeaseState
+
+from .lease import Lease
+from .rent import (
+    ContractRent,
+    FixedInitialYearRent,
+    Index,
+    IndexPointFigureYearly,
+    OldDwellingsInHousingCompaniesPriceIndex,
+    Rent,
+    RentAdjustment,
+    RentDueDate,
+)
+from .tenant import Tenant
+
+# The states of the leases whose rents are forecast
+FORECAST_LEASE_STATES = [
+    LeaseState.LEASE,
+    LeaseState.SHORT_TERM_LEASE,
+    LeaseState.LONG_TERM_LEASE,
+    LeaseState.RYA,
+    LeaseState.PERMISSION,
+]
+
+# The precision of the stored amounts
+AMOUNT_PRECISION = Decimal(".000001")
+
+# The number of leases whose forecasts are replaced in one transaction
+REFRESH_BATCH_SIZE = 100
+
+
+class LeaseRentForecast(models.Model):
+    """
+    The rent of a lease for a year, as calculated by
+    `Lease.calculate_rent_amount_for_year` without saving anything.
+
+    The forecasts are a snapshot that is kept up to date by
+    `refresh_lease_rent_forecasts`, which recalculates only the leases that
+    have changed since their forecasts were calculated.
+    """
+
+    lease = models.ForeignKey(
+        Lease,
+        verbose_name=_("Lease"),
+        related_name="rent_forecasts",
+        on_delete=models.CASCADE,
+    )
+
+    year = models.PositiveSmallIntegerField(verbose_name=_("Year"))
+
+    # Null if the rent could not be calculated, e.g. because a rent of the
+    # lease doesn't have an index defined
+    amount = models.DecimalField(
+        verbose_name=_("Amount"),
+        null=True,
+        blank=True,
+        max_digits=18,
+        decimal_places=6,
+    )
+
+    # The version of the indexes that the amount was calculated with, see
+    # `get_index_version`
+    index_version = models.CharField(verbose_name=_("Index version"), max_length=64)
+
+    calculated_at = models.DateTimeField(verbose_name=_("Time calculated"))
+
+    class Meta:
+        verbose_name = pgettext_lazy("Model name", "Lease rent forecast")
+        verbose_name_plural = pgettext_lazy("Model name", "Lease rent forecasts")
+        unique_together = ("lease", "year")
+
+    def __str__(self):
+        return "{} {}".format(self.lease_id, self.year)
+
+
+@dataclass
+class RentForecastRefreshResult:
+    # The number of leases whose forecasts were calculated
+    lease_count: int
+    # The number of forecasts whose amount differs from the previous snapshot
+    changed_count: int
+
+
+def get_index_version() -> str:
+    """A hash of the indexes that the rents are adjusted with. Changes when
+    an index is added, changed or removed."""
+    versions = [
+        # The indexes have no modification time, but there are only a few
+        # rows per year
+        list(Index.objects.order_by("pk").values_list("pk", "year", "month", "number")),
+        IndexPointFigureYearly.objects.aggregate(
+            count=Count("pk"), modified_at=Max("modified_at")
+        ),
+        OldDwellingsInHousingCompaniesPriceIndex.objects.aggregate(
+            count=Count("pk"), modified_at=Max("modified_at")
+        ),
+    ]
+    return hashlib.sha256(
+        json.dumps(versions, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def get_forecast_leases(years: range):
+    """The leases in the forecast states that are in effect during the years"""
+    start_date = datetime.date(year=years[0], month=1, day=1)
+    end_date = datetime.date(year=years[-1], month=12, day=31)
+    return Lease.objects.filter(
+        (Q(start_date__isnull=True) | Q(start_date__lte=end_date))
+        & (Q(end_date__isnull=True) | Q(end_date__gte=start_date)),
+        state__in=FORECAST_LEASE_STATES,
+    )
+
+
+def get_lease_changed_at() -> dict[int, datetime.datetime]:
+    """The latest time that the lease, or the rents, contract rents, rent
+    adjustments, fixed initial year rents, due dates or tenants of the lease
+    were saved or deleted, by lease id"""
+    # Safedelete doesn't update modified_at when deleting
+    changed_at = Max(Greatest("modified_at", "deleted"))
+    querysets = [
+        Lease.all_objects.values(lease_id=models.F("id")),
+        Rent.all_objects.values("lease_id"),
+        Tenant.all_objects.values("lease_id"),
+        ContractRent.all_objects.values(lease_id=models.F("rent__lease_id")),
+        FixedInitialYearRent.all_objects.values(lease_id=models.F("rent__lease_id")),
+        RentAdjustment.all_objects.values(lease_id=models.F("rent__lease_id")),
+        RentDueDate.all_objects.values(lease_id=models.F("rent__lease_id")),
+    ]
+
+    lease_changed_at: dict[int, datetime.datetime] = {}
+    for queryset in querysets:
+        for lease_id, lease_changed in queryset.annotate(
+            changed_at=changed_at
+        ).values_list("lease_id", "changed_at"):
+            if lease_changed is not None:
+                lease_changed_at[lease_id] = max(
+                    lease_changed, lease_changed_at.get(lease_id, lease_changed)
+                )
+    return lease_changed_at
+
+
+def get_stale_lease_ids(
+    lease_ids: Iterable[int], years: range, index_version: str
+) -> set[int]:
+    """The leases whose forecasts for the years are missing, or have been
+    calculated before the lease or the indexes of its rents changed"""
+    forecasts_by_lease_id = {
+        forecast["lease_id"]: forecast
+        for forecast in LeaseRentForecast.objects.filter(year__in=years)
+        .values("lease_id")
+        .annotate(
+            count=Count("pk"),
+            calculated_at=Min("calculated_at"),
+            old_index_count=Count("pk", filter=~Q(index_version=index_version)),
+        )
+    }
+    indexed_lease_ids = set(
+        Rent.objects.filter(
+            Q(index_type__isnull=False)
+            | Q(old_dwellings_in_housing_companies_price_index__isnull=False)
+        ).values_list("lease_id", flat=True)
+    )
+    lease_changed_at = get_lease_changed_at()
+
+    stale_lease_ids = set()
+    for lease_id in lease_ids:
+        forecast = forecasts_by_lease_id.get(lease_id)
+        if (
+            forecast is None
+            or forecast["count"] < len(years)
+            or lease_changed_at.get(lease_id, forecast["calculated_at"])
+            > forecast["calculated_at"]
+            or (forecast["old_index_count"] and lease_id in indexed_lease_ids)
+        ):
+            stale_lease_ids.add(lease_id)
+    return stale_lease_ids
+
+
+def calculate_lease_rent_forecasts(
+    lease: Lease, years: range, index_version: str, calculated_at: datetime.datetime
+) -> list[LeaseRentForecast]:
+    forecasts = []
+    for year in years:
+        try:
+            amount = (
+                lease.calculate_rent_amount_for_year(year, dry_run=True)
+                .get_total_amount()
+                .quantize(AMOUNT_PRECISION, rounding=ROUND_HALF_UP)
+            )
+        except NotImplementedError:
+            # The rent doesn't have an index defined
+            amount = None
+
+        forecasts.append(
+            LeaseRentForecast(
+                lease=lease,
+                year=year,
+                amount=amount,
+                index_version=index_version,
+                calculated_at=calculated_at,
+            )
+        )
+    return forecasts
+
+
+def refresh_lease_rent_forecasts(
+    years: range, rebuild: bool = False
+) -> RentForecastRefreshResult:
+    """Calculates the forecasts of the years for the leases that have changed
+    since their forecasts were calculated, or for all the leases in the
+    forecast states if `rebuild` is set."""
+    # Taken before calculating, so that the changes made during the
+    # calculation are noticed by the next refresh
+    calculated_at = timezone.now()
+    index_version = get_index_version()
+
+    lease_ids = list(get_forecast_leases(years).values_list("id", flat=True))
+    if rebuild:
+        stale_lease_ids = set(lease_ids)
+    else:
+        stale_lease_ids = get_stale_lease_ids(lease_ids, years, index_version)
+
+        # The indexes don't affect the rents of the other leases
+        LeaseRentForecast.objects.filter(year__in=years).exclude(
+            index_version=index_version
+        ).exclude(lease_id__in=stale_lease_ids).update(index_version=index_version)
+
+    stale_lease_ids = sorted(stale_lease_ids)
+    changed_count = 0
+    for batch_start in range(0, len(stale_lease_ids), REFRESH_BATCH_SIZE):
+        batch_lease_ids = stale_lease_ids[
+            batch_start : batch_start + REFRESH_BATCH_SIZE
+        ]
+
+        forecasts = []
+        for lease in Lease.objects.filter(id__in=batch_lease_ids):
+            forecasts.extend(
+                calculate_lease_rent_forecasts(
+                    lease, years, index_version, calculated_at
+                )
+            )
+
+        with transaction.atomic():
+            old_amounts = defaultdict(
+                lambda: None,
+                {
+                    (lease_id, year): amount
+                    for lease_id, year, amount in LeaseRentForecast.objects.filter(
+                        lease_id__in=batch_lease_ids, year__in=years
+                    ).values_list("lease_id", "year", "amount")
+                },
+            )
+            # Replaced in place, so that a concurrent refresh that has
+            # created the same forecasts in the meantime doesn't fail
+            forecasts = LeaseRentForecast.objects.bulk_create(
+                forecasts,
+                update_conflicts=True,
+                unique_fields=["lease", "year"],
+                update_fields=["amount", "index_version", "calculated_at"],
+            )
+
+        changed_count += sum(
+            1
+            for forecast in forecasts
+            if old_amounts[(forecast.lease_id, forecast.year)] != forecast.amount
+        )
+
+    return RentForecastRefreshResult(
+        lease_count=len(stale_lease_ids), changed_count=changed_count
+    )
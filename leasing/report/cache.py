@@ -0,0 +1,155 @@
+import datetime
+import hashlib
+import json
+import logging
+import pickle
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Count, Max, Model, QuerySet
+from django.utils import timezone, translation
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_DIRECTORY = "report_cache"
+REPORT_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+
+
+def get_report_cache_storage():
+    if getattr(settings, "FLAG_REPORT_CACHE", False) is not True:
+        return None
+
+    from file_operations.private_files import PrivateFileSystemStorage
+
+    return PrivateFileSystemStorage()
+
+
+def normalize_input_value(value: Any) -> Any:
+    """Converts a cleaned input value of a report form to a JSON value that
+    is the same for equal inputs, e.g. the selected service units in any
+    order."""
+    if isinstance(value, QuerySet):
+        return sorted(value.values_list("pk", flat=True))
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def get_rows_hash(model: type[Model]) -> str:
+    """A hash of all the rows of the model, for the small lookup models that
+    have no modification time"""
+    field_names = [field.attname for field in model._meta.concrete_fields]
+    rows_hash = hashlib.sha256()
+    for row in model.objects.order_by("pk").values_list(*field_names).iterator():
+        rows_hash.update(repr(row).encode())
+    return rows_hash.hexdigest()
+
+
+def get_data_version(source_models: Iterable[type[Model]]) -> list[list]:
+    """The latest modification time and the number of the rows of each
+    source model, or the hash of the rows of the models without a
+    modification time. Any saved or deleted row changes the version."""
+    data_version = []
+    for model in source_models:
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if "modified_at" not in field_names:
+            data_version.append([model._meta.label, get_rows_hash(model)])
+            continue
+
+        aggregates = model.objects.aggregate(
+            modified_at=Max("modified_at"), count=Count("pk")
+        )
+        data_version.append(
+            [
+                model._meta.label,
+                normalize_input_value(aggregates["modified_at"]),
+                aggregates["count"],
+            ]
+        )
+    return data_version
+
+
+def get_report_cache_key(report, request, input_data: dict[str, Any]) -> str:
+    """The cached result of a report is addressed by the report, its inputs,
+    the output format and language, the service units of the user, the date
+    that the reports compare against, and the data version of the source
+    models of the report."""
+    key_data = {
+        "report": report.slug,
+        "input": {
+            name: normalize_input_value(value)
+            for name, value in sorted(input_data.items())
+        },
+        "format": request.accepted_renderer.format,
+        "language": translation.get_language(),
+        "service_units": sorted(
+            request.user.service_units.values_list("id", flat=True)
+        ),
+        "today": timezone.localdate().isoformat(),
+        "data_version": get_data_version(report.cache_source_models),
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+def _get_report_cache_path(cache_key: str) -> str:
+    return "/".join(
+        [REPORT_CACHE_DIRECTORY, cache_key[:2], "{}.pickle".format(cache_key)]
+    )
+
+
+def read_cached_report_data(storage, cache_key: str, timeout: int) -> Any | None:
+    """Returns the cached report data, or None if it has not been cached or
+    has been cached more than `timeout` seconds ago."""
+    if storage is None:
+        return None
+    path = _get_report_cache_path(cache_key)
+    if not storage.exists(path):
+        return None
+    if storage.get_modified_time(path) < timezone.now() - datetime.timedelta(
+        seconds=timeout
+    ):
+        return None
+    try:
+        with storage.open(path, "rb") as cached_file:
+            return pickle.load(cached_file)
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        logger.warning(f"Failed to read report cache file {path}: {e}")
+        return None
+
+
+def write_cached_report_data(storage, cache_key: str, data: Any) -> None:
+    if storage is None:
+        return
+    path = _get_report_cache_path(cache_key)
+    try:
+        # An expired file is replaced, as the storage would not overwrite it
+        storage.delete(path)
+        storage.save(path, ContentFile(pickle.dumps(data)))
+    except OSError as e:
+        # Caching is an optimisation, a failed write must not fail the request
+        logger.warning(f"Failed to write report cache file {path}: {e}")
+
+
+def prune_report_cache(older_than: datetime.datetime) -> int:
+    """Deletes cached reports written before `older_than`. Returns the number
+    of deleted files."""
+    storage = get_report_cache_storage()
+    if storage is None or not storage.exists(REPORT_CACHE_DIRECTORY):
+        return 0
+
+    removed_count = 0
+    directories, _files = storage.listdir(REPORT_CACHE_DIRECTORY)
+    for directory in directories:
+        directory_path = "/".join([REPORT_CACHE_DIRECTORY, directory])
+        _subdirectories, filenames = storage.listdir(directory_path)
+        for filename in filenames:
+            path = "/".join([directory_path, filename])
+            if storage.get_modified_time(path) < older_than:
+                storage.delete(path)
+                removed_count += 1
+    return removed_count
@@ -1,7 +1,17 @@
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
-from leasing.models import Collateral, CollateralType, ServiceUnit
+from leasing.models import (
+    Collateral,
+    CollateralType,
+    Contract,
+    District,
+    Lease,
+    LeaseIdentifier,
+    LeaseType,
+    Municipality,
+    ServiceUnit,
+)
 from leasing.report.excel import FormatType
 from leasing.report.lease.common_getters import ReportURL, get_lease_url
 from leasing.report.report_base import ReportBase
@@ -78,6 +88,15 @@ class CollateralsReport(ReportBase):
         "returned_date": {"label": _("Returned date"), "format": FormatType.DATE.value},
         "note": {"label": _("Note"), "width": 50},
     }
+    cache_source_models = (
+        Collateral,
+        Contract,
+        Lease,
+        LeaseIdentifier,
+        LeaseType,
+        District,
+        Municipality,
+    )
 
     def get_data(self, input_data):
         qs = (
@@ -1,4 +1,7 @@
 from django import forms
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Q
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from enumfields.drf import EnumField
 from rest_framework.request import Request
@@ -28,8 +31,7 @@ def get_recipient_address(obj):
 
 
 def get_receivable_types(obj):
-    receivable_types = {str(row.receivable_type) for row in obj.rows.all()}
-    return ", ".join(receivable_types)
+    return ", ".join(obj.receivable_type_names)
 
 
 class InvoicesInPeriodReport(ReportBase):
@@ -114,7 +116,22 @@ class InvoicesInPeriodReport(ReportBase):
                 "lease__identifier__municipality",
                 "recipient",
             )
-            .prefetch_related("rows", "rows__receivable_type")
+            # The receivable types are aggregated in the same query, instead of
+            # reading the rows of every invoice
+            .annotate(
+                receivable_type_names=Coalesce(
+                    ArrayAgg(
+                        "rows__receivable_type__name",
+                        distinct=True,
+                        # The invoices without rows get an empty list
+                        filter=Q(
+                            rows__deleted__isnull=True,
+                            rows__receivable_type__isnull=False,
+                        ),
+                    ),
+                    [],
+                )
+            )
             .order_by("lease__identifier__type__identifier", "due_date")
         )
 
@@ -2,14 +2,26 @@ from itertools import groupby
 from operator import itemgetter
 
 from django import forms
-from django.db.models import Q
+from django.db.models import OuterRef, Prefetch, Q, Subquery
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from leasing.enums import InvoiceState
-from leasing.models import Invoice, Lease, ServiceUnit
+from leasing.enums import CollectionStage, InvoiceState
+from leasing.models import (
+    CollectionNote,
+    Contact,
+    District,
+    Invoice,
+    Lease,
+    LeaseIdentifier,
+    LeaseType,
+    Municipality,
+    Rent,
+    RentDueDate,
+    ServiceUnit,
+)
 from leasing.report.excel import (
     ExcelCell,
     ExcelRow,
@@ -46,12 +58,10 @@ def get_due_dates_per_year(invoice: Invoice) -> int:
     first_day_of_year = invoice.due_date.replace(month=1, day=1)
     last_day_of_year = invoice.due_date.replace(month=12, day=31)
     lease: Lease = invoice.lease
-    today = timezone.now().date()
-
-    active_rents = lease.rents.filter(Q(end_date__isnull=True) | Q(end_date__gte=today))
 
     due_dates = set()
-    for rent in active_rents:
+    # Prefetched in OpenInvoicesReport.get_data
+    for rent in lease.active_rents:
         due_dates.update(
             rent.get_due_dates_for_period(first_day_of_year, last_day_of_year)
         )
@@ -64,14 +74,9 @@ def get_lease_id(invoice: Invoice) -> int:
 
 
 def get_collection_stage(invoice: Invoice) -> str | None:
-    latest_note = (
-        invoice.lease.collection_notes.filter(collection_stage__isnull=False)
-        .order_by("-created_at")
-        .first()
-    )
-
-    if latest_note:
-        return str(latest_note.collection_stage.label)
+    # Annotated in OpenInvoicesReport.get_data
+    if invoice.latest_collection_stage:
+        return str(CollectionStage(invoice.latest_collection_stage).label)
 
 
 class OpenInvoicesReport(ReportBase):
@@ -139,8 +144,21 @@ class OpenInvoicesReport(ReportBase):
             "format": FormatType.DATE.value,
         },
     }
+    cache_source_models = (
+        Invoice,
+        Lease,
+        LeaseIdentifier,
+        LeaseType,
+        District,
+        Municipality,
+        Rent,
+        RentDueDate,
+        Contact,
+        CollectionNote,
+    )
 
     def get_data(self, input_data):
+        today = timezone.now().date()
         qs = (
             Invoice.objects.filter(
                 due_date__gte=input_data["start_date"],
@@ -149,12 +167,33 @@ class OpenInvoicesReport(ReportBase):
             )
             .select_related(
                 "lease",
+                "lease__type",
                 "lease__identifier",
                 "lease__identifier__type",
                 "lease__identifier__district",
                 "lease__identifier__municipality",
                 "recipient",
             )
+            # The rents and the collection stages are read in a fixed number
+            # of queries, instead of once per invoice
+            .prefetch_related(
+                Prefetch(
+                    "lease__rents",
+                    queryset=Rent.objects.filter(
+                        Q(end_date__isnull=True) | Q(end_date__gte=today)
+                    ).prefetch_related("due_dates"),
+                    to_attr="active_rents",
+                )
+            )
+            .annotate(
+                latest_collection_stage=Subquery(
+                    CollectionNote.objects.filter(
+                        lease=OuterRef("lease"), collection_stage__isnull=False
+                    )
+                    .order_by("-created_at")
+                    .values("collection_stage")[:1]
+                )
+            )
             .order_by("lease__identifier__type__identifier", "due_date")
         )
 
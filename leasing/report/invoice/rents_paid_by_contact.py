@@ -1,9 +1,61 @@
 from django import forms
+from django.db import connection
 from django.utils.translation import gettext_lazy as _
 
 from leasing.enums import InvoiceType
-from leasing.models import Contact, Invoice
 from leasing.report.report_base import ReportBase
+from leasing.report.utils import dictfetchall
+
+# The number of rows and the receivable types of the invoices are aggregated
+# per invoice in the database, instead of reading the rows of every invoice
+RENTS_PAID_BY_CONTACT_SQL = """
+    WITH contact_invoices AS (
+        SELECT i.id,
+               i.recipient_id,
+               i.number,
+               i.total_amount,
+               i.outstanding_amount,
+               i.invoicing_date,
+               i.due_date
+          FROM leasing_invoice i
+         WHERE i.deleted IS NULL
+           AND i.recipient_id = %(contact_id)s
+           AND i.type = %(invoice_type)s
+           AND i.total_amount > 0
+           AND i.invoicing_date >= %(start_date)s
+           AND i.invoicing_date <= %(end_date)s
+    ),
+    invoice_row_aggregates AS (
+        SELECT ir.invoice_id,
+               count(ir.id) AS n_rows,
+               array_agg(DISTINCT rt.name ORDER BY rt.name) AS receivable_type_names
+          FROM leasing_invoicerow ir
+               INNER JOIN contact_invoices ci
+               ON ci.id = ir.invoice_id
+               INNER JOIN leasing_receivabletype rt
+               ON rt.id = ir.receivable_type_id
+         WHERE ir.deleted IS NULL
+         GROUP BY ir.invoice_id
+    )
+    SELECT c.id AS contact_id,
+           COALESCE(NULLIF(c.name, ''), concat_ws(' ', c.first_name, c.last_name))
+               AS name,
+           ci.number AS invoice_number,
+           ci.total_amount,
+           ci.outstanding_amount,
+           ci.invoicing_date,
+           ci.due_date,
+           COALESCE(ira.n_rows, 0) AS n_rows,
+           COALESCE(array_to_string(ira.receivable_type_names, ', '), '')
+               AS receivable_type
+      FROM contact_invoices ci
+           INNER JOIN leasing_contact c
+           ON c.id = ci.recipient_id
+           LEFT JOIN invoice_row_aggregates ira
+           ON ira.invoice_id = ci.id
+     WHERE c.deleted IS NULL
+     ORDER BY ci.due_date DESC;
+"""
 
 
 class RentsPaidByContactReport(ReportBase):
@@ -32,44 +84,14 @@ class RentsPaidByContactReport(ReportBase):
     }
 
     def get_data(self, input_data):
-        try:
-            contact = Contact.objects.get(pk=input_data["contact_id"])
-        except Contact.DoesNotExist:
-            return []
-
-        aggregated_data = []
-        invoices = (
-            Invoice.objects.filter(
-                recipient=contact,
-                type=InvoiceType.CHARGE,
-                total_amount__gt=0,
-                invoicing_date__gte=input_data["start_date"],
-                invoicing_date__lte=input_data["end_date"],
-            )
-            .prefetch_related("rows", "rows__receivable_type")
-            .order_by("-due_date")
-        )
-
-        for invoice in invoices:
-            name_str = (
-                contact.name
-                if contact.name
-                else "{} {}".format(contact.first_name, contact.last_name)
-            )
-            aggregated_data.append(
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RENTS_PAID_BY_CONTACT_SQL,
                 {
-                    "contact_id": contact.id,
-                    "name": name_str,
-                    "invoice_number": invoice.number,
-                    "total_amount": invoice.total_amount,
-                    "outstanding_amount": invoice.outstanding_amount,
-                    "invoicing_date": invoice.invoicing_date,
-                    "due_date": invoice.due_date,
-                    "n_rows": invoice.rows.count(),
-                    "receivable_type": ", ".join(
-                        {row.receivable_type.name for row in invoice.rows.all()}
-                    ),
-                }
+                    "contact_id": input_data["contact_id"],
+                    "invoice_type": InvoiceType.CHARGE.value,
+                    "start_date": input_data["start_date"],
+                    "end_date": input_data["end_date"],
+                },
             )
-
-        return aggregated_data
+            return dictfetchall(cursor)
@@ -1,14 +1,16 @@
 import datetime
-from typing import Any, Literal, Protocol, TypedDict
+from typing import Any, Iterable, Literal, Protocol, TypedDict
 
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
 from django.utils import timezone
 
 from leasing.enums import TenantContactType
 from leasing.models import Contract
 from leasing.models.contact import Contact
+from leasing.models.land_area import LeaseArea
 from leasing.models.lease import Lease
+from leasing.models.tenant import Tenant, TenantContact
 
 RE_LEASE_DECISION_TYPE_ID = 29  # Vuokraus (sopimuksen uusiminen/jatkam.)
 
@@ -16,6 +18,11 @@ OPTION_TO_PURCHASE_CONDITION_TYPE_ID = 24  # 24 = Osto-optioehto
 
 LEASING_CONTRACT_TYPE_NAME = "Vuokrasopimus"
 
+# Names of the attributes set by `prefetch_lease_report_details`
+REPORT_LEASE_AREAS_ATTRIBUTE = "report_lease_areas"
+REPORT_CONTRACTS_ATTRIBUTE = "report_contracts"
+REPORT_TENANTS_ATTRIBUTE = "report_tenants"
+
 
 class ReportURL(TypedDict):
     url: str | None
@@ -30,6 +37,107 @@ class LeaseWithContracts(Protocol):
     contracts: QuerySet[Contract]
 
 
+def prefetch_lease_report_details(leases: Iterable[Lease]) -> None:
+    """Loads the details that the lease getters of the reports use for all the
+    leases at once: the lease areas that are not archived with their
+    addresses, the contracts with their types, and the tenants with their
+    contacts.
+
+    The details are loaded with the same fixed number of queries whatever the
+    report's queryset has prefetched, and leases that already have them are
+    skipped."""
+    prefetch_related_objects(
+        [lease for lease in leases if lease is not None],
+        Prefetch(
+            "lease_areas",
+            queryset=LeaseArea.objects.filter(
+                archived_at__isnull=True
+            ).prefetch_related("addresses"),
+            to_attr=REPORT_LEASE_AREAS_ATTRIBUTE,
+        ),
+        Prefetch(
+            "contracts",
+            queryset=Contract.objects.select_related("type"),
+            to_attr=REPORT_CONTRACTS_ATTRIBUTE,
+        ),
+        Prefetch(
+            "tenants",
+            queryset=Tenant.objects.prefetch_related(
+                Prefetch(
+                    "tenantcontact_set",
+                    queryset=TenantContact.objects.select_related("contact"),
+                )
+            ),
+            to_attr=REPORT_TENANTS_ATTRIBUTE,
+        ),
+    )
+
+
+def get_report_lease_areas(lease: Lease) -> list[LeaseArea]:
+    """Returns the lease areas of the lease that are not archived"""
+    if hasattr(lease, REPORT_LEASE_AREAS_ATTRIBUTE):
+        return getattr(lease, REPORT_LEASE_AREAS_ATTRIBUTE)
+    return [
+        lease_area
+        for lease_area in lease.lease_areas.all()
+        if not lease_area.archived_at
+    ]
+
+
+def get_report_contracts(lease: LeaseWithContracts) -> list[Contract]:
+    if hasattr(lease, REPORT_CONTRACTS_ATTRIBUTE):
+        return getattr(lease, REPORT_CONTRACTS_ATTRIBUTE)
+    return list(lease.contracts.all())
+
+
+def get_report_tenants(lease: Lease) -> list[Tenant]:
+    if hasattr(lease, REPORT_TENANTS_ATTRIBUTE):
+        return getattr(lease, REPORT_TENANTS_ATTRIBUTE)
+    return list(lease.tenants.all())
+
+
+def get_tenant_contacts(
+    lease: Lease, start_date: datetime.date, end_date: datetime.date
+) -> set[Contact]:
+    """Returns the contacts that are tenants of the lease during the period"""
+    contacts: set[Contact] = set()
+    for tenant in get_report_tenants(lease):
+        for tc in tenant.tenantcontact_set.all():
+            if tc.type != TenantContactType.TENANT:
+                continue
+
+            if (tc.end_date is None or tc.end_date >= start_date) and (
+                tc.start_date is None or tc.start_date <= end_date
+            ):
+                contacts.add(tc.contact)
+
+    return contacts
+
+
+def get_lease_area_identifiers(lease: Lease) -> list[str]:
+    return [lease_area.identifier for lease_area in get_report_lease_areas(lease)]
+
+
+def get_lease_area_addresses(lease: Lease, only_primary: bool = True) -> list[str]:
+    addresses = []
+    for lease_area in get_report_lease_areas(lease):
+        for area_address in lease_area.addresses.all():
+            if only_primary and not area_address.is_primary:
+                continue
+
+            addresses.append(area_address.address)
+
+    return addresses
+
+
+def get_contract_numbers(lease: LeaseWithContracts) -> list[str]:
+    return [
+        contract.contract_number
+        for contract in get_report_contracts(lease)
+        if contract.contract_number
+    ]
+
+
 def get_lease_type(lease):
     return lease.identifier.type.identifier
 
@@ -88,7 +196,7 @@ def get_tenants(
 
     contacts: set[Contact] = set()
 
-    for tenant in lease.tenants.all():
+    for tenant in get_report_tenants(lease):
         all_tenantcontacts = tenant.tenantcontact_set.all()
         for tc in all_tenantcontacts:
             if report == "Lease statistics report" and len(all_tenantcontacts) == 1:
@@ -108,24 +216,12 @@ def get_tenants(
 
 
 def get_address(lease):
-    addresses = []
-
-    for lease_area in lease.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-
-        for area_address in lease_area.addresses.all():
-            if not area_address.is_primary:
-                continue
-
-            addresses.append(area_address.address)
-
-    return " / ".join(addresses)
+    return " / ".join(get_lease_area_addresses(lease))
 
 
 def _get_latest_contract(lease: LeaseWithContracts) -> Contract | None:
     contracts: list[Contract] = []
-    for contract in lease.contracts.all():
+    for contract in get_report_contracts(lease):
         is_valid_leasing_contract = (
             contract.type.name == LEASING_CONTRACT_TYPE_NAME
             and contract.contract_number is not None
@@ -176,15 +272,7 @@ def get_district(obj):
 
 
 def get_lease_area_identifier(obj):
-    lease_area_identifiers = []
-
-    for lease_area in obj.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-
-        lease_area_identifiers.extend([lease_area.identifier])
-
-    return " / ".join(lease_area_identifiers)
+    return " / ".join(get_lease_area_identifiers(obj))
 
 
 def get_lessor(obj):
@@ -194,14 +282,7 @@ def get_lessor(obj):
 
 
 def get_total_area(obj):
-    total_area = 0
-    for lease_area in obj.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-
-        total_area += lease_area.area
-
-    return total_area
+    return sum((lease_area.area for lease_area in get_report_lease_areas(obj)), start=0)
 
 
 def get_supportive_housing(obj):
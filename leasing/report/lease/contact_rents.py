@@ -1,15 +1,16 @@
 import datetime
 from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable
 
 from django import forms
-from django.db.models import Q, QuerySet
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 
+from leasing.calculation.context import RentCalculationContext
 from leasing.enums import TenantContactType
 from leasing.models import Contact, Lease
 from leasing.models.tenant import Tenant, TenantContact
-from leasing.models.types import TenantShares
 from leasing.report.excel import FormatType
 from leasing.report.lease.common_getters import (
     get_address,
@@ -20,6 +21,88 @@ from leasing.report.lease.common_getters import (
 from leasing.report.report_base import ReportBase
 
 
+class ContactRentShareResolver:
+    """Resolves the tenant of the contact on each of the contact's leases.
+
+    The tenant contacts of the tenants that the contact is a part of are
+    loaded for all the leases with one query and indexed by lease and tenant,
+    so that resolving the tenant for a lease and period needs no queries and
+    only goes through the contact's own tenants."""
+
+    def __init__(self, contact: Contact, leases: Iterable[Lease]):
+        self.contact = contact
+        self.tenantcontacts_by_lease_id: dict[
+            int, dict[Tenant, list[TenantContact]]
+        ] = {}
+
+        tenantcontacts = (
+            TenantContact.objects.filter(
+                tenant__lease__in=list(leases),
+                tenant__deleted__isnull=True,
+                # Other tenants can't have the contact as their billing or
+                # tenant contact
+                tenant__in=TenantContact.objects.filter(contact=contact).values(
+                    "tenant_id"
+                ),
+            )
+            .select_related("tenant")
+            .order_by("tenant_id", "-start_date", "id")
+        )
+        for tenantcontact in tenantcontacts:
+            tenant = tenantcontact.tenant
+            self.tenantcontacts_by_lease_id.setdefault(tenant.lease_id, {})
+            self.tenantcontacts_by_lease_id[tenant.lease_id].setdefault(
+                tenant, []
+            ).append(tenantcontact)
+
+    def get_tenant(
+        self, lease: Lease, start_date: datetime.date, end_date: datetime.date
+    ) -> Tenant | None:
+        """
+        Get the Tenant whose rent share belongs to the contact during the period.
+
+        Primarily, the contact is the billing contact of the tenant, like in
+        Lease.get_tenant_shares_for_period(). Tenants without billing contacts
+        are billed to their tenant contacts. Otherwise the contact is one of
+        the tenant contacts of a tenant that shares the billing contact with
+        others.
+        """
+        tenants = self.tenantcontacts_by_lease_id.get(lease.id, {})
+
+        tenant_contacts_tenant = None
+        for tenant, tenantcontacts in tenants.items():
+            tenantcontacts_in_period = [
+                tc
+                for tc in tenantcontacts
+                if (tc.end_date is None or tc.end_date >= start_date)
+                and (tc.start_date is None or tc.start_date <= end_date)
+            ]
+            tenant_tenantcontacts = [
+                tc
+                for tc in tenantcontacts_in_period
+                if tc.type == TenantContactType.TENANT
+            ]
+            if not tenant_tenantcontacts:
+                # Not a tenant during the period
+                continue
+
+            billing_tenantcontacts = [
+                tc
+                for tc in tenantcontacts_in_period
+                if tc.type == TenantContactType.BILLING
+            ] or tenant_tenantcontacts
+
+            if any(tc.contact_id == self.contact.id for tc in billing_tenantcontacts):
+                return tenant
+
+            if tenant_contacts_tenant is None and any(
+                tc.contact_id == self.contact.id for tc in tenant_tenantcontacts
+            ):
+                tenant_contacts_tenant = tenant
+
+        return tenant_contacts_tenant
+
+
 class ContactRentsReport(ReportBase):
     name = _("Contact rents")
     description = _(
@@ -60,6 +143,7 @@ class ContactRentsReport(ReportBase):
             "width": 13,
         },
     }
+    lease_details_source = ""
 
     def get_data(self, input_data):
         try:
@@ -83,30 +167,27 @@ class ContactRentsReport(ReportBase):
                 "identifier__district",
                 "identifier__municipality",
             )
-            .prefetch_related(
-                "lease_areas__addresses",
-                "tenants__contacts",
-                "tenants__tenantcontact_set__contact",
-                "rents",
-            )
             .distinct()
         )
 
-        for lease in leases:
-            date_range = (
-                input_data["start_date"],
-                input_data["end_date"],
+        date_range = (
+            input_data["start_date"],
+            input_data["end_date"],
+        )
+        # The rents and the tenants of all the leases are loaded at once
+        context = RentCalculationContext(leases)
+        rent_share_resolver = ContactRentShareResolver(contact, context.leases)
+
+        for lease in context.leases:
+            rent_for_period = lease.calculate_rent_amount_for_period(
+                *date_range, dry_run=True
             )
-            rent_for_period = lease.calculate_rent_amount_for_period(*date_range)
             rent_total_amount_for_period = rent_for_period.get_total_amount()
             lease._report__rent_for_period = rent_total_amount_for_period.quantize(
                 Decimal(".01"), rounding=ROUND_HALF_UP
             )
 
-            tenant_shares = lease.get_tenant_shares_for_period(*date_range)
-            tenant = self._get_tenant_from_tenant_shares(
-                contact, lease, tenant_shares, date_range
-            )
+            tenant = rent_share_resolver.get_tenant(lease, *date_range)
 
             if tenant is not None:
                 # One Tenant can have multiple Contacts via TenantContact, one Tenant has only one rent share
@@ -124,56 +205,4 @@ class ContactRentsReport(ReportBase):
             else:
                 lease._report__tenants_rent_for_period = lease._report__rent_for_period
 
-        return leases
-
-    def _get_tenant_from_tenant_shares(
-        self,
-        contact: Contact,
-        lease: Lease,
-        tenant_shares: TenantShares,
-        date_range: tuple[datetime.date, datetime.date],
-    ) -> Tenant | None:
-        """
-        Get Tenant for the given Contact or for Contact & Lease from tenant_shares.
-        If the contact is not directly found in tenant_shares, attempt to get the shared tenant
-        with the billing contact. This is because only TenantContact.type `billing` contacts are
-        included in tenant_shares, not TenantContact.type `tenant`.
-        """
-        # a Tenant from TenantContact.tenant of type TenantContactType.BILLING
-        billing_contacts_tenant = tenant_shares.get(contact)
-        if billing_contacts_tenant is not None:
-            # Contact is in tenant_shares as it is of type `BILLING`
-            tenant: Tenant | None = next(iter(billing_contacts_tenant.keys()))
-            return tenant
-
-        # `tenant_shares` only includes billing contacts as keys.
-        # Attempt to get the Tenant for the contact if it is of type TENANT and
-        # its Tenant is the same as one of the billing contacts.
-        contacts_tenantcontacts: QuerySet[TenantContact] = contact.tenantcontact_set
-        start_date, end_date = date_range
-        tenantcontact_range_filter = Q(
-            Q(Q(end_date=None) | Q(end_date__gte=start_date))
-            & Q(Q(start_date=None) | Q(start_date__lte=end_date))
-            & Q(deleted__isnull=True)
-        )
-        contacts_tenantcontact: TenantContact = contacts_tenantcontacts.filter(
-            tenantcontact_range_filter,
-            tenant__lease=lease,
-            type=TenantContactType.TENANT,
-        ).first()
-
-        if not contacts_tenantcontact:
-            # Contacts Tenant is not found in tenant_shares, edge case which "should not happen"
-            return None
-
-        # a Tenant from TenantContact.tenant of `type` TenantContactType.TENANT
-        contacts_tenant: Tenant = contacts_tenantcontact.tenant
-        all_tenant_periods = tenant_shares.values()
-        # Look for the Contacts Tenant in all tenant periods
-        for tenant_period in all_tenant_periods:
-            if contacts_tenant in tenant_period:
-                tenants = tenant_period.keys()
-                tenant: Tenant | None = next(iter(tenants))
-                return tenant
-
-        return None
+        return context.leases
@@ -9,7 +9,6 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from leasing.enums import TenantContactType
 from leasing.models import Invoice, ServiceUnit
 from leasing.report.excel import (
     ExcelCell,
@@ -18,7 +17,17 @@ from leasing.report.excel import (
     PreviousRowsSumCell,
     SumCell,
 )
-from leasing.report.lease.common_getters import get_lease_link_data
+from leasing.report.lease.common_getters import (
+    get_address,
+    get_contract_numbers,
+    get_lease_area_addresses,
+    get_lease_area_identifier,
+    get_lease_area_identifiers,
+    get_lease_link_data,
+    get_tenant_contacts,
+    get_total_area,
+    prefetch_lease_report_details,
+)
 from leasing.report.report_base import ReportBase
 
 
@@ -31,71 +40,13 @@ def get_recipient_address(obj):
 
 
 def get_contract_number(obj):
-    contract_numbers = []
-    for contract in obj.contracts.all():
-        if not contract.contract_number:
-            continue
-
-        contract_numbers.append(contract.contract_number)
-
-    return " / ".join(contract_numbers)
-
-
-def get_lease_area_identifier(obj):
-    lease_area_identifiers = []
-
-    for lease_area in obj.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-
-        lease_area_identifiers.extend([lease_area.identifier])
-
-    return " / ".join(lease_area_identifiers)
-
-
-def get_address(obj):
-    addresses = []
-
-    for lease_area in obj.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-
-        for area_address in lease_area.addresses.all():
-            if not area_address.is_primary:
-                continue
-
-            addresses.append(area_address.address)
-
-    return " / ".join(addresses)
+    return " / ".join(get_contract_numbers(obj))
 
 
 def get_tenants(obj):
     today = timezone.now().date()
 
-    contacts = set()
-
-    for tenant in obj.tenants.all():
-        for tc in tenant.tenantcontact_set.all():
-            if tc.type != TenantContactType.TENANT:
-                continue
-
-            if (tc.end_date is None or tc.end_date >= today) and (
-                tc.start_date is None or tc.start_date <= today
-            ):
-                contacts.add(tc.contact)
-
-    return ", ".join([c.get_name() for c in contacts])
-
-
-def get_total_area(obj):
-    total_area = 0
-    for lease_area in obj.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-
-        total_area += lease_area.area
-
-    return total_area
+    return ", ".join([c.get_name() for c in get_tenant_contacts(obj, today, today)])
 
 
 class ExtraCityRentReport(ReportBase):
@@ -148,13 +99,7 @@ class ExtraCityRentReport(ReportBase):
                 "lease__identifier__type",
                 "lease__identifier__district",
                 "lease__identifier__municipality",
-            )
-            .prefetch_related(
-                "lease__tenants",
-                "lease__tenants__tenantcontact_set",
-                "lease__tenants__tenantcontact_set__contact",
-                "lease__lease_areas",
-                "lease__lease_areas__addresses",
+                "lease__intended_use",
             )
             .order_by(
                 "lease__identifier__municipality__identifier",
@@ -169,52 +114,31 @@ class ExtraCityRentReport(ReportBase):
 
         aggregated_data = []
 
-        for lease, invoices in groupby(qs, lambda x: x.lease):
+        invoices_by_lease = [
+            (lease, list(invoices))
+            for lease, invoices in groupby(qs, lambda x: x.lease)
+        ]
+        prefetch_lease_report_details(lease for lease, _invoices in invoices_by_lease)
+
+        for lease, invoices in invoices_by_lease:
             total_rent = Decimal(0)
-            contacts = set()
             for invoice in invoices:
                 total_rent += invoice.total_amount
 
-            # Do this in code so that the prefetch is used
-            for tenant in lease.tenants.all():
-                for tc in tenant.tenantcontact_set.all():
-                    if tc.type != TenantContactType.TENANT:
-                        continue
-
-                    if (
-                        tc.end_date is None or tc.end_date >= input_data["start_date"]
-                    ) and (
-                        tc.start_date is None or tc.start_date <= input_data["end_date"]
-                    ):
-                        contacts.add(tc.contact)
-
-            addresses = []
-            for lease_area in lease.lease_areas.all():
-                if lease_area.archived_at:
-                    continue
-
-                addresses.extend([la.address for la in lease_area.addresses.all()])
+            contacts = get_tenant_contacts(
+                lease, input_data["start_date"], input_data["end_date"]
+            )
 
             aggregated_data.append(
                 {
                     "municipality_name": lease.identifier.municipality.name,
                     "lease_identifier": get_lease_link_data(lease),
                     "tenant_name": ", ".join([c.get_name() for c in contacts]),
-                    "area_identifier": ", ".join(
-                        [
-                            la.identifier
-                            for la in lease.lease_areas.all()
-                            if la.archived_at is None
-                        ]
-                    ),
-                    "area": sum(
-                        [
-                            la.area
-                            for la in lease.lease_areas.all()
-                            if la.archived_at is None
-                        ]
+                    "area_identifier": ", ".join(get_lease_area_identifiers(lease)),
+                    "area": get_total_area(lease),
+                    "area_address": " / ".join(
+                        get_lease_area_addresses(lease, only_primary=False)
                     ),
-                    "area_address": " / ".join(addresses),
                     "rent": total_rent,
                     "contract_number": get_contract_number(lease),
                     "lease_area_identifier": get_lease_area_identifier(lease),
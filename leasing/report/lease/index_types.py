@@ -5,52 +5,50 @@ from django.db.models import Q, QuerySet
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from leasing.enums import IndexType, TenantContactType
-from leasing.models import Rent, ServiceUnit
+from leasing.enums import IndexType
+from leasing.models import (
+    Contact,
+    Contract,
+    District,
+    IntendedUse,
+    Lease,
+    LeaseArea,
+    LeaseIdentifier,
+    LeaseType,
+    Municipality,
+    Rent,
+    ServiceUnit,
+    Tenant,
+    TenantContact,
+)
+from leasing.models.land_area import LeaseAreaAddress
 from leasing.report.excel import FormatType
-from leasing.report.lease.common_getters import get_lease_link_data_from_related_object
+from leasing.report.lease.common_getters import (
+    get_contract_numbers,
+    get_lease_area_addresses,
+    get_lease_area_identifiers,
+    get_lease_link_data_from_related_object,
+    get_tenant_contacts,
+)
 from leasing.report.report_base import ReportBase
 
 
 def get_tenants(rent: Rent) -> str:
     today = timezone.now().date()
-    contacts = set()
-    for tenant in rent.lease.tenants.all():
-        for tc in tenant.tenantcontact_set.all():
-            if tc.type != TenantContactType.TENANT:
-                continue
-            if (tc.end_date is None or tc.end_date >= today) and (
-                tc.start_date is None or tc.start_date <= today
-            ):
-                contacts.add(tc.contact)
+    contacts = get_tenant_contacts(rent.lease, today, today)
     return ", ".join([c.get_name() for c in contacts])
 
 
 def get_area_id(rent: Rent) -> str:
-    return ", ".join(
-        [la.identifier for la in rent.lease.lease_areas.all() if la.archived_at is None]
-    )
+    return ", ".join(get_lease_area_identifiers(rent.lease))
 
 
 def get_contract_number(rent: Rent) -> str:
-    contract_numbers = []
-    for contract in rent.lease.contracts.all():
-        if not contract.contract_number:
-            continue
-        contract_numbers.append(contract.contract_number)
-    return " / ".join(contract_numbers)
+    return " / ".join(get_contract_numbers(rent.lease))
 
 
 def get_area_address(rent: Rent) -> str:
-    addresses = []
-    for lease_area in rent.lease.lease_areas.all():
-        if lease_area.archived_at:
-            continue
-        for area_address in lease_area.addresses.all():
-            if not area_address.is_primary:
-                continue
-            addresses.append(area_address.address)
-    return ", ".join(addresses)
+    return ", ".join(get_lease_area_addresses(rent.lease))
 
 
 def get_municipality(rent: Rent) -> str:
@@ -127,6 +125,22 @@ class IndexTypesReport(ReportBase):
         "intended_use": {"source": get_intended_use, "label": _("Intended use")},
         "index_type": {"source": get_index_type, "label": _("Index type")},
     }
+    lease_details_source = "lease"
+    cache_source_models = (
+        Rent,
+        Lease,
+        LeaseIdentifier,
+        LeaseType,
+        District,
+        Municipality,
+        IntendedUse,
+        LeaseArea,
+        LeaseAreaAddress,
+        Contract,
+        Tenant,
+        TenantContact,
+        Contact,
+    )
 
     def get_data(self, input_data: dict[str, Any]) -> QuerySet:
         qs = (
@@ -144,14 +158,6 @@ class IndexTypesReport(ReportBase):
                 "lease__municipality",
                 "lease__intended_use",
             )
-            .prefetch_related(
-                "lease__tenants",
-                "lease__tenants__tenantcontact_set",
-                "lease__tenants__tenantcontact_set__contact",
-                "lease__lease_areas",
-                "lease__lease_areas__addresses",
-                "lease__contracts",
-            )
             .order_by(
                 "lease__identifier__municipality__identifier",
                 "lease__identifier__type__identifier",
@@ -6,7 +6,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from leasing.models import Lease, ServiceUnit
+from leasing.models import Lease, LeaseIdentifier, LeaseType, ServiceUnit
 from leasing.report.excel import ExcelCell, ExcelRow, SumCell
 from leasing.report.report_base import ReportBase
 
@@ -30,6 +30,7 @@ class LeaseCountReport(ReportBase):
         "description": {"label": _("Description"), "source": "identifier__type__name"},
         "count": {"label": _("Count"), "is_numeric": True},
     }
+    cache_source_models = (Lease, LeaseIdentifier, LeaseType)
 
     def get_data(self, input_data):
         today = timezone.now().date()
@@ -814,6 +814,7 @@ class LeaseStatisticReport(AsyncReportBase):
         },
     }
     async_task_timeout = 60 * 30  # 30 minutes
+    lease_details_source = ""
 
     def get_data(self, input_data: LeaseStatisticReportInputData) -> QuerySet[Lease]:
         qs = Lease.objects.select_related(
@@ -829,17 +830,12 @@ class LeaseStatisticReport(AsyncReportBase):
         ).prefetch_related(
             "rents",
             "rents__rent_adjustments",
-            "contracts",
-            "contracts__type",
             "lease_areas",
             "lease_areas__addresses",
             "lease_areas__attachments",
             "decisions",
             "decisions__conditions",
             "decisions__type",
-            "tenants",
-            "tenants__tenantcontact_set",
-            "tenants__tenantcontact_set__contact",
             "basis_of_rents",
         )
 
@@ -5,12 +5,48 @@ from django import forms
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
+from leasing.calculation.context import RentCalculationContext
 from leasing.enums import RentType
 from leasing.models import Lease, ServiceUnit
 from leasing.report.lease.common_getters import get_lease_identifier_string
 from leasing.report.report_base import AsyncReportBase
 
 
+def get_year_rent(lease: Lease, year: int) -> Decimal | None:
+    try:
+        rent_amount = lease.calculate_rent_amount_for_year(year, dry_run=True)
+    except NotImplementedError:
+        # Ignore the rent if the rent doesn't have an index defined
+        return None
+
+    return rent_amount.get_total_amount()
+
+
+def get_rent_compare_result(
+    lease: Lease, first_year: int, second_year: int
+) -> dict | None:
+    result = {
+        "lease_identifier": get_lease_identifier_string(lease),
+        "start_date": lease.start_date,
+        "end_date": lease.end_date,
+        "rent_type": ", ".join({str(rent.type) for rent in lease.rents.all()}),
+        "first_year": get_year_rent(lease, first_year),
+        "second_year": get_year_rent(lease, second_year),
+        "difference": None,
+    }
+
+    if not result["first_year"] and not result["second_year"]:
+        return None
+
+    if result["first_year"] and result["second_year"]:
+        difference = abs(result["second_year"] - result["first_year"])
+        result["difference"] = difference / result["first_year"] * Decimal(100)
+        if result["first_year"] > result["second_year"]:
+            result["difference"] = -result["difference"]
+
+    return result
+
+
 class RentCompareReport(AsyncReportBase):
     name = _("Rent compare")
     description = _("Show difference in rent between two years")
@@ -38,8 +74,10 @@ class RentCompareReport(AsyncReportBase):
         "difference": {"label": _("Difference percent"), "format": "percentage"},
     }
     async_task_timeout = 60 * 30  # 30 minutes
+    # Number of leases whose calculation data is held in memory at once
+    lease_batch_size = 500
 
-    def get_data(self, input_data):  # NOQA C901
+    def get_data(self, input_data):
         first_year = input_data["first_year"]
         second_year = input_data["second_year"]
 
@@ -95,6 +133,11 @@ class RentCompareReport(AsyncReportBase):
             )
             .exclude(rents__deleted__isnull=False)
             .exclude(rents__type=RentType.ONE_TIME)
+            .select_related(
+                "identifier__type",
+                "identifier__municipality",
+                "identifier__district",
+            )
             .order_by(
                 "identifier__type__identifier",
                 "identifier__municipality__identifier",
@@ -107,42 +150,18 @@ class RentCompareReport(AsyncReportBase):
         if input_data["service_unit"]:
             leases = leases.filter(service_unit__in=input_data["service_unit"])
 
-        results = []
-        for lease in leases:
-            result = {
-                "lease_identifier": get_lease_identifier_string(lease),
-                "start_date": lease.start_date,
-                "end_date": lease.end_date,
-                "rent_type": None,
-                "first_year": None,
-                "second_year": None,
-                "difference": None,
-            }
-
-            rent_types = {str(rent.type) for rent in lease.rents.all()}
-            result["rent_type"] = ", ".join(rent_types)
-
-            for year in [first_year, second_year]:
-                year_key = "first_year" if year == first_year else "second_year"
-                try:
-                    rent_amount = lease.calculate_rent_amount_for_year(
-                        year, dry_run=True
-                    )
-
-                    result[year_key] = rent_amount.get_total_amount()
-                except NotImplementedError:
-                    # Ignore the rent if the rent doesn't have an index defined
-                    pass
+        leases = list(leases)
 
-            if not result["first_year"] and not result["second_year"]:
-                continue
-
-            if result["first_year"] and result["second_year"]:
-                difference = abs(result["second_year"] - result["first_year"])
-                result["difference"] = difference / result["first_year"] * Decimal(100)
-                if result["first_year"] > result["second_year"]:
-                    result["difference"] = -result["difference"]
-
-            results.append(result)
+        results = []
+        for batch_start in range(0, len(leases), self.lease_batch_size):
+            # The rents of the batch are calculated for both years from the
+            # same preloaded data
+            context = RentCalculationContext(
+                leases[batch_start : batch_start + self.lease_batch_size]
+            )
+            for lease in context.leases:
+                result = get_rent_compare_result(lease, first_year, second_year)
+                if result is not None:
+                    results.append(result)
 
         return results
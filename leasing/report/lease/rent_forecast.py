@@ -1,13 +1,16 @@
-import datetime
 from collections import defaultdict
 from decimal import ROUND_HALF_UP, Decimal
 
 from django import forms
-from django.db.models import Q
+from django.db.models import Sum
 from django.utils.translation import gettext_lazy as _
 
 from leasing.enums import LeaseState
-from leasing.models import Lease, ServiceUnit
+from leasing.models import LeaseRentForecast, ServiceUnit
+from leasing.models.rent_forecast import (
+    get_forecast_leases,
+    refresh_lease_rent_forecasts,
+)
 from leasing.report.excel import (
     ExcelCell,
     ExcelRow,
@@ -59,58 +62,47 @@ class RentForecastReport(AsyncReportBase):
     async_task_timeout = 60 * 30  # 30 minutes
 
     def get_data(self, input_data):  # NOQA C901
-        start_date = datetime.date(year=input_data["start_year"], month=1, day=1)
-        end_date = datetime.date(year=input_data["end_year"], month=12, day=31)
+        years = range(input_data["start_year"], input_data["end_year"] + 1)
 
-        leases = (
-            Lease.objects.filter(
-                (Q(start_date__isnull=True) | Q(start_date__lte=end_date))
-                & (Q(end_date__isnull=True) | Q(end_date__gte=start_date))
-            )
-            .filter(
-                state__in=[
-                    LeaseState.LEASE,
-                    LeaseState.SHORT_TERM_LEASE,
-                    LeaseState.LONG_TERM_LEASE,
-                    LeaseState.RYA,
-                    LeaseState.PERMISSION,
-                ]
-            )
-            .select_related("type")
+        # Only the leases that have changed since the previous run are
+        # calculated again
+        refresh_lease_rent_forecasts(years)
+
+        forecasts = LeaseRentForecast.objects.filter(
+            lease__in=get_forecast_leases(years),
+            year__in=years,
+            amount__isnull=False,
+        ).exclude(
+            # Katja:
+            # Y9-alkuisista pitäisi jättää pois ne vuokraukset, joiden tyyppi on RYA.
+            lease__state=LeaseState.RYA,
+            lease__type__identifier="Y9",
         )
 
         if input_data["service_unit"]:
-            leases = leases.filter(service_unit__in=input_data["service_unit"])
+            forecasts = forecasts.filter(
+                lease__service_unit__in=input_data["service_unit"]
+            )
 
-        years = range(input_data["start_year"], input_data["end_year"] + 1)
+        forecasts = (
+            forecasts.values("year", "lease__type__identifier")
+            .annotate(rent=Sum("amount"))
+            .order_by()
+        )
 
         rent_sums = {
             "internal": defaultdict(lambda: defaultdict(Decimal)),
             "external": defaultdict(lambda: defaultdict(Decimal)),
         }
 
-        for lease in leases:
-            # Katja:
-            # Y9-alkuisista pitäisi jättää pois ne vuokraukset, joiden tyyppi on RYA.
-            if lease.state == LeaseState.RYA and lease.type.identifier == "Y9":
-                continue
-
-            for year in years:
-                try:
-                    rent_amount = lease.calculate_rent_amount_for_year(
-                        year, dry_run=True
-                    )
+        for forecast in forecasts:
+            lease_type = forecast["lease__type__identifier"]
 
-                    rent_sums_key = "external"
-                    if lease.type.identifier in INTERNAL_LEASE_TYPES:
-                        rent_sums_key = "internal"
+            rent_sums_key = "external"
+            if lease_type in INTERNAL_LEASE_TYPES:
+                rent_sums_key = "internal"
 
-                    rent_sums[rent_sums_key][year][
-                        lease.type.identifier
-                    ] += rent_amount.get_total_amount()
-                except NotImplementedError:
-                    # Ignore the rent if the rent doesn't have an index defined
-                    pass
+            rent_sums[rent_sums_key][forecast["year"]][lease_type] += forecast["rent"]
 
         result = []
         data_row_num = 0
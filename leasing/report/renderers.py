@@ -1,4 +1,6 @@
+import csv
 import json
+from typing import Iterable, Iterator
 
 from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework import renderers
@@ -20,3 +22,63 @@ class XLSXRenderer(renderers.BaseRenderer):
             return json.dumps(data, cls=DjangoJSONEncoder)
 
         return renderer_context["view"].report.data_as_excel(data)
+
+
+class StreamingReportRenderer(renderers.BaseRenderer):
+    """Base class of the streaming output formats of the reports.
+
+    The rows of a report are rendered one at a time by `render_rows` into a
+    StreamingHttpResponse by `ReportBase.get_streaming_response`. `render`
+    is only used for the other responses, e.g. errors, which are JSON."""
+
+    charset = "utf-8"
+
+    def render(self, data, media_type=None, renderer_context=None):
+        renderer_context["response"]["Content-Type"] = "application/json"
+        return json.dumps(data, cls=DjangoJSONEncoder)
+
+    def render_rows(
+        self, rows: Iterable[dict], field_names: list[str]
+    ) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class _LineBuffer:
+    """File-like object that returns the written line instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+class CSVStreamingRenderer(StreamingReportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+    def render_rows(
+        self, rows: Iterable[dict], field_names: list[str]
+    ) -> Iterator[str]:
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(field_names)
+        for row in rows:
+            yield writer.writerow(
+                [self.render_value(row.get(field_name)) for field_name in field_names]
+            )
+
+    def render_value(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            # E.g. the lease links of the URL format
+            return json.dumps(value, cls=DjangoJSONEncoder)
+        return value
+
+
+class JSONLinesStreamingRenderer(StreamingReportRenderer):
+    media_type = "application/jsonl"
+    format = "jsonl"
+
+    def render_rows(
+        self, rows: Iterable[dict], field_names: list[str]
+    ) -> Iterator[str]:
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
@@ -1,26 +1,42 @@
 from io import BytesIO
-from typing import Any, Type, Union
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Iterator, Type, Union
 
 import xlsxwriter
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.db.models import Model, QuerySet
 from django.forms.models import ModelChoiceIteratorValue
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.utils.functional import Promise
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django_q.conf import Conf
 from django_q.tasks import async_task
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotAcceptable, ValidationError
 from rest_framework.fields import ChoiceField
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from leasing.report.cache import (
+    REPORT_CACHE_TIMEOUT,
+    get_report_cache_key,
+    get_report_cache_storage,
+    read_cached_report_data,
+    write_cached_report_data,
+)
 from leasing.report.excel import ExcelRow, FormatType
 from leasing.report.forms import ReportFormBase
+from leasing.report.lease.common_getters import prefetch_lease_report_details
+from leasing.report.renderers import StreamingReportRenderer
 from leasing.report.serializers import ReportOutputSerializer
 
+# The number of rows fetched from the database and serialized at a time when
+# the report is streamed
+STREAMING_CHUNK_SIZE = 2000
+
 
 class ReportBase:
     # Name is returned in the report list and in the metadata
@@ -85,6 +101,20 @@ class ReportBase:
     # This is exposed in the report metadata in the key "is_already_sorted".
     is_already_sorted = False
 
+    # Path to the lease from the objects returned by get_data, e.g. "rent.lease",
+    # or "" when the objects are leases themselves. When set, the details that
+    # the lease getters in common_getters use are loaded for all the leases at
+    # once before serializing, so that the number of queries does not depend
+    # on what get_data happened to prefetch.
+    lease_details_source: Union[str, None] = None
+
+    # The models that the report data is read from. When set, the responses
+    # of the report are cached in the private file storage for
+    # `cache_timeout` seconds, or until a row of any of the models is saved
+    # or deleted. The models must have a `modified_at` field.
+    cache_source_models: tuple[Type[Model], ...] = ()
+    cache_timeout = REPORT_CACHE_TIMEOUT
+
     @classmethod
     def get_output_fields_metadata(cls):
         metadata = {}
@@ -140,7 +170,20 @@ class ReportBase:
 
         return input_form.cleaned_data
 
+    def prefetch_lease_details(self, report_data: list):
+        if self.lease_details_source:
+            get_lease = attrgetter(self.lease_details_source)
+            leases = [get_lease(obj) for obj in report_data]
+        else:
+            leases = report_data
+
+        prefetch_lease_report_details(leases)
+
     def serialize_data(self, report_data, localize_output=False):
+        if self.lease_details_source is not None:
+            report_data = list(report_data)
+            self.prefetch_lease_details(report_data)
+
         serializer_class = self.get_serializer_class()
         serializer = serializer_class(
             report_data,
@@ -156,6 +199,55 @@ class ReportBase:
         serialized_report_data = self.serialize_data(report_data)
         return Response(serialized_report_data)
 
+    def get_cached_response(self, request: Request) -> Response:
+        """Returns the response of the report from the report cache, or
+        generates it with `get_response` and caches it."""
+        storage = get_report_cache_storage()
+        if storage is None or not self.cache_source_models:
+            return self.get_response(request)
+
+        input_data = self.get_input_data(request.query_params)
+        cache_key = get_report_cache_key(self, request, input_data)
+        cached_data = read_cached_report_data(storage, cache_key, self.cache_timeout)
+        if cached_data is not None:
+            return Response(cached_data)
+
+        response = self.get_response(request)
+        if response.status_code == 200:
+            write_cached_report_data(storage, cache_key, response.data)
+        return response
+
+    def iterate_serialized_data(self, report_data) -> Iterator[dict]:
+        """Serializes the report data in chunks of `STREAMING_CHUNK_SIZE` rows.
+
+        Querysets are iterated without caching the results, so that only one
+        chunk is kept in memory at a time. The lease details are loaded for
+        each chunk separately."""
+        if isinstance(report_data, QuerySet):
+            rows = report_data.iterator(chunk_size=STREAMING_CHUNK_SIZE)
+        else:
+            rows = iter(report_data)
+
+        while chunk := list(islice(rows, STREAMING_CHUNK_SIZE)):
+            yield from self.serialize_data(chunk)
+
+    def get_streaming_response(
+        self, request: Request, renderer: StreamingReportRenderer
+    ) -> StreamingHttpResponse:
+        """Streams the rows of the report with the renderer, e.g. as CSV or
+        JSON lines, without the extra rows of the Excel output.
+
+        The input is validated and the report data is queried before the
+        response is returned, but the rows are only fetched and serialized
+        while they are being sent."""
+        input_data = self.get_input_data(request.query_params)
+        report_data = self.get_data(input_data)
+        rows = self.iterate_serialized_data(report_data)
+        return StreamingHttpResponse(
+            renderer.render_rows(rows, list(self.output_fields.keys())),
+            content_type="{}; charset={}".format(renderer.media_type, renderer.charset),
+        )
+
     def get_data(self, input_data: dict[str, Any]) -> list[dict] | QuerySet:
         raise NotImplementedError(
             "Please implement this method in the concrete report class"
@@ -388,6 +480,11 @@ class AsyncReportBase(ReportBase):
             {"message": _("Results will be sent by email to {}").format(user_email)}
         )
 
+    def get_streaming_response(
+        self, request: Request, renderer: StreamingReportRenderer
+    ) -> StreamingHttpResponse:
+        raise NotAcceptable(_("This report is only sent by email"))
+
 
 def generate_email_report(
     email: str,
@@ -1,4 +1,5 @@
 from django.forms.models import ModelChoiceIteratorValue
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 from rest_framework.exceptions import NotFound, PermissionDenied
@@ -28,7 +29,12 @@ from leasing.report.lease.rent_compare import RentCompareReport
 from leasing.report.lease.rent_forecast import RentForecastReport
 from leasing.report.lease.rent_type import RentTypeReport
 from leasing.report.lease.reservations import ReservationsReport
-from leasing.report.renderers import XLSXRenderer
+from leasing.report.renderers import (
+    CSVStreamingRenderer,
+    JSONLinesStreamingRenderer,
+    StreamingReportRenderer,
+    XLSXRenderer,
+)
 from leasing.report.report_base import AsyncReportBase
 
 ENABLED_REPORTS = [
@@ -56,7 +62,13 @@ ENABLED_REPORTS = [
 
 class ReportViewSet(ViewSet):
     permission_classes = (IsAuthenticated,)
-    renderer_classes = [JSONRenderer, BrowsableAPIRendererWithoutForms, XLSXRenderer]
+    renderer_classes = [
+        JSONRenderer,
+        BrowsableAPIRendererWithoutForms,
+        XLSXRenderer,
+        CSVStreamingRenderer,
+        JSONLinesStreamingRenderer,
+    ]
     lookup_field = "report_type"
 
     def __init__(self, **kwargs):
@@ -104,7 +116,12 @@ class ReportViewSet(ViewSet):
         if not request.user.has_perm(codename) and not request.user.is_superuser:
             raise PermissionDenied(_("No permission to generate report"))
 
-        return self.report.get_response(request)
+        if isinstance(request.accepted_renderer, StreamingReportRenderer):
+            return self.report.get_streaming_response(
+                request, request.accepted_renderer
+            )
+
+        return self.report.get_cached_response(request)
 
     def finalize_response(self, request, response, *args, **kwargs):
         response = super().finalize_response(request, response, *args, **kwargs)
@@ -117,6 +134,10 @@ class ReportViewSet(ViewSet):
             response["content-disposition"] = "attachment; filename={}".format(
                 self.report.get_filename(response.accepted_renderer.format)
             )
+        elif isinstance(response, StreamingHttpResponse) and self.report:
+            response["content-disposition"] = "attachment; filename={}".format(
+                self.report.get_filename(request.accepted_renderer.format)
+            )
 
         return response
 
@@ -82,7 +82,7 @@ class CollateralSerializer(
 
     class Meta:
         model = Collateral
-        exclude = ("contract",)
+        exclude = ("contract", "modified_at")
 
 
 class CollateralCreateUpdateSerializer(
@@ -97,7 +97,7 @@ class CollateralCreateUpdateSerializer(
 
     class Meta:
         model = Collateral
-        exclude = ("contract",)
+        exclude = ("contract", "modified_at")
 
 
 class ContractTypeSerializer(NameModelSerializer):
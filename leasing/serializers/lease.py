@@ -1,6 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
-from django.contrib.gis.db.models import Union
-from django.db.models import DurationField, Q
+from django.db.models import DurationField, Q, Subquery
 from django.db.models.functions import Cast
 from django.utils.translation import gettext_lazy as _
 from enumfields.drf import EnumField, EnumSupportSerializerMixin
@@ -444,7 +443,7 @@ class LeaseSerializerBase(
 
     class Meta:
         model = Lease
-        exclude = ("related_leases",)
+        exclude = ("related_leases", "area_geometry")
 
 
 class LeaseListSerializer(LeaseSerializerBase):
@@ -460,43 +459,16 @@ class LeaseListSerializer(LeaseSerializerBase):
     collection_notes = None
 
 
-def get_related_lease_predecessors(to_lease_id, accumulator=None):
-    if accumulator is None:
-        accumulator = []
-
-    accumulator.append(to_lease_id)
-
-    result = set()
-    predecessors = RelatedLease.objects.filter(to_lease=to_lease_id).select_related(
-        "to_lease", "from_lease"
-    )
-
-    if predecessors:
-        for predecessor in predecessors:
-            result.add(predecessor)
-
-            if predecessor.from_lease_id == predecessor.to_lease_id:
-                continue
-
-            if predecessor.from_lease_id in accumulator:
-                continue
-
-            result.update(
-                get_related_lease_predecessors(predecessor.from_lease_id, accumulator)
-            )
-
-    return result
+def get_related_lease_predecessors(to_lease_id):
+    return RelatedLease.objects.get_graph(to_lease_id).get_predecessor_relations()
 
 
 def get_related_leases(obj):
+    graph = RelatedLease.objects.get_graph(obj.id)
     # Immediate successors
-    related_to_leases = set(
-        RelatedLease.objects.filter(from_lease=obj).select_related(
-            "to_lease", "from_lease"
-        )
-    )
+    related_to_leases = graph.get_immediate_successor_relations()
     # All predecessors
-    related_from_leases = get_related_lease_predecessors(obj.id)
+    related_from_leases = graph.get_predecessor_relations()
 
     return {
         "related_to": RelatedToLeaseSerializer(related_to_leases, many=True).data,
@@ -504,6 +476,13 @@ def get_related_leases(obj):
     }
 
 
+def get_lease_area_geometry(lease):
+    """The stored union of the lease area geometries as a subquery. It is read
+    in the database, because the trigger maintaining it may have changed it
+    after the lease instance was loaded."""
+    return Subquery(Lease.objects.filter(pk=lease.pk).values("area_geometry")[:1])
+
+
 class LeaseRetrieveSerializer(LeaseSerializerBase):
     related_leases = serializers.SerializerMethodField()
     related_plot_applications = RelatedPlotApplicationSerializer(
@@ -561,34 +540,25 @@ class LeaseRetrieveSerializer(LeaseSerializerBase):
     def get_area_notes(self, obj):
         from leasing.serializers.area_note import AreaNoteSerializer
 
-        area_notes = None
-        combined_area = obj.lease_areas.aggregate(union=Union("geometry"))["union"]
-        if combined_area:
-            area_notes = AreaNote.objects.filter(geometry__intersects=combined_area)
+        area_notes = AreaNote.objects.filter(
+            geometry__intersects=get_lease_area_geometry(obj)
+        )
 
         return AreaNoteSerializer(area_notes, many=True).data
 
     def get_matching_basis_of_rents(self, obj):
         from leasing.serializers.basis_of_rent import BasisOfRentSerializer
 
-        q = Q()
+        q = Q(geometry__intersects=get_lease_area_geometry(obj))
         property_identifiers = obj.lease_areas.values_list("identifier", flat=True)
         if property_identifiers:
-            q = Q(property_identifiers__identifier__in=property_identifiers)
-
-        combined_area = obj.lease_areas.aggregate(union=Union("geometry"))["union"]
-        if combined_area:
-            q |= Q(geometry__intersects=combined_area)
-
-        if not q:
-            return []
+            q |= Q(property_identifiers__identifier__in=property_identifiers)
 
         return BasisOfRentSerializer(BasisOfRent.objects.filter(q), many=True).data
 
     class Meta:
         model = Lease
-        fields = "__all__"
-        exclude = None
+        exclude = ("area_geometry",)
 
 
 class SameServiceUnitValidator:
@@ -715,7 +685,7 @@ class LeaseUpdateSerializer(
 
     class Meta:
         model = Lease
-        fields = "__all__"
+        exclude = ("area_geometry",)
         read_only_fields = ("invoicing_enabled_at", "rent_info_completed_at")
 
 
@@ -760,5 +730,5 @@ class LeaseCreateSerializer(LeaseUpdateSerializer):
 
     class Meta:
         model = Lease
-        fields = "__all__"
+        exclude = ("area_geometry",)
         read_only_fields = ("invoicing_enabled_at", "rent_info_completed_at")
@@ -1,9 +1,18 @@
 from collections import OrderedDict
 
-from django.core.exceptions import ObjectDoesNotExist
+from auditlog import receivers as auditlog_receivers
+from auditlog.context import auditlog_disabled
+from auditlog.diff import model_instance_diff
+from auditlog.models import LogEntry, LogEntryManager
+from auditlog.registry import auditlog
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db import models
 from django.db.models import ManyToOneRel, OneToOneField, OneToOneRel
+from django.db.models.signals import post_save, pre_save
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from safedelete.models import SafeDeleteModel
 
 
 class InstanceDictPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
@@ -55,21 +64,24 @@ def sync_new_items_to_manager(new_items, manager, context):
 
     existing_items = set(manager.all())
 
-    for item in existing_items.difference(new_items):
-        permission_name = "{}.delete_{}".format(
-            manager.model._meta.app_label, manager.model._meta.model_name
-        )
-        if not context["request"].user.has_perm(permission_name):
-            # Ignore removal of the item if the user doesn't have permission to delete
-            continue
-
-        if hasattr(manager, "remove"):
-            manager.remove(item)
-        else:
-            item.delete()
-
-    for item in new_items.difference(existing_items):
-        manager.add(item)
+    permission_name = "{}.delete_{}".format(
+        manager.model._meta.app_label, manager.model._meta.model_name
+    )
+    # Ignore removal of the items if the user doesn't have permission to delete
+    if context["request"].user.has_perm(permission_name):
+        removed_items = existing_items.difference(new_items)
+        if removed_items and hasattr(manager, "remove"):
+            manager.remove(*removed_items)
+        elif removed_items:
+            # Deleting the queryset deletes the items one by one, so that
+            # soft deletion and the audit log work as with a single item
+            manager.model._default_manager.filter(
+                pk__in=[item.pk for item in removed_items]
+            ).delete()
+
+    added_items = new_items.difference(existing_items)
+    if added_items:
+        manager.add(*added_items)
 
 
 def get_instance_from_default_manager(pk, model_class):
@@ -82,12 +94,35 @@ def get_instance_from_default_manager(pk, model_class):
         return None
 
 
-def serializer_data_differs(serializer, original_serializer):
-    for field_name in serializer.validated_data.keys():
-        if (
-            serializer.validated_data[field_name]
-            != original_serializer.data[field_name]
-        ):
+def get_instances_from_default_manager(pks, model_class):
+    """Fetches the instances with the given primary keys with one query.
+    Returns a dict of the found instances by primary key."""
+    pks = [pk for pk in pks if pk]
+    if not pks:
+        return {}
+
+    return model_class._default_manager.in_bulk(pks)
+
+
+def instance_data_differs(instance, validated_data):
+    """Compares the validated data to the current field values of the instance.
+    Values that are not plain model fields, e.g. nested items, are always
+    considered changed."""
+    for field_name, value in validated_data.items():
+        try:
+            field = instance._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return True
+
+        if not field.concrete or field.many_to_many:
+            return True
+
+        if field.is_relation:
+            if isinstance(value, models.Model):
+                value = value.pk
+            if getattr(instance, field.attname) != value:
+                return True
+        elif getattr(instance, field_name) != value:
             return True
 
     return False
@@ -102,8 +137,7 @@ def check_perm(serializer, instance):
         )
         return serializer.context["request"].user.has_perm(permission_name)
 
-    instance_serializer = serializer.__class__(instance)
-    if serializer_data_differs(serializer, instance_serializer):
+    if instance_data_differs(instance, serializer.validated_data):
         permission_name = "{}.change_{}".format(
             model_class._meta.app_label, model_class._meta.model_name
         )
@@ -112,6 +146,163 @@ def check_perm(serializer, instance):
         return True
 
 
+def get_validated_serializer(serializer_class, data, instance, context, related_name):
+    serializer = serializer_class(data=data, instance=instance, context=context)
+
+    if hasattr(serializer, "modify_fields_by_field_permissions"):
+        serializer.modify_fields_by_field_permissions()
+
+    try:
+        serializer.is_valid(raise_exception=True)
+    except ValidationError as e:
+        raise ValidationError({related_name: e.detail})
+
+    return serializer
+
+
+def set_changed_values(instance, data):
+    """Sets the values to the instance if any of them differs from the current
+    ones. Returns whether the instance was changed."""
+    if not instance_data_differs(instance, data):
+        return False
+
+    for field_name, value in data.items():
+        setattr(instance, field_name, value)
+    return True
+
+
+def can_bulk_save(serializer, model_class):
+    """Whether saving the validated data of the serializer is a plain model
+    save, which can be replaced with `bulk_create` or `bulk_update`.
+
+    That is not the case if the serializer or the model customise saving, the
+    model has save signal receivers other than the audit log, or the data
+    contains nested items or many-to-many values."""
+    serializer_class = serializer.__class__
+    if serializer_class.save is not serializers.BaseSerializer.save:
+        return False
+    if serializer_class.create not in BULK_SAVE_CREATE_METHODS:
+        return False
+    if serializer_class.update not in BULK_SAVE_UPDATE_METHODS:
+        return False
+    if model_class.save not in BULK_SAVE_MODEL_SAVE_METHODS:
+        return False
+    if has_save_receivers(model_class):
+        return False
+
+    for field_name in serializer.validated_data.keys():
+        try:
+            field = model_class._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return False
+
+        if not field.concrete or field.many_to_many:
+            return False
+
+    return True
+
+
+# The receivers that the audit log connects to the save signals of the
+# registered models. `_bulk_log` writes their entries for bulk saved items.
+AUDITLOG_SAVE_RECEIVERS = (auditlog_receivers.log_create, auditlog_receivers.log_update)
+
+
+def has_save_receivers(model_class):
+    """Whether the model has save signal receivers other than the audit log,
+    which `bulk_create` and `bulk_update` would skip"""
+    for signal in (pre_save, post_save):
+        if not signal.has_listeners(model_class):
+            continue
+        sync_receivers, async_receivers = signal._live_receivers(model_class)
+        if any(
+            receiver not in AUDITLOG_SAVE_RECEIVERS
+            for receiver in [*sync_receivers, *async_receivers]
+        ):
+            return True
+    return False
+
+
+class _UnsavedLogEntryManager(LogEntryManager):
+    """Fills in the log entries like `LogEntryManager.log_create`, but
+    returns them unsaved, so that they can be created in bulk"""
+
+    def create(self, **kwargs):
+        return self.model(**kwargs)
+
+
+def _bulk_log(model_class, instances, action):
+    """Writes the audit log entries of bulk created or updated instances with
+    one query, and the old values of the updated instances with another."""
+    if not auditlog.contains(model_class) or auditlog_disabled.get():
+        return
+
+    old_instances = {}
+    if action == LogEntry.Action.UPDATE:
+        old_instances = model_class._default_manager.in_bulk(
+            [item_instance.pk for item_instance in instances]
+        )
+
+    entry_manager = _UnsavedLogEntryManager()
+    entry_manager.model = LogEntry
+
+    log_entries = []
+    for item_instance in instances:
+        changes = model_instance_diff(
+            old_instances.get(item_instance.pk),
+            item_instance,
+            use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+        )
+        if not changes:
+            continue
+
+        log_entry = entry_manager.log_create(
+            item_instance, action=action, changes=changes
+        )
+        # The actor of the request is set to the entries by a pre_save
+        # receiver, which bulk_create doesn't send
+        pre_save.send(
+            sender=LogEntry,
+            instance=log_entry,
+            raw=False,
+            using=LogEntry.objects.db,
+            update_fields=None,
+        )
+        log_entries.append(log_entry)
+
+    LogEntry.objects.bulk_create(log_entries)
+
+
+def _bulk_create(model_class, instances):
+    if not instances:
+        return
+
+    model_class._default_manager.bulk_create(instances)
+
+    _bulk_log(model_class, instances, LogEntry.Action.CREATE)
+
+
+def _bulk_update(model_class, instances, field_names):
+    if not instances:
+        return
+
+    auto_now_fields = [
+        field
+        for field in model_class._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+    ]
+    for item_instance in instances:
+        for field in auto_now_fields:
+            field.pre_save(item_instance, add=False)
+
+    # The audit log compares the instances to the rows in the database, so
+    # the entries are created before the rows are updated
+    _bulk_log(model_class, instances, LogEntry.Action.UPDATE)
+
+    model_class._default_manager.bulk_update(
+        instances, set(field_names) | {field.name for field in auto_now_fields}
+    )
+
+
 def instance_create_or_update_related(
     instance=None,
     related_name=None,
@@ -119,6 +310,11 @@ def instance_create_or_update_related(
     validated_data=None,
     context=None,
 ):
+    """Creates, updates and removes the items of a reverse many-to-one relation.
+
+    The existing items are fetched with one query. Items whose data is plain
+    model field values are created and updated in bulk, and the rest are saved
+    one by one with their serializer."""
     manager = getattr(instance, related_name)
     new_items = set()
     model_class = serializer_class.Meta.model
@@ -126,31 +322,42 @@ def instance_create_or_update_related(
     if validated_data is None:
         validated_data = []
 
-    for item in validated_data:
-        pk = item.pop("id", None)
-
-        serializer_params = {
-            "data": item,
-            "instance": get_instance_from_default_manager(pk, model_class),
-            "context": context,
-        }
-
-        serializer = serializer_class(**serializer_params)
-
-        if hasattr(serializer, "modify_fields_by_field_permissions"):
-            serializer.modify_fields_by_field_permissions()
-
-        try:
-            serializer.is_valid(raise_exception=True)
-        except ValidationError as e:
-            raise ValidationError({related_name: e.detail})
+    pks = [item.pop("id", None) for item in validated_data]
+    existing_instances = get_instances_from_default_manager(pks, model_class)
+
+    instances_to_create = []
+    instances_to_update = []
+    updated_field_names = set()
+    for pk, item in zip(pks, validated_data):
+        serializer = get_validated_serializer(
+            serializer_class,
+            data=item,
+            instance=existing_instances.get(pk) if pk else None,
+            context=context,
+            related_name=related_name,
+        )
 
         if not check_perm(serializer, serializer.instance):
             # Ignore the new item if the user doesn't have permission to add
             continue
 
-        item_instance = serializer.save(**{manager.field.name: instance})
-        new_items.add(item_instance)
+        if not can_bulk_save(serializer, model_class):
+            new_items.add(serializer.save(**{manager.field.name: instance}))
+            continue
+
+        item_data = {**serializer.validated_data, manager.field.name: instance}
+        if serializer.instance is None:
+            instances_to_create.append(model_class(**item_data))
+            continue
+
+        if set_changed_values(serializer.instance, item_data):
+            updated_field_names.update(item_data.keys())
+            instances_to_update.append(serializer.instance)
+        new_items.add(serializer.instance)
+
+    _bulk_create(model_class, instances_to_create)
+    _bulk_update(model_class, instances_to_update, updated_field_names)
+    new_items.update(instances_to_create)
 
     # Handle children in a self-referential many-to-one relationship.
     for rel in model_class._meta.get_fields():
@@ -305,6 +512,18 @@ class UpdateNestedMixin:
         return instance
 
 
+# Methods that save the validated data as is, see `can_bulk_save`
+BULK_SAVE_CREATE_METHODS = (
+    serializers.ModelSerializer.create,
+    UpdateNestedMixin.create,
+)
+BULK_SAVE_UPDATE_METHODS = (
+    serializers.ModelSerializer.update,
+    UpdateNestedMixin.update,
+)
+BULK_SAVE_MODEL_SAVE_METHODS = (models.Model.save, SafeDeleteModel.save)
+
+
 class NameModelSerializer(serializers.ModelSerializer):
     id = serializers.IntegerField(required=False)
     name = serializers.CharField(read_only=True)
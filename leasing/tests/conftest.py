@@ -67,7 +67,6 @@ from leasing.models.rent import (
     ManagementSubventionFormOfManagement,
     OldDwellingsInHousingCompaniesPriceIndex,
 )
-from leasing.models.service_unit import ServiceUnitGroupMapping
 from leasing.models.tenant import (
     Tenant,
     TenantContact,
@@ -323,12 +322,6 @@ class CustomDetailedPlanFactory(factory.django.DjangoModelFactory):
         model = CustomDetailedPlan
 
 
-@register
-class ServiceUnitGroupMappingFactory(factory.django.DjangoModelFactory):
-    class Meta:
-        model = ServiceUnitGroupMapping
-
-
 @register
 class IntendedUseFactory(factory.django.DjangoModelFactory):
     name = fake.word()
@@ -1,3 +1,4 @@
+import sqlite3
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -172,3 +173,86 @@ def test_build_permission_amount(plan_unit_factory, lease_area_factory, lease_fa
     )
     assert UsageDistribution.objects.get(distribution="case4").build_permission == "-"
     assert UsageDistribution.objects.get(distribution="case5").build_permission == "0"
+
+
+FACTA_FIXTURE_SQL = """
+CREATE TABLE MV_KAAVAYKSIKON_RAKOIKJAKAUMA (
+    kg_kkaavyks INTEGER,
+    c_kaavayksikkotunnus TEXT,
+    c_kaytjakauma TEXT,
+    c_rakoikeus TEXT
+);
+CREATE TABLE mv_kaavayksikko (
+    kg_kkaavyks INTEGER,
+    kaavayksikko TEXT,
+    c_kayttota TEXT,
+    c_ktarsel TEXT,
+    c_olotila INTEGER,
+    i_rakoikeus TEXT
+);
+CREATE TABLE mv_koodisto (c_koodi TEXT, c_koodisto TEXT, c_selite TEXT);
+
+INSERT INTO mv_kaavayksikko VALUES
+    (1, '0001-0002', 'AK', 'Asuinkerrostalot', 1, '1000'),
+    (2, '0003-0004', 'Y', NULL, 5, '50'),
+    (3, '0005-0006', 'P', NULL, 1, NULL);
+INSERT INTO MV_KAAVAYKSIKON_RAKOIKJAKAUMA VALUES
+    (1, '0001-0002', '1', '795'),
+    (1, '0001-0002', '3BB', '650'),
+    (2, '0003-0004', '1', '10');
+INSERT INTO mv_koodisto VALUES ('3BB', 'SU_KAYTJAKAUMA', 'Liike- tai toimistotilat');
+"""
+
+
+@pytest.fixture
+def facta_connection():
+    """A local database that stands in for the Facta database."""
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(FACTA_FIXTURE_SQL)
+    yield connection
+    connection.close()
+
+
+@pytest.mark.django_db
+def test_import_from_fixture_database(
+    django_assert_max_num_queries,
+    facta_connection,
+    lease_test_data,
+    plan_unit_factory,
+):
+    lease_area = lease_test_data["lease_area"]
+    plan_unit = plan_unit_factory(
+        area=100, lease_area=lease_area, identifier="1-2", is_master=True
+    )
+    kept = UsageDistribution.objects.create(
+        plan_unit=plan_unit, distribution="AK", build_permission="795"
+    )
+    reused = UsageDistribution.objects.create(
+        plan_unit=plan_unit, distribution="AK", build_permission="1"
+    )
+    deleted = UsageDistribution.objects.create(
+        plan_unit=plan_unit, distribution="AK", build_permission="2"
+    )
+    plan_unit_without_distributions = plan_unit_factory(
+        area=100, lease_area=lease_area, identifier="5-6", is_master=True
+    )
+    repealed_plan_unit = plan_unit_factory(
+        area=100, lease_area=lease_area, identifier="3-4", is_master=True
+    )
+
+    importer = UsageDistributionImporter(connection=facta_connection)
+    with django_assert_max_num_queries(10):
+        importer.import_usage_distributions()
+
+    assert sorted(
+        plan_unit.usage_distributions.values_list("distribution", "build_permission")
+    ) == [("3BB", "650"), ("AK", "795")]
+    assert UsageDistribution.objects.filter(id=kept.id).exists()
+    assert UsageDistribution.objects.filter(id=reused.id).exists()
+    assert not UsageDistribution.objects.filter(id=deleted.id).exists()
+    assert list(
+        plan_unit_without_distributions.usage_distributions.values_list(
+            "distribution", "build_permission"
+        )
+    ) == [("P", "-")]
+    assert not repealed_plan_unit.usage_distributions.exists()
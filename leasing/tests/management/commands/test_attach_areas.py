@@ -8,16 +8,18 @@ from leasing.models import LeaseArea, PlanUnit, Plot
 
 
 @pytest.mark.django_db
+@pytest.mark.parametrize("bulk", [False, True])
 def test_attach_areas_to_lease_areas(
     lease_area_factory,
     plan_unit_factory,
     plot_factory,
     area_with_intersects_test_data,
     lease_test_data,
+    bulk,
 ):
     out = StringIO()
     args = []
-    opts = {}
+    opts = {"bulk": bulk}
 
     area = area_with_intersects_test_data["area"]
     lease = lease_test_data["lease"]
@@ -68,16 +70,18 @@ def test_attach_areas_to_lease_areas(
 
 
 @pytest.mark.django_db
+@pytest.mark.parametrize("bulk", [False, True])
 def test_plan_unit_updates_modified_at(
     lease_area_factory,
     plan_unit_factory,
     area_with_intersects_test_data,
     lease_test_data,
     monkeypatch,
+    bulk,
 ):
     out = StringIO()
     args = []
-    opts = {}
+    opts = {"bulk": bulk}
 
     lease = lease_test_data["lease"]
 
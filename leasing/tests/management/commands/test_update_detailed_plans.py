@@ -0,0 +1,51 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from leasing.enums import AreaType, DetailedPlanClass
+from leasing.models import DetailedPlan
+
+
+@pytest.mark.django_db
+def test_update_detailed_plans(area_factory, area_source_factory):
+    source = area_source_factory(name="Kaava", identifier="kaava")
+    area_factory(
+        type=AreaType.DETAILED_PLAN,
+        identifier="12345",
+        external_id="1",
+        source=source,
+        metadata={"state_name": "Voimassa", "final_date": "2020-01-31"},
+    )
+    area_factory(
+        type=AreaType.PRE_DETAILED_PLAN,
+        identifier="12345",
+        external_id="2",
+        source=source,
+        metadata={"acceptor": "Kvsto", "plan_stage": "Ehdotus", "diary_number": "1"},
+    )
+    area_factory(
+        type=AreaType.DETAILED_PLAN,
+        identifier="67890",
+        external_id="3",
+        source=source,
+        metadata={"state_name": "Vireillä"},
+    )
+    unchanged_plan = DetailedPlan.objects.create(
+        identifier="67890", detailed_plan_class=DetailedPlanClass.PENDING
+    )
+
+    call_command("update_detailed_plans", stdout=StringIO())
+
+    detailed_plan = DetailedPlan.objects.get(identifier="12345")
+    assert detailed_plan.detailed_plan_class == DetailedPlanClass.EFFECTIVE
+    assert detailed_plan.lawfulness_date == datetime.date(2020, 1, 31)
+    assert detailed_plan.acceptor == "Kvsto"
+    assert detailed_plan.plan_stage == "Ehdotus"
+
+    assert DetailedPlan.objects.filter(identifier="67890").count() == 1
+    assert (
+        DetailedPlan.objects.get(identifier="67890").modified_at
+        == unchanged_plan.modified_at
+    )
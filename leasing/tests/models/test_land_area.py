@@ -1,9 +1,13 @@
 from datetime import datetime
+from importlib import import_module
 
 import pytest
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.db import connection
 from django.utils.timezone import make_aware
 
-from leasing.models import LeaseArea, LeaseAreaAddress
+from leasing.models import Lease, LeaseArea, LeaseAreaAddress, PlanUnit
+from leasing.models.land_area import annotate_master, prefetch_masters
 
 
 @pytest.mark.django_db
@@ -24,6 +28,38 @@ def test_plan_unit_cannot_create_another_master_plan_unit(
         another_master_plan_unit.save()
 
 
+@pytest.mark.django_db
+def test_plan_unit_master_is_preloaded(
+    django_assert_num_queries, lease_test_data, plan_unit_factory
+):
+    lease_area = lease_test_data["lease_area"]
+    master_plan_unit = plan_unit_factory(
+        area=100, lease_area=lease_area, identifier="1234", is_master=True
+    )
+    plan_unit = plan_unit_factory(
+        area=100,
+        lease_area=lease_area,
+        identifier="1234",
+        master_timestamp=make_aware(datetime(2020, 1, 1)),
+    )
+    orphan_plan_unit = plan_unit_factory(
+        area=100, lease_area=lease_area, identifier="5678"
+    )
+
+    annotated = annotate_master(PlanUnit.objects.filter(is_master=False)).in_bulk()
+    prefetched = list(PlanUnit.objects.filter(is_master=False))
+    prefetch_masters(prefetched)
+
+    for plan_units in (annotated, {item.id: item for item in prefetched}):
+        with django_assert_num_queries(0):
+            assert plan_units[plan_unit.id].get_master_id() == master_plan_unit.id
+            assert plan_units[plan_unit.id].master_exists
+            assert plan_units[plan_unit.id].is_master_newer
+            assert plan_units[orphan_plan_unit.id].get_master_id() is None
+            assert not plan_units[orphan_plan_unit.id].master_exists
+            assert not plan_units[orphan_plan_unit.id].is_master_newer
+
+
 @pytest.mark.django_db
 def test_lease_area_ordering(
     lease_area_factory,
@@ -112,3 +148,48 @@ def test_lease_area_address_ordering(
         address7,
     ]
     assert addresses == expected_ordering
+
+
+@pytest.fixture
+def lease_area_geometry_triggers(db):
+    """Creates the lease area geometry triggers of the migration, as the test
+    database is created without migrations. They are dropped first in case the
+    migrations were run, and rolled back with the test transaction."""
+    migration = import_module("leasing.migrations.0123_lease_area_geometry")
+    with connection.cursor() as cursor:
+        cursor.execute(migration.DROP_TRIGGERS_SQL)
+        cursor.execute(migration.CREATE_TRIGGERS_SQL)
+
+
+@pytest.mark.django_db
+def test_lease_area_geometry_is_maintained(
+    lease_area_geometry_triggers, lease_factory, lease_area_factory
+):
+    lease = lease_factory()
+    first_area = lease_area_factory(
+        lease=lease,
+        geometry=MultiPolygon(Polygon(((0, 0), (0, 1), (1, 1), (1, 0), (0, 0)))),
+    )
+    second_area = lease_area_factory(
+        lease=lease,
+        geometry=MultiPolygon(Polygon(((2, 0), (2, 1), (3, 1), (3, 0), (2, 0)))),
+    )
+
+    lease.refresh_from_db()
+    assert lease.area_geometry.area == pytest.approx(2)
+
+    second_area.delete()
+    lease.refresh_from_db()
+    assert lease.area_geometry.area == pytest.approx(1)
+
+    # Saving a lease loaded before its areas changed does not overwrite the
+    # maintained geometry
+    stale_lease = Lease.objects.get(pk=lease.pk)
+    first_area.geometry = MultiPolygon(
+        Polygon(((0, 0), (0, 3), (3, 3), (3, 0), (0, 0)))
+    )
+    first_area.save()
+    stale_lease.save()
+
+    lease.refresh_from_db()
+    assert lease.area_geometry.area == pytest.approx(9)
@@ -25,6 +25,7 @@ from leasing.models import (
     Lease,
     OldDwellingsInHousingCompaniesPriceIndex,
     ReceivableType,
+    RelatedLease,
     Rent,
     RentDueDate,
 )
@@ -1792,3 +1793,39 @@ def test_lease_validate_rents(
     )
     with pytest.raises(exceptions.ValidationError):
         lease.validate_rents()
+
+
+@pytest.mark.django_db
+def test_related_lease_graph(
+    django_db_setup, django_assert_num_queries, lease_factory, related_lease_factory
+):
+    leases = [
+        lease_factory(type_id=1, municipality_id=1, district_id=district_id)
+        for district_id in range(1, 6)
+    ]
+    first_relation = related_lease_factory(from_lease=leases[0], to_lease=leases[1])
+    second_relation = related_lease_factory(from_lease=leases[1], to_lease=leases[2])
+    # A cycle back to the beginning of the chain
+    cycle_relation = related_lease_factory(from_lease=leases[2], to_lease=leases[0])
+    successor_relation = related_lease_factory(from_lease=leases[2], to_lease=leases[3])
+    # Not connected to the chain
+    related_lease_factory(from_lease=leases[4], to_lease=leases[4])
+
+    with django_assert_num_queries(1):
+        graph = RelatedLease.objects.get_graph(leases[2].id)
+
+    assert graph.get_predecessor_relations() == {
+        first_relation,
+        second_relation,
+        cycle_relation,
+    }
+    assert graph.get_immediate_successor_relations() == {
+        cycle_relation,
+        successor_relation,
+    }
+    assert graph.get_successor_relations() == {
+        first_relation,
+        second_relation,
+        cycle_relation,
+        successor_relation,
+    }
@@ -4,6 +4,7 @@ from decimal import Decimal
 
 import pytest
 
+from leasing.calculation.context import RentCalculationContext
 from leasing.enums import (
     DueDatesType,
     IndexType,
@@ -13,7 +14,7 @@ from leasing.enums import (
     RentCycle,
     RentType,
 )
-from leasing.models import Index, Rent, RentAdjustment, RentDueDate
+from leasing.models import Index, Lease, Rent, RentAdjustment, RentDueDate
 from leasing.models.utils import DayMonth
 
 
@@ -3094,3 +3095,75 @@ def test_set_start_price_index_point_figure(
 
     assert rent.start_price_index_point_figure_value == expected_point_figure.value
     assert rent.start_price_index_point_figure_year == expected_point_figure.year
+
+
+@pytest.mark.django_db
+def test_calculation_context_matches_database_calculation(
+    django_assert_num_queries,
+    lease_test_data,
+    rent_factory,
+    contract_rent_factory,
+    fixed_initial_year_rent_factory,
+    rent_adjustment_factory,
+):
+    lease = lease_test_data["lease"]
+    rent = rent_factory(
+        lease=lease,
+        type=RentType.INDEX2022,
+        cycle=RentCycle.JANUARY_TO_DECEMBER,
+        due_dates_type=DueDatesType.FIXED,
+        due_dates_per_year=1,
+    )
+    index = Index.objects.create(year=2020, month=8, number=1977)
+    Index.objects.create(year=2021, month=None, number=2017)
+    Index.objects.create(year=2022, month=None, number=2134)
+    contract_rent = contract_rent_factory(
+        rent=rent,
+        intended_use_id=1,
+        amount=Decimal(249840),
+        period=PeriodType.PER_YEAR,
+        base_amount=Decimal(249840),
+        base_amount_period=PeriodType.PER_YEAR,
+        index=index,
+    )
+    fixed_initial_year_rent_factory(
+        rent=rent,
+        intended_use=contract_rent.intended_use,
+        amount=Decimal(100000),
+        start_date=date(year=2022, month=1, day=1),
+        end_date=date(year=2022, month=6, day=30),
+    )
+    rent_adjustment_factory(
+        rent=rent,
+        intended_use=contract_rent.intended_use,
+        type=RentAdjustmentType.DISCOUNT,
+        start_date=date(year=2020, month=1, day=1),
+        end_date=date(year=2025, month=12, day=31),
+        amount_type=RentAdjustmentAmountType.PERCENT_PER_YEAR,
+        full_amount=20,
+    )
+
+    expected = [
+        lease.calculate_rent_amount_for_year(year, dry_run=True).get_total_amount()
+        for year in (2022, 2023)
+    ]
+    expected_due_dates = rent.get_due_dates_for_period(
+        date(year=2022, month=1, day=1), date(year=2022, month=12, day=31)
+    )
+
+    context = RentCalculationContext(Lease.objects.filter(id=lease.id))
+    (preloaded_lease,) = context.leases
+    with django_assert_num_queries(0):
+        assert [
+            preloaded_lease.calculate_rent_amount_for_year(
+                year, dry_run=True
+            ).get_total_amount()
+            for year in (2022, 2023)
+        ] == expected
+        # The due dates are read from the preloaded due dates and lease type
+        assert [
+            preloaded_rent.get_due_dates_for_period(
+                date(year=2022, month=1, day=1), date(year=2022, month=12, day=31)
+            )
+            for preloaded_rent in preloaded_lease.rents.all()
+        ] == [expected_due_dates]
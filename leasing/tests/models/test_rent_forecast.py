@@ -0,0 +1,130 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from leasing.enums import DueDatesType, LeaseState, PeriodType, RentCycle, RentType
+from leasing.models import Index, LeaseRentForecast
+from leasing.models import rent_forecast as rent_forecast_module
+from leasing.models.rent_forecast import (
+    calculate_lease_rent_forecasts,
+    get_index_version,
+    refresh_lease_rent_forecasts,
+)
+
+
+@pytest.fixture
+def forecast_lease(django_db_setup, lease_factory, rent_factory, contract_rent_factory):
+    lease = lease_factory(
+        type_id=1,
+        municipality_id=1,
+        district_id=1,
+        notice_period_id=1,
+        state=LeaseState.LEASE,
+        start_date=datetime.date(year=2000, month=1, day=1),
+    )
+    rent = rent_factory(
+        lease=lease,
+        type=RentType.FIXED,
+        cycle=RentCycle.JANUARY_TO_DECEMBER,
+        due_dates_type=DueDatesType.FIXED,
+        due_dates_per_year=12,
+    )
+    contract_rent_factory(
+        rent=rent,
+        intended_use_id=1,
+        amount=1000,
+        period=PeriodType.PER_YEAR,
+        base_amount=1000,
+        base_amount_period=PeriodType.PER_YEAR,
+    )
+    return lease
+
+
+@pytest.mark.django_db
+def test_refresh_lease_rent_forecasts(forecast_lease):
+    years = range(2024, 2026)
+
+    result = refresh_lease_rent_forecasts(years)
+    assert result.lease_count == 1
+    assert result.changed_count == 2
+    assert {
+        (forecast.year, forecast.amount)
+        for forecast in LeaseRentForecast.objects.filter(lease=forecast_lease)
+    } == {(2024, Decimal(1000)), (2025, Decimal(1000))}
+
+    # Nothing has changed since
+    result = refresh_lease_rent_forecasts(years)
+    assert result.lease_count == 0
+
+    # A missing year is calculated
+    result = refresh_lease_rent_forecasts(range(2024, 2027))
+    assert result.lease_count == 1
+    assert result.changed_count == 1
+
+    contract_rent = forecast_lease.rents.get().contract_rents.get()
+    contract_rent.amount = 2000
+    contract_rent.save()
+
+    result = refresh_lease_rent_forecasts(years)
+    assert result.lease_count == 1
+    assert result.changed_count == 2
+    assert LeaseRentForecast.objects.get(
+        lease=forecast_lease, year=2025
+    ).amount == Decimal(2000)
+
+
+@pytest.mark.django_db
+def test_rebuild_lease_rent_forecasts(forecast_lease):
+    years = range(2024, 2026)
+    refresh_lease_rent_forecasts(years)
+
+    result = refresh_lease_rent_forecasts(years, rebuild=True)
+    assert result.lease_count == 1
+    assert result.changed_count == 0
+
+
+@pytest.mark.django_db
+def test_refresh_lease_rent_forecasts_saved_concurrently(forecast_lease):
+    years = range(2024, 2026)
+
+    def calculate_concurrently(lease, *args):
+        # Another refresh saves the forecasts of the lease in the meantime
+        for year in years:
+            LeaseRentForecast.objects.create(
+                lease=lease,
+                year=year,
+                amount=None,
+                index_version="",
+                calculated_at=timezone.now(),
+            )
+        return calculate_lease_rent_forecasts(lease, *args)
+
+    with patch.object(
+        rent_forecast_module,
+        "calculate_lease_rent_forecasts",
+        side_effect=calculate_concurrently,
+    ):
+        result = refresh_lease_rent_forecasts(years)
+
+    assert result.lease_count == 1
+    assert {
+        (forecast.year, forecast.amount)
+        for forecast in LeaseRentForecast.objects.filter(lease=forecast_lease)
+    } == {(2024, Decimal(1000)), (2025, Decimal(1000))}
+
+
+@pytest.mark.django_db
+def test_index_version_changes_with_index_numbers():
+    index1 = Index.objects.create(year=2100, month=1, number=100)
+    index2 = Index.objects.create(year=2100, month=2, number=200)
+    index_version = get_index_version()
+
+    # The same count, latest id and the sum of the numbers
+    index1.number = 200
+    index1.save()
+    index2.number = 100
+    index2.save()
+    assert get_index_version() != index_version
@@ -73,3 +73,35 @@ def test_new_are_added_and_excess_are_removed(
     user.update_service_units()
 
     assert set(user.service_units.all()) == {service_unit2, service_unit3}
+
+
+@pytest.mark.django_db
+def test_update_service_units_is_skipped_until_groups_change(
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+    user,
+    group_factory,
+    service_unit_factory,
+    service_unit_group_mapping_factory,
+):
+    service_unit1 = service_unit_factory()
+    group1 = group_factory(name="G1")
+    service_unit2 = service_unit_factory()
+    group2 = group_factory(name="G2")
+    service_unit_group_mapping_factory(group=group1, service_unit=service_unit1)
+    service_unit_group_mapping_factory(group=group2, service_unit=service_unit2)
+    user.groups.add(group1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.update_service_units()
+    assert set(user.service_units.all()) == {service_unit1}
+
+    # Only the cached mapping version is checked
+    with django_assert_num_queries(0):
+        user.update_service_units()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(group2)
+    with django_capture_on_commit_callbacks(execute=True):
+        user.update_service_units()
+    assert set(user.service_units.all()) == {service_unit1, service_unit2}
@@ -3,16 +3,25 @@
 import datetime
 
 import pytest
+from django.utils import timezone
 
+from leasing.enums import TenantContactType
+from leasing.models import Lease
+from leasing.models.land_area import LeaseAreaAddress
 from leasing.report.lease.common_getters import (
     LEASING_CONTRACT_TYPE_NAME,
     _get_latest_contract,
+    get_address,
     get_identifier_string_from_lease_link_data,
     get_latest_contract_number,
     get_latest_contract_signing_date,
+    get_lease_area_identifier,
     get_lease_link_data,
     get_lease_link_data_from_related_object,
     get_lease_url,
+    get_tenants,
+    get_total_area,
+    prefetch_lease_report_details,
 )
 
 
@@ -337,3 +346,48 @@ def test_get_latest_contract_signing_date_returns_empty_when_signing_date_is_non
     )
     result = get_latest_contract_signing_date(lease)
     assert result == ""
+
+
+@pytest.mark.django_db
+def test_prefetch_lease_report_details(
+    django_assert_num_queries,
+    lease_factory,
+    lease_area_factory,
+    contract_factory,
+    leasing_contract_type,
+    tenant_factory,
+    tenant_contact_factory,
+    contact_factory,
+):
+    for index in range(3):
+        lease = lease_factory()
+        lease_area = lease_area_factory(lease=lease, identifier=f"A{index}", area=100)
+        lease_area_factory(
+            lease=lease, identifier=f"B{index}", area=50, archived_at=timezone.now()
+        )
+        LeaseAreaAddress.objects.create(
+            lease_area=lease_area, address=f"Katu {index}", is_primary=True
+        )
+        contract_factory(
+            lease=lease, type=leasing_contract_type, contract_number=str(index)
+        )
+        tenant = tenant_factory(lease=lease, share_numerator=1, share_denominator=1)
+        tenant_contact_factory(
+            tenant=tenant,
+            contact=contact_factory(first_name="Tenant", last_name=str(index)),
+            type=TenantContactType.TENANT,
+            start_date=datetime.date(2020, 1, 1),
+        )
+
+    leases = list(Lease.objects.order_by("id"))
+    # Lease areas, addresses, contracts, tenants and tenant contacts
+    with django_assert_num_queries(5):
+        prefetch_lease_report_details(leases)
+
+    with django_assert_num_queries(0):
+        for index, lease in enumerate(leases):
+            assert get_lease_area_identifier(lease) == f"A{index}"
+            assert get_address(lease) == f"Katu {index}"
+            assert get_total_area(lease) == 100
+            assert get_latest_contract_number(lease) == str(index)
+            assert get_tenants(lease) == f"Tenant {index}"
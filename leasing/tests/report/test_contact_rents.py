@@ -6,7 +6,7 @@ from leasing.enums import TenantContactType
 from leasing.models import Contact
 from leasing.models.tenant import TenantContact
 from leasing.models.types import TenantShares
-from leasing.report.lease.contact_rents import ContactRentsReport
+from leasing.report.lease.contact_rents import ContactRentShareResolver
 
 
 @pytest.fixture
@@ -39,6 +39,7 @@ def tenant_shares_data(tenant_contact_factory, tenant_factory, lease_factory):
     return {
         "lease": lease,
         "tenant": tenant,
+        "tenantcontact_type_billing": tenantcontact_type_billing,
         "tenantcontact_type_tenant": tenantcontact_type_tenant,
         "tenantcontact_type_contact": tenantcontact_type_contact,
         "tenant_shares": tenant_shares,
@@ -47,13 +48,14 @@ def tenant_shares_data(tenant_contact_factory, tenant_factory, lease_factory):
 
 
 @pytest.mark.django_db
-def test_get_contacts_tenant_from_tenant_shares(tenant_shares_data):
-    """Validates that the function returns the Tenant for a Contact which is of type `TENANT`,
-    from `tenant_shares` that only have Contacts of type `BILLING`, but both Contacts sharing
-    the same Tenant."""
-    tenant_shares = tenant_shares_data["tenant_shares"]
+def test_contact_rent_share_resolver(django_assert_num_queries, tenant_shares_data):
+    """Validates that the resolver returns the Tenant for a Contact which is of type
+    `TENANT` or `BILLING` of the Tenant, but not for other Contacts."""
     lease = tenant_shares_data["lease"]
     tenant = tenant_shares_data["tenant"]
+    tenantcontact_type_billing: TenantContact = tenant_shares_data[
+        "tenantcontact_type_billing"
+    ]
     tenantcontact_type_tenant: TenantContact = tenant_shares_data[
         "tenantcontact_type_tenant"
     ]
@@ -61,16 +63,19 @@ def test_get_contacts_tenant_from_tenant_shares(tenant_shares_data):
         "tenantcontact_type_contact"
     ]
     date_range = tenant_shares_data["date_range"]
-    report = ContactRentsReport()
 
-    result_tenant = report._get_tenant_from_tenant_shares(
-        tenantcontact_type_tenant.contact, lease, tenant_shares, date_range
-    )
-    assert result_tenant == tenant
+    for tenantcontact in (tenantcontact_type_billing, tenantcontact_type_tenant):
+        resolver = ContactRentShareResolver(tenantcontact.contact, [lease])
+        with django_assert_num_queries(0):
+            assert resolver.get_tenant(lease, *date_range) == tenant
+            # No tenants outside of the tenant contacts' period
+            assert (
+                resolver.get_tenant(
+                    lease, datetime.date(2026, 1, 1), datetime.date(2026, 12, 31)
+                )
+                is None
+            )
 
-    result_tenant = report._get_tenant_from_tenant_shares(
-        tenantcontact_type_contact.contact, lease, tenant_shares, date_range
-    )
+    resolver = ContactRentShareResolver(tenantcontact_type_contact.contact, [lease])
     # The TenantContact is expected to have different Tenant
-    assert result_tenant != tenantcontact_type_contact.tenant
-    assert result_tenant is None
+    assert resolver.get_tenant(lease, *date_range) is None
@@ -15,8 +15,15 @@ from django_q.queues import Queue
 from django_q.tasks import queue_size
 
 from leasing.enums import DueDatesType, InvoiceState
+from leasing.report.invoice.invoice_payments import InvoicePaymentsReport
+from leasing.report.invoice.invoices_in_period import (
+    InvoicesInPeriodReport,
+    get_receivable_types,
+)
 from leasing.report.invoice.invoicing_review import EXCLUDED_RECEIVABLE_TYPE_NAMES
 from leasing.report.invoice.laske_invoice_count_report import LaskeInvoiceCountReport
+from leasing.report.invoice.rents_paid_by_contact import RentsPaidByContactReport
+from leasing.report.lease.lease_count_report import LeaseCountReport
 from leasing.report.lease.lease_statistic_report import LeaseStatisticReport
 from leasing.report.viewset import ENABLED_REPORTS
 
@@ -234,6 +241,223 @@ def test_laske_invoice_count_report(
     }
 
 
+@pytest.mark.django_db
+def test_report_streaming_output(
+    client,
+    user,
+    invoice_factory,
+    invoice_payment_factory,
+    lease_factory,
+    contact_factory,
+):
+    _add_report_permission(user, InvoicePaymentsReport)
+    client.force_login(user)
+
+    lease = lease_factory()
+    invoice = invoice_factory(
+        lease=lease,
+        recipient=contact_factory(),
+        total_amount=100,
+        billed_amount=100,
+        number=1234,
+    )
+    invoice_payment_factory(
+        invoice=invoice, paid_amount=100, paid_date="2024-06-13", filing_code="A1"
+    )
+    invoice_payment_factory(
+        invoice=invoice, paid_amount=50, paid_date="2024-06-14", filing_code="A2"
+    )
+
+    url = reverse(
+        "v1:report-detail", kwargs={"report_type": InvoicePaymentsReport.slug}
+    )
+    query_params = {"start_date": "2024-06-01", "end_date": "2024-06-30"}
+
+    response = client.get(url, data={**query_params, "format": "csv"})
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert "attachment" in response["Content-Disposition"]
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert (
+        lines[0] == "invoice_number,lease_identifier,paid_date,paid_amount,filing_code"
+    )
+    assert len(lines) == 3
+    assert lines[1].startswith("1234,")
+    assert lines[1].endswith(",2024-06-13,100.00,A1")
+
+    response = client.get(url, data={**query_params, "format": "jsonl"})
+    assert response.status_code == 200
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).decode().splitlines()
+    ]
+    assert [row["filing_code"] for row in rows] == ["A1", "A2"]
+    assert rows[0]["lease_identifier"]["name"] == lease.get_identifier_string()
+
+    # Invalid input is returned as JSON before streaming
+    response = client.get(url, data={"format": "csv"})
+    assert response.status_code == 400
+    assert response["Content-Type"] == "application/json"
+
+
+@pytest.mark.django_db
+def test_report_cache(settings, tmp_path, client, user, lease_factory):
+    settings.FLAG_REPORT_CACHE = True
+    settings.PRIVATE_FILES_LOCATION = str(tmp_path)
+    _add_report_permission(user, LeaseCountReport)
+    client.force_login(user)
+
+    lease = lease_factory()
+    url = reverse("v1:report-detail", kwargs={"report_type": LeaseCountReport.slug})
+
+    with patch.object(
+        LeaseCountReport,
+        "get_response",
+        autospec=True,
+        side_effect=LeaseCountReport.get_response,
+    ) as get_response:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert [row["count"] for row in response.json()] == [1]
+        assert get_response.call_count == 1
+
+        # Served from the cache
+        response = client.get(url)
+        assert [row["count"] for row in response.json()] == [1]
+        assert get_response.call_count == 1
+
+        # The inputs and the output format are a part of the cache key
+        response = client.get(url, data={"service_unit": lease.service_unit_id})
+        assert get_response.call_count == 2
+        response = client.get(url, data={"format": "xlsx"})
+        assert response.status_code == 200
+        assert get_response.call_count == 3
+
+        # A change in the source data invalidates the cached response
+        lease_factory(type=lease.type)
+        response = client.get(url)
+        assert [row["count"] for row in response.json()] == [2]
+        assert get_response.call_count == 4
+
+        # The rows of the lookup models without a modification time are
+        # compared instead
+        lease.type.name = "Changed name"
+        lease.type.save()
+        response = client.get(url)
+        assert [row["description"] for row in response.json()] == ["Changed name"]
+        assert get_response.call_count == 5
+
+
+@pytest.mark.django_db
+def test_invoices_in_period_report_receivable_types(
+    invoice_factory, invoice_row_factory, receivable_type_factory, lease_factory
+):
+    lease = lease_factory()
+    rent = receivable_type_factory(name="Maanvuokraus")
+    interest = receivable_type_factory(name="Korko")
+    invoice = invoice_factory(
+        lease=lease, total_amount=200, billed_amount=200, due_date="2024-06-15"
+    )
+    for receivable_type in [rent, rent, interest]:
+        invoice_row_factory(
+            invoice=invoice, receivable_type=receivable_type, amount=100
+        )
+    # An invoice without rows
+    empty_invoice = invoice_factory(
+        lease=lease, total_amount=0, billed_amount=0, due_date="2024-06-20"
+    )
+
+    invoices = InvoicesInPeriodReport().get_data(
+        {
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "service_unit": None,
+            "invoice_state": None,
+            "lease_type": None,
+        }
+    )
+    assert {invoice.id: get_receivable_types(invoice) for invoice in invoices} == {
+        invoice.id: "Korko, Maanvuokraus",
+        empty_invoice.id: "",
+    }
+
+
+@pytest.mark.django_db
+def test_rents_paid_by_contact_report(
+    client,
+    user,
+    invoice_factory,
+    invoice_row_factory,
+    receivable_type_factory,
+    lease_factory,
+    contact_factory,
+):
+    _add_report_permission(user, RentsPaidByContactReport)
+    client.force_login(user)
+
+    lease = lease_factory()
+    contact = contact_factory(first_name="Maija", last_name="Meikäläinen")
+    rent = receivable_type_factory(name="Maanvuokraus")
+    interest = receivable_type_factory(name="Korko")
+    invoice = invoice_factory(
+        lease=lease,
+        recipient=contact,
+        total_amount=300,
+        billed_amount=300,
+        outstanding_amount=100,
+        invoicing_date="2024-06-01",
+        due_date="2024-06-15",
+        number=1,
+    )
+    for receivable_type in [rent, rent, interest]:
+        invoice_row_factory(
+            invoice=invoice, receivable_type=receivable_type, amount=100
+        )
+    invoice_row_factory(invoice=invoice, receivable_type=rent, amount=100).delete()
+    invoice_factory(
+        lease=lease,
+        recipient=contact,
+        total_amount=100,
+        billed_amount=100,
+        outstanding_amount=0,
+        invoicing_date="2024-05-01",
+        due_date="2024-05-15",
+        number=2,
+    )
+    # Not in the period
+    invoice_factory(
+        lease=lease,
+        recipient=contact,
+        total_amount=100,
+        billed_amount=100,
+        invoicing_date="2023-06-01",
+        due_date="2023-06-15",
+        number=3,
+    )
+
+    url = reverse(
+        "v1:report-detail", kwargs={"report_type": RentsPaidByContactReport.slug}
+    )
+    response = client.get(
+        url,
+        data={
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "contact_id": contact.id,
+        },
+    )
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert [row["invoice_number"] for row in rows] == [1, 2]
+    assert rows[0]["name"] == "Maija Meikäläinen"
+    assert rows[0]["n_rows"] == 3
+    assert rows[0]["receivable_type"] == "Korko, Maanvuokraus"
+    assert rows[1]["n_rows"] == 0
+    assert rows[1]["receivable_type"] == ""
+
+
 def test_excluded_receivable_type_ids():
     """
     Tests that the excluded_receivable_type_ids are found in the fixture data.
@@ -0,0 +1,95 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from auditlog.models import LogEntry
+from django.db.models.signals import post_save
+
+from leasing.models import Inspection
+from leasing.serializers.inspection import InspectionSerializer
+from leasing.serializers.utils import (
+    can_bulk_save,
+    has_save_receivers,
+    instance_create_or_update_related,
+    instance_data_differs,
+)
+
+
+@pytest.mark.django_db
+def test_instance_data_differs(lease_test_data, inspection_factory):
+    lease = lease_test_data["lease"]
+    inspection = inspection_factory(
+        lease=lease, inspector="Inspector", supervision_date=datetime.date(2024, 1, 1)
+    )
+
+    assert not instance_data_differs(
+        inspection,
+        {
+            "lease": lease,
+            "inspector": "Inspector",
+            "supervision_date": datetime.date(2024, 1, 1),
+        },
+    )
+    assert instance_data_differs(inspection, {"inspector": "Someone else"})
+    assert instance_data_differs(inspection, {"attachments": []})
+
+
+@pytest.mark.django_db
+def test_instance_create_or_update_related_in_bulk(
+    django_assert_max_num_queries, lease_test_data, inspection_factory, user_factory
+):
+    lease = lease_test_data["lease"]
+    unchanged, changed, removed = [
+        inspection_factory(lease=lease, inspector=inspector)
+        for inspector in ("Unchanged", "Changed", "Removed")
+    ]
+    request = MagicMock()
+    request.user = user_factory(is_superuser=True)
+
+    validated_data = [
+        {"id": unchanged.id, "inspector": "Unchanged"},
+        {"id": changed.id, "inspector": "Changed again"},
+        {"inspector": "New"},
+        {"inspector": "Another new"},
+    ]
+    # The items, and their audit log entries, are fetched, created and
+    # updated with one query each
+    with django_assert_max_num_queries(15):
+        instance_create_or_update_related(
+            instance=lease,
+            related_name="inspections",
+            serializer_class=InspectionSerializer,
+            validated_data=validated_data,
+            context={"request": request},
+        )
+
+    assert sorted(lease.inspections.values_list("inspector", flat=True)) == [
+        "Another new",
+        "Changed again",
+        "New",
+        "Unchanged",
+    ]
+    assert not Inspection.objects.filter(id=removed.id).exists()
+    assert LogEntry.objects.get_for_object(changed).filter(
+        action=LogEntry.Action.UPDATE
+    )
+
+
+@pytest.mark.django_db
+def test_can_bulk_save_with_save_receivers(lease_test_data):
+    serializer = InspectionSerializer(data={"inspector": "Inspector"})
+    serializer.is_valid(raise_exception=True)
+
+    # The audit log receivers are replaced by the bulk log entries
+    assert not has_save_receivers(Inspection)
+    assert can_bulk_save(serializer, Inspection)
+
+    def receiver(sender, instance, **kwargs):
+        pass
+
+    post_save.connect(receiver, sender=Inspection)
+    try:
+        assert has_save_receivers(Inspection)
+        assert not can_bulk_save(serializer, Inspection)
+    finally:
+        post_save.disconnect(receiver, sender=Inspection)
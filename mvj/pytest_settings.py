@@ -0,0 +1,4 @@
+from mvj.settings import *  # noqa: F401, F403
+
+# The listener thread would keep a connection to the test database open
+CACHE_VERSION_LISTENER_ENABLED = False
@@ -49,6 +49,7 @@ env = environ.Env(
     DATABASE_URL=(str, "postgis:///mvj"),
     DATABASE_PASSWORD=(str, ""),
     CACHE_URL=(str, "locmemcache://"),
+    CACHE_VERSION_LISTENER_ENABLED=(bool, True),
     SENTRY_DSN=(str, ""),
     SENTRY_ENVIRONMENT=(str, ""),
     EMAIL_BACKEND=(str, "anymail.backends.mailgun.EmailBackend"),
@@ -130,6 +131,8 @@ env = environ.Env(
     GDPR_API_USER_PROVIDER=(str, "gdpr.utils.get_user"),
     GDPR_API_DELETER=(str, "gdpr.utils.delete_user_data"),
     FILE_SCAN_SERVICE_URL=(str, ""),
+    FILE_SCAN_BATCH_SIZE=(int, 50),
+    FILE_SCAN_MAX_CONCURRENCY=(int, 4),
     PRIVATE_FILES_LOCATION=(str, ""),
     MEDIA_ROOT=(str, ""),
     STATIC_ROOT=(str, ""),
@@ -137,6 +140,9 @@ env = environ.Env(
     FLAG_PLOTSEARCH=(bool, False),
     FLAG_SANCTIONS_INQUIRY=(bool, False),
     FLAG_SKIP_FILE_UPLOAD_PERMISSIONS=(bool, False),
+    FLAG_PDF_CACHE=(bool, False),
+    FLAG_REPORT_CACHE=(bool, False),
+    PDF_RENDER_MAX_WORKERS=(int, 1),
     ENABLE_AUDITLOG_ELASTICSEARCH_SYNC=(bool, False),
     AUDIT_LOG_ENV=(str, ""),
     AUDIT_LOG_ES_URL=(str, ""),
@@ -166,6 +172,9 @@ if env("DATABASE_PASSWORD"):
 
 CACHES = {"default": env.cache()}
 
+# Listen to the cache version changes of the other processes, see utils.cache
+CACHE_VERSION_LISTENER_ENABLED = env.bool("CACHE_VERSION_LISTENER_ENABLED")
+
 if env("SENTRY_DSN"):
     sentry_sdk.init(
         dsn=env("SENTRY_DSN"),
@@ -269,6 +278,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 MODELTRANSLATION_TRANSLATION_FILES = ("forms.translation",)
 
+# The permissions are cached across requests, see users.permissions
+AUTHENTICATION_BACKENDS = ["users.permissions.CachedPermissionsModelBackend"]
+
 REST_FRAMEWORK = {
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.NamespaceVersioning",
     "ALLOWED_VERSIONS": ("v1", "export_v1"),
@@ -484,6 +496,13 @@ ASIAKASTIETO_SANCTIONS_KEY = env.str("ASIAKASTIETO_SANCTIONS_KEY")
 PUBLIC_UI_URL = env.str("PUBLIC_UI_URL")
 
 FILE_SCAN_SERVICE_URL = env.str("FILE_SCAN_SERVICE_URL")
+# Pending files are scanned in batches of this size, and this many at a time
+FILE_SCAN_BATCH_SIZE = env.int("FILE_SCAN_BATCH_SIZE")
+FILE_SCAN_MAX_CONCURRENCY = env.int("FILE_SCAN_MAX_CONCURRENCY")
+
+# Number of worker processes used to render batches of PDFs in parallel in the
+# background tasks. The requests always render the PDFs in their own process.
+PDF_RENDER_MAX_WORKERS = env.int("PDF_RENDER_MAX_WORKERS")
 
 # Feature flags
 FLAG_FILE_SCAN = env.bool("FLAG_FILE_SCAN")
@@ -492,6 +511,11 @@ FLAG_SANCTIONS_INQUIRY = env.bool("FLAG_SANCTIONS_INQUIRY")
 FLAG_SKIP_FILE_UPLOAD_PERMISSIONS = env.bool(
     "FLAG_SKIP_FILE_UPLOAD_PERMISSIONS", default=False
 )
+# Store rendered application PDFs in private file storage and reuse them
+FLAG_PDF_CACHE = env.bool("FLAG_PDF_CACHE")
+# Store report responses in private file storage and reuse them until the
+# report data changes
+FLAG_REPORT_CACHE = env.bool("FLAG_REPORT_CACHE")
 
 if FLAG_SKIP_FILE_UPLOAD_PERMISSIONS:
     # Use operating-system dependent behavior
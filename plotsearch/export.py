@@ -0,0 +1,341 @@
+import re
+from dataclasses import dataclass
+from enum import Enum
+from itertools import groupby
+from operator import itemgetter
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import xlsxwriter
+from django.db.models import Prefetch
+
+from forms.models import Choice, Entry, Field, Section
+from forms.utils import _get_plot_search_target_attributes
+from plotsearch.enums import InformationCheckName
+from plotsearch.models import (
+    InformationCheck,
+    PlotSearch,
+    PlotSearchTarget,
+    TargetStatus,
+)
+from plotsearch.models.plot_search import ProposedFinancingManagement
+
+ENTRY_CHUNK_SIZE = 2000
+TARGET_STATUS_CHUNK_SIZE = 500
+
+APPLICANT_SECTION_IDENTIFIER = "hakijan-tiedot"
+
+TARGET_STATUS_HEADERS = [
+    "Share of rental",
+    "Reserved",
+    "Added target to applicant",
+    "Counsel date",
+    "Decline reason",
+    "Reservation conditions",
+    "Proposed management",
+    "Arguments",
+]
+
+# Characters Excel does not allow in worksheet names
+INVALID_SHEET_NAME_CHARACTERS = re.compile(r"[\[\]:*?/\\]")
+MAX_SHEET_NAME_LENGTH = 31
+
+
+@dataclass
+class TargetSheet:
+    worksheet: Any
+    next_row: int
+    # Values repeated on the first row of every application of the target
+    target_values: list
+
+
+@dataclass(frozen=True)
+class FormColumn:
+    header: str
+    field_id: Optional[int] = None
+    field_type: Optional[str] = None
+    information_check_name: Optional[InformationCheckName] = None
+
+
+def get_form_columns(form) -> List[FormColumn]:
+    """Flattens the form's section tree into the ordered list of answer columns.
+
+    Sections and fields are fetched with one query each regardless of the
+    nesting depth. Information check columns follow the fields of the last
+    applicant section, as in `forms.utils.get_answer_worksheet`."""
+    sections = list(
+        Section.objects.filter(form=form)
+        .select_related("parent")
+        .order_by("sort_order", "id")
+    )
+    fields_by_section: Dict[int, List[Field]] = {}
+    for field in Field.objects.filter(section__form=form).order_by("sort_order", "id"):
+        fields_by_section.setdefault(field.section_id, []).append(field)
+
+    subsections: Dict[Optional[int], List[Section]] = {}
+    for section in sections:
+        subsections.setdefault(section.parent_id, []).append(section)
+
+    applicant_sections = [
+        section
+        for section in sections
+        if section.parent is not None
+        and section.parent.identifier == APPLICANT_SECTION_IDENTIFIER
+    ]
+    last_applicant_section = applicant_sections[-1] if applicant_sections else None
+
+    columns: List[FormColumn] = []
+
+    def add_section_columns(section):
+        for field in fields_by_section.get(section.id, []):
+            columns.append(
+                FormColumn(
+                    header="{} - {}".format(section.title, field.label),
+                    field_id=field.id,
+                    field_type=field.type,
+                )
+            )
+        if section == last_applicant_section:
+            for name in InformationCheckName:
+                columns.append(
+                    FormColumn(header=str(name.label), information_check_name=name)
+                )
+        for subsection in subsections.get(section.id, []):
+            add_section_columns(subsection)
+
+    for root_section in subsections.get(None, []):
+        add_section_columns(root_section)
+
+    return columns
+
+
+def get_sheet_name(index: int, plot_search_target: PlotSearchTarget) -> str:
+    name = "{} {}".format(index, plot_search_target.identifier()).strip()
+    return INVALID_SHEET_NAME_CHARACTERS.sub("-", name)[:MAX_SHEET_NAME_LENGTH]
+
+
+def _group_by_answer(rows: Iterable[tuple]) -> Iterator[Tuple[int, List[tuple]]]:
+    for answer_id, group in groupby(rows, key=itemgetter(0)):
+        yield answer_id, list(group)
+
+
+class AnswerRowCursor:
+    """Walks rows ordered by answer id alongside another answer-ordered iterator.
+
+    Only the rows of the current answer are kept in memory."""
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._groups = _group_by_answer(rows)
+        self._current = next(self._groups, None)
+
+    def pop(self, answer_id: int) -> List[tuple]:
+        while self._current is not None and self._current[0] < answer_id:
+            self._current = next(self._groups, None)
+        if self._current is None or self._current[0] != answer_id:
+            return []
+        rows = self._current[1]
+        self._current = next(self._groups, None)
+        return rows
+
+
+def _format_entry_value(column: FormColumn, value: str, choice_values) -> str:
+    if column.field_type != "checkbox":
+        return value
+    try:
+        choice_ids = [int(choice) for choice in value.strip("][").split(", ")]
+    except ValueError:
+        return ""
+    return str(
+        [
+            choice_values[choice_id]
+            for choice_id in choice_ids
+            if choice_id in choice_values
+        ]
+    )
+
+
+def _get_target_status_values(target_status: TargetStatus) -> list:
+    return [
+        "{} / {}".format(
+            target_status.share_of_rental_indicator,
+            target_status.share_of_rental_denominator,
+        ),
+        target_status.reserved,
+        target_status.added_target_to_applicant,
+        str(target_status.counsel_date),
+        target_status.decline_reason,
+        ", ".join(target_status.reservation_conditions or []),
+        ", ".join(
+            [
+                "{} {} {}".format(
+                    management.proposed_financing.name,
+                    management.proposed_management.name,
+                    management.hitas.name,
+                )
+                for management in target_status.proposed_managements.all()
+            ]
+        ),
+        target_status.arguments,
+    ]
+
+
+def _get_answer_rows(
+    columns: List[FormColumn], entries: List[tuple], information_checks, choice_values
+) -> List[list]:
+    """Lays out one answer's entries so that each entry of a field gets its own
+    row, i.e. the n:th applicant of the answer is on the n:th row."""
+    values_by_field: Dict[int, List[str]] = {}
+    for _answer_id, field_id, value in entries:
+        values_by_field.setdefault(field_id, []).append(value)
+
+    row_count = max([len(values) for values in values_by_field.values()] + [1])
+    rows: List[list] = [[] for _ in range(row_count)]
+
+    for column in columns:
+        if column.information_check_name is not None:
+            for index, row in enumerate(rows):
+                row.append(
+                    information_checks.get(
+                        (
+                            "{}[{}]".format(APPLICANT_SECTION_IDENTIFIER, index),
+                            column.information_check_name,
+                        ),
+                        "",
+                    )
+                )
+            continue
+
+        values = values_by_field.get(column.field_id, [])
+        for index, row in enumerate(rows):
+            row.append(
+                _format_entry_value(column, values[index], choice_values)
+                if index < len(values)
+                else ""
+            )
+
+    return rows
+
+
+def _write_row(worksheet, row: int, values: list):
+    for col, value in enumerate(values):
+        if value is None:
+            continue
+        worksheet.write(row, col, value.value if isinstance(value, Enum) else value)
+
+
+def write_plot_search_answers_xlsx(plot_search: PlotSearch, output: IO[bytes]) -> None:
+    """Writes the applications of the plot search into `output` as xlsx.
+
+    Every plot search target gets a worksheet of its own. The workbook is
+    written in xlsxwriter's `constant_memory` mode, so rows are flushed to disk
+    as soon as they are complete. Entries and information checks are read with
+    chunked queries ordered by answer, and only the rows of one answer are held
+    in memory at a time."""
+    form = plot_search.form
+    columns = get_form_columns(form)
+    choice_values = dict(
+        Choice.objects.filter(
+            field__section__form=form, field__type="checkbox"
+        ).values_list("id", "value")
+    )
+
+    plot_search_fields = [
+        ("Name", plot_search.name),
+        ("Type", plot_search.subtype.plot_search_type.name),
+        ("Subtype", plot_search.subtype.name),
+        ("Begin at", plot_search.begin_at.isoformat("T")),
+        ("End at", plot_search.end_at.isoformat("T")),
+        ("Search class", plot_search.search_class),
+        ("Stage", plot_search.stage.name),
+    ]
+
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+
+    sheets: Dict[int, TargetSheet] = {}
+    plot_search_targets = plot_search.plot_search_targets.select_related(
+        "plan_unit__plot_division_state",
+        "plan_unit__plan_unit_type",
+        "plan_unit__plan_unit_state",
+        "plan_unit__plan_unit_intended_use",
+        "plan_unit__plan_unit_status",
+        "custom_detailed_plan__lease_area",
+        "custom_detailed_plan__type",
+        "custom_detailed_plan__state",
+        "custom_detailed_plan__intended_use",
+        "reservation_identifier__identifier",
+    ).order_by("id")
+    for index, plot_search_target in enumerate(plot_search_targets, start=1):
+        worksheet = workbook.add_worksheet(get_sheet_name(index, plot_search_target))
+        target_fields = plot_search_fields + (
+            _get_plot_search_target_attributes(plot_search_target) or []
+        )
+        _write_row(
+            worksheet,
+            0,
+            [header for header, _value in target_fields]
+            + ["Target type"]
+            + [column.header for column in columns]
+            + TARGET_STATUS_HEADERS,
+        )
+        sheets[plot_search_target.id] = TargetSheet(
+            worksheet=worksheet,
+            next_row=1,
+            target_values=[value for _header, value in target_fields]
+            + [plot_search_target.target_type.name],
+        )
+
+    target_statuses = (
+        TargetStatus.objects.filter(plot_search_target__plot_search=plot_search)
+        .prefetch_related(
+            Prefetch(
+                "proposed_managements",
+                queryset=ProposedFinancingManagement.objects.select_related(
+                    "proposed_financing", "proposed_management", "hitas"
+                ),
+            )
+        )
+        .order_by("answer_id", "plot_search_target_id")
+    )
+    answer_ids = target_statuses.values("answer_id")
+
+    entries = AnswerRowCursor(
+        Entry.objects.filter(entry_section__answer_id__in=answer_ids)
+        .order_by("entry_section__answer_id", "field_id", "id")
+        .values_list("entry_section__answer_id", "field_id", "value")
+        .iterator(chunk_size=ENTRY_CHUNK_SIZE)
+    )
+    information_checks = AnswerRowCursor(
+        InformationCheck.objects.filter(entry_section__answer_id__in=answer_ids)
+        .order_by("entry_section__answer_id", "id")
+        .values_list(
+            "entry_section__answer_id", "entry_section__identifier", "name", "state"
+        )
+        .iterator(chunk_size=ENTRY_CHUNK_SIZE)
+    )
+
+    for answer_id, answer_target_statuses in groupby(
+        target_statuses.iterator(chunk_size=TARGET_STATUS_CHUNK_SIZE),
+        key=lambda target_status: target_status.answer_id,
+    ):
+        answer_rows = _get_answer_rows(
+            columns,
+            entries.pop(answer_id),
+            {
+                (identifier, name): state
+                for _answer_id, identifier, name, state in information_checks.pop(
+                    answer_id
+                )
+            },
+            choice_values,
+        )
+        for target_status in answer_target_statuses:
+            sheet = sheets[target_status.plot_search_target_id]
+            target_status_values = _get_target_status_values(target_status)
+            for index, answer_row in enumerate(answer_rows):
+                if index == 0:
+                    values = sheet.target_values + answer_row + target_status_values
+                else:
+                    values = [None] * len(sheet.target_values) + answer_row
+                _write_row(sheet.worksheet, sheet.next_row, values)
+                sheet.next_row += 1
+
+    workbook.close()
@@ -0,0 +1,119 @@
+import logging
+from functools import lru_cache
+
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from pyproj import Transformer
+
+from integrations.http import get_session
+from plotsearch.models import GazetteerAddress, GazetteerDistrict
+from plotsearch.models.gazetteer import GAZETTEER_SRID
+
+logger = logging.getLogger(__name__)
+
+KARTTA_HEL_WFS_URL = "https://kartta.hel.fi/ws/geoserver/avoindata/wfs"
+KARTTA_HEL_WFS_TIMEOUT = 10  # seconds
+
+
+@lru_cache(maxsize=1)
+def get_transformer() -> Transformer:
+    # EPSG:4326 WGS84 - World Geodetic System 1984, used in GPS
+    # EPSG:3879 GK25FIN - Helsinki local coordinate system
+    return Transformer.from_crs("EPSG:4326", f"EPSG:{GAZETTEER_SRID}", always_xy=True)
+
+
+def transform_to_gazetteer_srid(geometry) -> MultiPolygon:
+    """Transforms an area search multipolygon from WGS84 coordinates to the
+    coordinate system of the gazetteer."""
+    transformer = get_transformer()
+    polygons = []
+    for polygon_coords in geometry.coords:
+        # EPSG:4326 uses longitude, latitude
+        # EPSG:3879 uses easting, northing
+        rings = [
+            [transformer.transform(lon, lat) for lon, lat in ring]
+            for ring in polygon_coords
+        ]
+        polygons.append(Polygon(*rings))
+
+    return MultiPolygon(*polygons, srid=GAZETTEER_SRID)
+
+
+def resolve_address_and_district(geometry) -> tuple[str | None, str | None]:
+    """
+    Resolves the address and the district of an area from the local gazetteer.
+
+    The address is the address point inside the area that is closest to its
+    centroid, and the district is the district of that address. If there are
+    no address points inside the area, only the district that the area
+    intersects is returned.
+    """
+    if not GazetteerDistrict.objects.exists():
+        # The gazetteer has not been loaded with the `load_gazetteer`
+        # management command
+        return get_address_and_district_from_wfs(geometry)
+
+    area = transform_to_gazetteer_srid(geometry)
+
+    address = (
+        GazetteerAddress.objects.filter(location__intersects=area)
+        .annotate(distance=Distance("location", area.centroid))
+        .order_by("distance", "id")
+        .values_list("street_address", "district_name")
+        .first()
+    )
+    if address is not None:
+        return address
+
+    district = (
+        GazetteerDistrict.objects.filter(geometry__intersects=area)
+        .order_by("id")
+        .values_list("name", flat=True)
+        .first()
+    )
+    return (None, district)
+
+
+def get_address_and_district_from_wfs(geometry) -> tuple[str | None, str | None]:
+    """
+    Fetches address and district data from the WFS service of kartta.hel.fi
+    Returns tuple with address as first element and district as second
+    """
+    multipolygon = transform_to_gazetteer_srid(geometry)
+
+    # Swap order of coordinates for WFS, as it expects coordinates in (y,x) or (lat,lon) or (northing,easting)
+    multipolygon_str = ",".join(
+        [f"{northing} {easting}" for easting, northing in multipolygon[0][0].coords]
+    )
+
+    params = {
+        "service": "wfs",
+        "version": "2.0.0",
+        "request": "getFeature",
+        "typeName": "avoindata:Osoiteluettelo_piste_rekisteritiedot",
+        "srsName": "EPSG:4326",
+        "outputFormat": "application/json",
+        "cql_filter": f"intersects(geom,MULTIPOLYGON((({multipolygon_str}))))",
+    }
+    session = get_session("kartta_hel", timeout=KARTTA_HEL_WFS_TIMEOUT)
+    response = session.get(KARTTA_HEL_WFS_URL, params=params)
+
+    results = response.json()
+    if results["numberReturned"] == 0:
+        params.update({"typeName": "avoindata:Kaupunginosajako"})
+
+        response = session.get(KARTTA_HEL_WFS_URL, params=params)
+
+        results = response.json()
+
+    if not results["features"]:
+        logger.warning("No address or district found from kartta.hel.fi")
+        return (None, None)
+
+    properties = results["features"][0]["properties"]
+    address = properties.get("katuosoite", None)
+    district = properties.get("kaupunginosa_nimi_fi", None)
+
+    if district is None:
+        district = properties.get("nimi_fi", None)
+    return (address, district)
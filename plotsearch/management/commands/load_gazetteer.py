@@ -0,0 +1,80 @@
+import json
+
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from plotsearch.models import GazetteerAddress, GazetteerDistrict
+from plotsearch.models.gazetteer import GAZETTEER_SRID
+
+BATCH_SIZE = 5000
+
+
+def read_features(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["features"]
+
+
+def get_geometry(feature, srid):
+    geometry = GEOSGeometry(json.dumps(feature["geometry"]), srid=srid)
+    if srid != GAZETTEER_SRID:
+        geometry.transform(GAZETTEER_SRID)
+    return geometry
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the local address and district gazetteer from GeoJSON dumps of "
+        "the kartta.hel.fi datasets avoindata:Osoiteluettelo_piste_rekisteritiedot "
+        "and avoindata:Kaupunginosajako"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("addresses", type=str, help="Address points GeoJSON")
+        parser.add_argument("districts", type=str, help="District division GeoJSON")
+        parser.add_argument(
+            "--srid",
+            type=int,
+            default=GAZETTEER_SRID,
+            help="SRID of the coordinates in the files (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        srid = options["srid"]
+
+        addresses = []
+        for feature in read_features(options["addresses"]):
+            properties = feature["properties"]
+            location = get_geometry(feature, srid)
+            if location.geom_type == "MultiPoint":
+                location = location[0]
+            addresses.append(
+                GazetteerAddress(
+                    street_address=properties["katuosoite"],
+                    district_name=properties.get("kaupunginosa_nimi_fi"),
+                    location=location,
+                )
+            )
+
+        districts = []
+        for feature in read_features(options["districts"]):
+            geometry = get_geometry(feature, srid)
+            if geometry.geom_type == "Polygon":
+                geometry = MultiPolygon(geometry, srid=geometry.srid)
+            districts.append(
+                GazetteerDistrict(
+                    name=feature["properties"]["nimi_fi"], geometry=geometry
+                )
+            )
+
+        with transaction.atomic():
+            GazetteerAddress.objects.all().delete()
+            GazetteerDistrict.objects.all().delete()
+            GazetteerAddress.objects.bulk_create(addresses, batch_size=BATCH_SIZE)
+            GazetteerDistrict.objects.bulk_create(districts, batch_size=BATCH_SIZE)
+
+        self.stdout.write(
+            "Gazetteer: {} addresses, {} districts loaded".format(
+                len(addresses), len(districts)
+            )
+        )
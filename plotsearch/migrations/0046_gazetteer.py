@@ -0,0 +1,63 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Adds the tables of the local address and district gazetteer."""
+
+    dependencies = [
+        ("plotsearch", "0045_areasearchstatus_translations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GazetteerAddress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("street_address", models.CharField(max_length=255)),
+                (
+                    "district_name",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "location",
+                    django.contrib.gis.db.models.fields.PointField(srid=3879),
+                ),
+            ],
+            options={
+                "verbose_name": "Gazetteer address",
+                "verbose_name_plural": "Gazetteer addresses",
+            },
+        ),
+        migrations.CreateModel(
+            name="GazetteerDistrict",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "geometry",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(srid=3879),
+                ),
+            ],
+            options={
+                "verbose_name": "Gazetteer district",
+                "verbose_name_plural": "Gazetteer districts",
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
+from .gazetteer import GazetteerAddress, GazetteerDistrict
 from .info_links import TargetInfoLink
 from .plot_search import (
     FAQ,
@@ -22,6 +23,8 @@ __all__ = [
     "AreaSearch",
     "Favourite",
     "FavouriteTarget",
+    "GazetteerAddress",
+    "GazetteerDistrict",
     "InformationCheck",
     "AreaSearchAttachment",
     "AreaSearchIntendedUse",
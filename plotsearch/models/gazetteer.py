@@ -0,0 +1,49 @@
+from django.contrib.gis.db import models
+from django.utils.translation import pgettext_lazy
+
+# EPSG:3879 GK25FIN - Helsinki local coordinate system, used in the
+# kartta.hel.fi datasets that the gazetteer is loaded from
+GAZETTEER_SRID = 3879
+
+
+class GazetteerAddress(models.Model):
+    """
+    An address point of the local gazetteer. Loaded with the
+    `load_gazetteer` management command from the kartta.hel.fi address
+    register (avoindata:Osoiteluettelo_piste_rekisteritiedot).
+    """
+
+    # In Finnish: Katuosoite
+    street_address = models.CharField(max_length=255)
+
+    # In Finnish: Kaupunginosa
+    district_name = models.CharField(max_length=255, null=True, blank=True)
+
+    location = models.PointField(srid=GAZETTEER_SRID)
+
+    class Meta:
+        verbose_name = pgettext_lazy("Model name", "Gazetteer address")
+        verbose_name_plural = pgettext_lazy("Model name", "Gazetteer addresses")
+
+    def __str__(self):
+        return self.street_address
+
+
+class GazetteerDistrict(models.Model):
+    """
+    A district polygon of the local gazetteer. Loaded with the
+    `load_gazetteer` management command from the kartta.hel.fi district
+    division (avoindata:Kaupunginosajako).
+    """
+
+    # In Finnish: Nimi
+    name = models.CharField(max_length=255)
+
+    geometry = models.MultiPolygonField(srid=GAZETTEER_SRID)
+
+    class Meta:
+        verbose_name = pgettext_lazy("Model name", "Gazetteer district")
+        verbose_name_plural = pgettext_lazy("Model name", "Gazetteer districts")
+
+    def __str__(self):
+        return self.name
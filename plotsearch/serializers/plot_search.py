@@ -1,11 +1,9 @@
-import requests
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import BadRequest, ObjectDoesNotExist
 from django.core.mail import send_mail
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from enumfields.drf import EnumSupportSerializerMixin
-from pyproj import Transformer
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework_gis.fields import GeometryField
@@ -34,6 +32,7 @@ from leasing.serializers.utils import (
     UpdateNestedMixin,
 )
 from plotsearch.enums import AreaSearchState, RelatedPlotApplicationContentType
+from plotsearch.gazetteer import resolve_address_and_district
 from plotsearch.models import (
     AreaSearch,
     AreaSearchIntendedUse,
@@ -289,10 +288,7 @@ class PlotSearchTargetSerializer(
     def get_master_plan_unit_id(self, obj):
         if obj.plan_unit is None:
             return None
-        master = obj.plan_unit.get_master()
-        if master:
-            return master.id
-        return None
+        return obj.plan_unit.get_master_id()
 
     def get_is_master_plan_unit_deleted(self, obj):
         if obj.custom_detailed_plan is not None:
@@ -1047,53 +1043,11 @@ class AreaSearchSerializer(EnumSupportSerializerMixin, serializers.ModelSerializ
     @staticmethod
     def get_address_and_district_from_kartta_hel(geometry):
         """
-        Fetches address and district data from kartta.hel.fi
+        Resolves address and district data of the geometry from the local
+        gazetteer, which is loaded from the kartta.hel.fi datasets.
         Returns tuple with address as first element and district as second
         """
-        # EPSG:4326 WGS84 - World Geodetic System 1984, used in GPS
-        # EPSG:3879 GK25FIN - Helsinki local coordinate system
-        transformer = Transformer.from_crs("EPSG:4326", "EPSG:3879", always_xy=True)
-        multipolygon = list()
-
-        for lon, lat in geometry.coords[0][0]:
-            # EPSG:4326 uses longitude, latitude
-            # EPSG:3879 uses easting, northing
-            easting, northing = transformer.transform(lon, lat)
-            multipolygon.append((easting, northing))
-
-        # Swap order of coordinates for WFS, as it expects coordinates in (y,x) or (lat,lon) or (northing,easting)
-        multipolygon_str = ",".join(
-            [f"{northing} {easting}" for easting, northing in multipolygon]
-        )
-
-        url = "https://kartta.hel.fi/ws/geoserver/avoindata/wfs"
-        params = {
-            "service": "wfs",
-            "version": "2.0.0",
-            "request": "getFeature",
-            "typeName": "avoindata:Osoiteluettelo_piste_rekisteritiedot",
-            "srsName": "EPSG:4326",
-            "outputFormat": "application/json",
-            "cql_filter": f"intersects(geom,MULTIPOLYGON((({multipolygon_str}))))",
-        }
-        response = requests.get(url, params=params)
-
-        results = response.json()
-        if results["numberReturned"] == 0:
-            params.update({"typeName": "avoindata:Kaupunginosajako"})
-
-            response = requests.get(url, params=params)
-
-            results = response.json()
-
-        address = results["features"][0]["properties"].get("katuosoite", None)
-        district = results["features"][0]["properties"].get(
-            "kaupunginosa_nimi_fi", None
-        )
-
-        if district is None:
-            district = results["features"][0]["properties"].get("nimi_fi", None)
-        return (address, district)
+        return resolve_address_and_district(geometry)
 
     def create(self, validated_data):
         area_form_qs = Form.objects.filter(is_area_form=True)
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.core.management import call_command
+
+from plotsearch.gazetteer import get_transformer, resolve_address_and_district
+from plotsearch.models import GazetteerAddress, GazetteerDistrict
+
+# A 200 x 200 metre district in the Helsinki local coordinate system
+DISTRICT_MIN_X, DISTRICT_MIN_Y = 25496000, 6672000
+DISTRICT_MAX_X, DISTRICT_MAX_Y = 25496200, 6672200
+
+
+def write_geojson(path, features):
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return str(path)
+
+
+def get_area_search_geometry(min_x, min_y, max_x, max_y):
+    """A WGS84 multipolygon of the given rectangle in EPSG:3879"""
+    transformer = get_transformer()
+    ring = [
+        transformer.transform(x, y, direction="INVERSE")
+        for x, y in (
+            (min_x, min_y),
+            (min_x, max_y),
+            (max_x, max_y),
+            (max_x, min_y),
+            (min_x, min_y),
+        )
+    ]
+    return MultiPolygon(Polygon(ring), srid=4326)
+
+
+@pytest.mark.django_db
+def test_load_gazetteer(tmp_path):
+    addresses = write_geojson(
+        tmp_path / "addresses.json",
+        [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [x, y]},
+                "properties": {
+                    "katuosoite": street_address,
+                    "kaupunginosa_nimi_fi": "Testilä",
+                },
+            }
+            for street_address, x, y in (
+                ("Reunakatu 1", DISTRICT_MIN_X + 10, DISTRICT_MIN_Y + 10),
+                ("Keskikatu 1", DISTRICT_MIN_X + 95, DISTRICT_MIN_Y + 95),
+            )
+        ],
+    )
+    districts = write_geojson(
+        tmp_path / "districts.json",
+        [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [
+                            [DISTRICT_MIN_X, DISTRICT_MIN_Y],
+                            [DISTRICT_MIN_X, DISTRICT_MAX_Y],
+                            [DISTRICT_MAX_X, DISTRICT_MAX_Y],
+                            [DISTRICT_MAX_X, DISTRICT_MIN_Y],
+                            [DISTRICT_MIN_X, DISTRICT_MIN_Y],
+                        ]
+                    ],
+                },
+                "properties": {"nimi_fi": "Testilä"},
+            }
+        ],
+    )
+
+    call_command("load_gazetteer", addresses, districts)
+    # Loading again replaces the previous data
+    call_command("load_gazetteer", addresses, districts)
+
+    assert GazetteerAddress.objects.count() == 2
+    assert GazetteerDistrict.objects.count() == 1
+
+    # The address closest to the centre of the area
+    assert resolve_address_and_district(
+        get_area_search_geometry(
+            DISTRICT_MIN_X, DISTRICT_MIN_Y, DISTRICT_MIN_X + 200, DISTRICT_MIN_Y + 200
+        )
+    ) == ("Keskikatu 1", "Testilä")
+
+    # Only the district, when there are no addresses in the area
+    assert resolve_address_and_district(
+        get_area_search_geometry(
+            DISTRICT_MAX_X - 50,
+            DISTRICT_MAX_Y - 50,
+            DISTRICT_MAX_X + 50,
+            DISTRICT_MAX_Y + 50,
+        )
+    ) == (None, "Testilä")
+
+    assert resolve_address_and_district(
+        get_area_search_geometry(
+            DISTRICT_MAX_X + 50,
+            DISTRICT_MAX_Y + 50,
+            DISTRICT_MAX_X + 100,
+            DISTRICT_MAX_Y + 100,
+        )
+    ) == (None, None)
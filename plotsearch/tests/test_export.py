@@ -0,0 +1,96 @@
+import io
+import zipfile
+
+import pytest
+from django.urls import reverse
+
+from leasing.enums import PlotSearchTargetType
+from plotsearch.enums import InformationCheckName
+from plotsearch.export import (
+    AnswerRowCursor,
+    get_form_columns,
+    write_plot_search_answers_xlsx,
+)
+from plotsearch.models import PlotSearchTarget, TargetStatus
+
+
+def test_answer_row_cursor_skips_answers_without_rows():
+    cursor = AnswerRowCursor(
+        iter([(1, "a"), (1, "b"), (3, "c"), (5, "d")]),
+    )
+
+    assert cursor.pop(1) == [(1, "a"), (1, "b")]
+    assert cursor.pop(2) == []
+    assert cursor.pop(5) == [(5, "d")]
+    assert cursor.pop(6) == []
+
+
+@pytest.mark.django_db
+def test_get_form_columns_follows_section_tree(basic_template_form):
+    columns = get_form_columns(basic_template_form)
+
+    field_columns = [column for column in columns if column.field_id is not None]
+    assert len(field_columns) == len(
+        {column.field_id for column in field_columns}
+    ), "Every field should be exported exactly once"
+
+    information_check_columns = [
+        column for column in columns if column.information_check_name is not None
+    ]
+    assert [
+        column.information_check_name for column in information_check_columns
+    ] == list(InformationCheckName)
+
+
+@pytest.mark.django_db
+def test_write_plot_search_answers_xlsx_one_sheet_per_target(
+    django_db_setup,
+    plot_search_test_data,
+    plan_unit_factory,
+    lease_test_data,
+    basic_answer,
+):
+    plot_search_test_data.form = basic_answer.form
+    plot_search_test_data.save()
+
+    for identifier in ("PU1", "PU2"):
+        plot_search_target = PlotSearchTarget.objects.create(
+            plot_search=plot_search_test_data,
+            plan_unit=plan_unit_factory(
+                identifier=identifier,
+                area=1000,
+                lease_area=lease_test_data["lease_area"],
+                is_master=True,
+            ),
+            target_type=PlotSearchTargetType.SEARCHABLE,
+        )
+        TargetStatus.objects.create(
+            plot_search_target=plot_search_target, answer=basic_answer
+        )
+
+    output = io.BytesIO()
+    write_plot_search_answers_xlsx(plot_search_test_data, output)
+
+    with zipfile.ZipFile(output) as xlsx:
+        sheet_names = [
+            name for name in xlsx.namelist() if name.startswith("xl/worksheets/")
+        ]
+        first_sheet = xlsx.read("xl/worksheets/sheet1.xml").decode()
+
+    assert len(sheet_names) == 2
+    assert basic_answer.entry_sections.first().entries.first().value in first_sheet
+
+
+@pytest.mark.django_db
+def test_get_answers_xlsx_is_streamed(
+    django_db_setup, admin_client, plot_search_test_data
+):
+    url = reverse(
+        "v1:plotsearch-get-answers-xlsx", kwargs={"pk": plot_search_test_data.id}
+    )
+
+    response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert zipfile.is_zipfile(io.BytesIO(b"".join(response.streaming_content)))
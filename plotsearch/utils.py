@@ -1,11 +1,13 @@
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from django.conf import settings
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import override
 
 from forms.enums import ApplicantType
+from forms.models import Answer, Entry
 from leasing.enums import ServiceUnitId
 from plotsearch.enums import AreaSearchLessor
 from utils.email import EmailMessageInput, send_email
@@ -15,6 +17,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+APPLICANTS_ATTRIBUTE = "preloaded_applicants"
+
+# The (section identifier, field identifier) pairs of the answer entries that
+# hold the applicant information
+APPLICANT_TYPE_FIELD = ("hakijan-tiedot", "hakija")
+COMPANY_NAME_FIELD = ("yrityksen-tiedot", "yrityksen-nimi")
+FIRST_NAME_FIELD = ("henkilon-tiedot", "etunimi")
+LAST_NAME_FIELD = ("henkilon-tiedot", "Sukunimi")
+
 
 def map_intended_use_to_lessor(
     intended_use: "AreaSearchIntendedUse",
@@ -57,36 +68,86 @@ def map_intended_use_to_service_unit_id(intended_use: "AreaSearchIntendedUse") -
     return map_lessor_enum_to_service_unit_id(lessor)
 
 
-def get_applicant(answer, reservation_recipients):
-    applicant_sections = answer.entry_sections.filter(
-        entries__field__identifier="hakija",
-        entries__field__section__identifier="hakijan-tiedot",
+def _load_applicants(answers: Iterable[Answer]) -> dict[int, list[str]]:
+    """Reads the applicant names of the answers from their entries with one
+    query. The names are returned by answer id."""
+    conditions = Q()
+    for section_identifier, field_identifier in (
+        APPLICANT_TYPE_FIELD,
+        COMPANY_NAME_FIELD,
+        FIRST_NAME_FIELD,
+        LAST_NAME_FIELD,
+    ):
+        conditions |= Q(
+            field__section__identifier=section_identifier,
+            field__identifier=field_identifier,
+        )
+
+    entries = (
+        Entry.objects.filter(conditions, entry_section__answer__in=answers)
+        .order_by("entry_section_id", "id")
+        .values_list(
+            "entry_section__answer_id",
+            "entry_section_id",
+            "field__section__identifier",
+            "field__identifier",
+            "value",
+        )
     )
-    for applicant_section in applicant_sections:
-        applicant_type = applicant_section.entries.get(
-            field__identifier="hakija", field__section__identifier="hakijan-tiedot"
-        ).value
-        if applicant_type == "1":
-            applicants = applicant_section.entries.filter(
-                field__identifier="yrityksen-nimi",
-                field__section__identifier="yrityksen-tiedot",
-            )
-            for applicant in applicants:
-                reservation_recipients.append(applicant.value)
-        elif applicant_type == "2":
-            front_names = applicant_section.entries.filter(
-                field__identifier="etunimi",
-                field__section__identifier="henkilon-tiedot",
-            ).order_by("entry_section")
-            last_names = applicant_section.entries.filter(
-                field__identifier="Sukunimi",
-                field__section__identifier="henkilon-tiedot",
-            ).order_by("entry_section")
-            for idx, front_name in enumerate(front_names):
-                last_name = last_names[idx]
-                reservation_recipients.append(
-                    " ".join([front_name.value, last_name.value])
-                )
+
+    # The entry values of each entry section by (section identifier,
+    # field identifier)
+    entry_sections: dict[tuple[int, int], dict[tuple[str, str], list[str]]] = {}
+    for (
+        answer_id,
+        entry_section_id,
+        section_identifier,
+        field_identifier,
+        value,
+    ) in entries:
+        entry_sections.setdefault((answer_id, entry_section_id), {}).setdefault(
+            (section_identifier, field_identifier), []
+        ).append(value)
+
+    applicants: dict[int, list[str]] = {answer.id: [] for answer in answers}
+    for (answer_id, entry_section_id), values in entry_sections.items():
+        applicant_types = values.get(APPLICANT_TYPE_FIELD)
+        if not applicant_types:
+            continue
+
+        if applicant_types[0] == "1":
+            applicants[answer_id].extend(values.get(COMPANY_NAME_FIELD, []))
+        elif applicant_types[0] == "2":
+            for front_name, last_name in zip(
+                values.get(FIRST_NAME_FIELD, []), values.get(LAST_NAME_FIELD, [])
+            ):
+                applicants[answer_id].append(" ".join([front_name, last_name]))
+
+    return applicants
+
+
+def prefetch_applicants(answers: Iterable[Answer]) -> None:
+    """Loads the applicant names of many answers with one query for
+    `get_applicant`"""
+    answers = [
+        answer
+        for answer in answers
+        if answer is not None and not hasattr(answer, APPLICANTS_ATTRIBUTE)
+    ]
+    if not answers:
+        return
+
+    applicants = _load_applicants(answers)
+    for answer in answers:
+        setattr(answer, APPLICANTS_ATTRIBUTE, applicants[answer.id])
+
+
+def get_applicant(answer, reservation_recipients):
+    if hasattr(answer, APPLICANTS_ATTRIBUTE):
+        reservation_recipients.extend(getattr(answer, APPLICANTS_ATTRIBUTE))
+        return
+
+    reservation_recipients.extend(_load_applicants([answer])[answer.id])
 
 
 def compose_direct_reservation_mail_subject(language):
@@ -1,11 +1,13 @@
 import io
+import tempfile
 import zipfile
 from typing import Any, Dict
 from zipfile import ZipInfo
 
 import xlsxwriter
 from django import http
-from django.http import HttpResponse, QueryDict
+from django.db.models import Prefetch
+from django.http import FileResponse, HttpResponse, QueryDict
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
@@ -21,6 +23,7 @@ from rest_framework_gis.filters import InBBoxFilter
 
 from field_permissions.viewsets import FieldPermissionsViewsetMixin
 from file_operations.errors import FileScanError, FileScanPendingError, FileUnsafeError
+from file_operations.models.filescan import prefetch_latest_scan_results
 from file_operations.viewsets.mixins import (
     FileExtensionFileMixin,
     FileMixin,
@@ -28,7 +31,8 @@ from file_operations.viewsets.mixins import (
 )
 from forms.models import Answer
 from forms.serializers.form import AnswerOpeningRecordSerializer
-from leasing.models import CustomDetailedPlan
+from leasing.models import CustomDetailedPlan, PlanUnit
+from leasing.models.land_area import annotate_master
 from leasing.permissions import (
     MvjDjangoModelPermissions,
     MvjDjangoModelPermissionsOrAnonReadOnly,
@@ -36,6 +40,7 @@ from leasing.permissions import (
 )
 from leasing.viewsets.utils import AtomicTransactionModelViewSet
 from plotsearch.enums import SearchStage
+from plotsearch.export import write_plot_search_answers_xlsx
 from plotsearch.filter import (
     AreaSearchDistrictFilter,
     AreaSearchFilterSet,
@@ -94,7 +99,17 @@ from plotsearch.serializers.plot_search import (
     RelatedPlotApplicationCreateDeleteSerializer,
 )
 from plotsearch.utils import build_pdf_context
-from utils.pdf import PdfMixin
+from utils.pdf import PDFGenerationError, PdfMixin, generate_pdfs
+
+
+def get_plan_unit_master_prefetch():
+    """Prefetches the plan units of the targets with their master ids and
+    timestamps annotated, so that serializing the targets needs no master
+    queries."""
+    return Prefetch(
+        "plot_search_targets__plan_unit",
+        queryset=annotate_master(PlanUnit.objects.all()),
+    )
 
 
 class PlotSearchSubtypeViewSet(
@@ -153,6 +168,7 @@ class PlotSearchViewSet(FieldPermissionsViewsetMixin, AtomicTransactionModelView
     def get_queryset(self):
         qs = super().get_queryset()
         return qs.prefetch_related(
+            get_plan_unit_master_prefetch(),
             "decisions",
             "plot_search_targets__info_links",
             "plot_search_targets__plan_unit__lease_area__lease__decisions__decision_maker",
@@ -179,32 +195,19 @@ class PlotSearchViewSet(FieldPermissionsViewsetMixin, AtomicTransactionModelView
     @action(methods=["get"], detail=True)
     def get_answers_xlsx(self, *args, **kwargs):
         plotsearch = self.get_object()
-        plot_search_targets = plotsearch.plot_search_targets.all()
-
-        output = io.BytesIO()
-
-        workbook = xlsxwriter.Workbook(output)
-        worksheet = workbook.add_worksheet()
-
-        row = 0
-
-        for plot_search_target in plot_search_targets:
-            for target_status in plot_search_target.statuses.all():
-                worksheet, row = target_status.target_status_get_xlsx_page(
-                    worksheet, row
-                )
-
-        workbook.close()
 
+        # The workbook is written to disk and streamed from there, so that
+        # large plot searches never have the whole file in memory.
+        output = tempfile.TemporaryFile()
+        write_plot_search_answers_xlsx(plotsearch, output)
         output.seek(0)
 
-        response = HttpResponse(
+        return FileResponse(
             output,
+            as_attachment=True,
+            filename="Applications.xlsx",
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
-        response["Content-Disposition"] = 'attachment; filename="Applications.xlsx"'
-
-        return response
 
     @action(
         methods=["post"],
@@ -246,6 +249,7 @@ class PlotSearchPublicViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         qs = super().get_queryset()
         return qs.prefetch_related(
+            get_plan_unit_master_prefetch(),
             "plot_search_targets__info_links",
             "plot_search_targets__plan_unit__lease_area__lease__decisions__decision_maker",
             "plot_search_targets__plan_unit__lease_area__lease__decisions__type",
@@ -579,24 +583,28 @@ class TargetStatusGeneratePDF(PdfMixin, FilterView, APIView):
     def render_to_response(
         self, context: Dict[str, Any], **response_kwargs: Any
     ) -> http.HttpResponse:
-        response_kwargs.setdefault("content_type", self.content_type)
         response = HttpResponse(content_type="application/zip")
+        pdf_jobs = (
+            (
+                build_pdf_context(
+                    {
+                        **context,
+                        "object": object,
+                        "plotsearch_info": self._get_plot_search_information(object),
+                    }
+                ),
+                self.get_template_names(),
+            )
+            for object in self.object_list
+        )
+        pdfs = generate_pdfs(pdf_jobs)
         with zipfile.PyZipFile(response, mode="w") as zip_file:
-            for object in self.object_list:
-                context.update(object=object)
-                context.update(
-                    plotsearch_info=self._get_plot_search_information(object)
-                )
-                pdf_response = self.response_class(
-                    request=self.request,
-                    template=self.get_template_names(),
-                    context=build_pdf_context(context),
-                    using=self.template_engine,
-                    **response_kwargs,
-                )
+            for object, pdf in zip(self.object_list, pdfs):
+                if pdf is None:
+                    raise PDFGenerationError("PDF generation failed.")
                 zip_file.writestr(
                     ZipInfo("{}.pdf".format(object.application_identifier)),
-                    pdf_response.render().content,
+                    pdf.getvalue(),
                 )
 
         response["Content-Disposition"] = (
@@ -623,30 +631,48 @@ class AreaSearchGeneratePDF(PdfMixin, FilterView, APIView):
     def render_to_response(
         self, context: Dict[str, Any], **response_kwargs: Any
     ) -> http.HttpResponse:
-        response_kwargs.setdefault("content_type", self.content_type)
         response = HttpResponse(content_type="application/zip")
+        pdf_jobs = (
+            (
+                build_pdf_context(
+                    {
+                        **context,
+                        "object": object,
+                        "information_checks": InformationCheck.objects.filter(
+                            entry_section__in=object.answer.entry_sections.all()
+                        ),
+                    }
+                ),
+                self.get_template_names(),
+            )
+            for object in self.object_list
+        )
+        pdfs = generate_pdfs(pdf_jobs)
+
+        attachments_by_object_id = {}
+        if self.request.GET.get("show_attachments", False):
+            attachments_by_object_id = {
+                object.id: list(object.area_search_attachments.all())
+                for object in self.object_list
+            }
+            # The scan results of all the attachments are read in one query,
+            # instead of once per opened attachment
+            prefetch_latest_scan_results(
+                attachment
+                for attachments in attachments_by_object_id.values()
+                for attachment in attachments
+            )
+
         with zipfile.PyZipFile(response, mode="w") as zip_file:
-            for object in self.object_list:
-                information_checks = InformationCheck.objects.filter(
-                    entry_section__in=object.answer.entry_sections.all()
-                )
-                context.update(
-                    object=object,
-                    information_checks=information_checks,
-                )
-                pdf_response = self.response_class(
-                    request=self.request,
-                    template=self.get_template_names(),
-                    context=build_pdf_context(context),
-                    using=self.template_engine,
-                    **response_kwargs,
-                )
+            for object, pdf in zip(self.object_list, pdfs):
+                if pdf is None:
+                    raise PDFGenerationError("PDF generation failed.")
                 zip_file.writestr(
                     ZipInfo("{}.pdf".format(object.identifier)),
-                    pdf_response.render().content,
+                    pdf.getvalue(),
                 )
                 if self.request.GET.get("show_attachments", False):
-                    for attachment in object.area_search_attachments.all():
+                    for attachment in attachments_by_object_id[object.id]:
                         try:
                             file = attachment.attachment.open()
                             zip_file.writestr(
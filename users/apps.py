@@ -1,13 +1,75 @@
 from django.apps import AppConfig
 from django.contrib.auth import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     name = "users"
 
     def ready(self):
+        from django.contrib.auth.models import Group, Permission
+        from helusers.models import ADGroupMapping
+
+        from leasing.models.service_unit import ServiceUnitGroupMapping
+
         from . import signals
+        from .models import User
 
         user_logged_in.connect(
             signals.user_logged_in, dispatch_uid="users_signals_user_logged_in"
         )
+
+        # The permissions cached across requests are invalidated whenever
+        # the permissions of any user or group change
+        permission_through_models = (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        )
+        for model in (Permission, Group) + permission_through_models:
+            label = model._meta.label_lower
+            post_save.connect(
+                signals.invalidate_permissions,
+                sender=model,
+                dispatch_uid=f"users_signals_invalidate_permissions_save_{label}",
+            )
+            post_delete.connect(
+                signals.invalidate_permissions,
+                sender=model,
+                dispatch_uid=f"users_signals_invalidate_permissions_delete_{label}",
+            )
+        for model in permission_through_models:
+            label = model._meta.label_lower
+            m2m_changed.connect(
+                signals.invalidate_permissions,
+                sender=model,
+                dispatch_uid=f"users_signals_invalidate_permissions_m2m_{label}",
+            )
+
+        # The group mappings cached by the processes are reloaded, and the
+        # groups and service units of the users are synchronised again, when
+        # the mappings change
+        for model in (ADGroupMapping, ServiceUnitGroupMapping):
+            label = model._meta.label_lower
+            post_save.connect(
+                signals.invalidate_group_mappings,
+                sender=model,
+                dispatch_uid=f"users_signals_invalidate_group_mappings_save_{label}",
+            )
+            post_delete.connect(
+                signals.invalidate_group_mappings,
+                sender=model,
+                dispatch_uid=f"users_signals_invalidate_group_mappings_delete_{label}",
+            )
+        for model in (
+            User.ad_groups.through,
+            User.groups.through,
+            User.service_units.through,
+        ):
+            m2m_changed.connect(
+                signals.invalidate_user_sync,
+                sender=model,
+                dispatch_uid="users_signals_invalidate_user_sync_{}".format(
+                    model._meta.label_lower
+                ),
+            )
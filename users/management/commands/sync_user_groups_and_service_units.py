@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from users.models import bump_group_mappings_version
+from users.permissions import bump_permission_generation
+
+# Only the users that have AD groups are synchronised, like at login, so
+# that the managed groups given manually to the local users are kept
+DELETE_UNMAPPED_GROUPS_QUERY = """
+    DELETE FROM users_user_groups ug
+     WHERE ug.group_id IN (SELECT group_id FROM helusers_adgroupmapping)
+       AND EXISTS (SELECT 1
+                     FROM users_user_ad_groups uag
+                    WHERE uag.user_id = ug.user_id)
+       AND NOT EXISTS (SELECT 1
+                         FROM users_user_ad_groups uag
+                              INNER JOIN helusers_adgroupmapping agm
+                              ON agm.ad_group_id = uag.adgroup_id
+                        WHERE uag.user_id = ug.user_id
+                          AND agm.group_id = ug.group_id);
+"""
+
+INSERT_MAPPED_GROUPS_QUERY = """
+    INSERT INTO users_user_groups (user_id, group_id)
+    SELECT DISTINCT uag.user_id, agm.group_id
+      FROM users_user_ad_groups uag
+           INNER JOIN helusers_adgroupmapping agm
+           ON agm.ad_group_id = uag.adgroup_id
+        ON CONFLICT DO NOTHING;
+"""
+
+DELETE_UNMAPPED_SERVICE_UNITS_QUERY = """
+    DELETE FROM users_user_service_units usu
+     WHERE usu.serviceunit_id IN (SELECT service_unit_id
+                                    FROM leasing_serviceunitgroupmapping)
+       AND NOT EXISTS (SELECT 1
+                         FROM users_user_groups ug
+                              INNER JOIN leasing_serviceunitgroupmapping sugm
+                              ON sugm.group_id = ug.group_id
+                        WHERE ug.user_id = usu.user_id
+                          AND sugm.service_unit_id = usu.serviceunit_id);
+"""
+
+INSERT_MAPPED_SERVICE_UNITS_QUERY = """
+    INSERT INTO users_user_service_units (user_id, serviceunit_id)
+    SELECT DISTINCT ug.user_id, sugm.service_unit_id
+      FROM users_user_groups ug
+           INNER JOIN leasing_serviceunitgroupmapping sugm
+           ON sugm.group_id = ug.group_id
+        ON CONFLICT DO NOTHING;
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Synchronise the groups of all users from their AD groups and the service "
+        "units of all users from their groups according to the group mappings"
+    )
+
+    def handle(self, *args, **options):
+        counts = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            for name, query in (
+                ("groups removed", DELETE_UNMAPPED_GROUPS_QUERY),
+                ("groups added", INSERT_MAPPED_GROUPS_QUERY),
+                ("service units removed", DELETE_UNMAPPED_SERVICE_UNITS_QUERY),
+                ("service units added", INSERT_MAPPED_SERVICE_UNITS_QUERY),
+            ):
+                cursor.execute(query)
+                counts[name] = cursor.rowcount
+
+        # The rows were changed without signals, so the synchronisation states
+        # and the permissions cached for the users are invalidated explicitly
+        bump_group_mappings_version()
+        bump_permission_generation()
+
+        self.stdout.write(
+            ", ".join("{} {}".format(count, name) for name, count in counts.items())
+        )
@@ -1,5 +1,8 @@
 from collections import defaultdict
+from dataclasses import dataclass
 from itertools import chain
+from types import MappingProxyType
+from typing import Iterable, Mapping
 
 import django.contrib.auth.models
 from django.contrib import admin
@@ -10,6 +13,94 @@ from helsinki_gdpr.models import SerializableMixin
 from helusers.models import AbstractUser, ADGroupMapping
 from rest_framework.authtoken.models import Token
 
+from utils.cache import bump_cache_version, get_cache_version
+
+GROUP_MAPPINGS_VERSION_CACHE_KEY = "group_mappings_version"
+USER_SYNC_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+
+@dataclass(frozen=True)
+class GroupMappings:
+    """The AD group mappings and the service unit group mappings by id"""
+
+    version: int
+    # Django group ids by AD group id
+    group_ids_by_ad_group_id: Mapping[int, frozenset[int]]
+    # Service unit ids by Django group id
+    service_unit_ids_by_group_id: Mapping[int, frozenset[int]]
+    managed_group_ids: frozenset[int]
+    managed_service_unit_ids: frozenset[int]
+
+    def get_group_ids(self, ad_group_ids: Iterable[int]) -> set[int]:
+        return set().union(
+            *(self.group_ids_by_ad_group_id.get(id, ()) for id in ad_group_ids)
+        )
+
+    def get_service_unit_ids(self, group_ids: Iterable[int]) -> set[int]:
+        return set().union(
+            *(self.service_unit_ids_by_group_id.get(id, ()) for id in group_ids)
+        )
+
+
+_group_mappings: GroupMappings | None = None
+
+
+def get_user_sync_version_key(user_id) -> str:
+    return f"user_sync_{user_id}"
+
+
+def bump_user_sync_version(user_id) -> None:
+    """Makes the groups and service units of the user to be synchronised
+    again in all processes"""
+    bump_cache_version(get_user_sync_version_key(user_id))
+
+
+def bump_group_mappings_version() -> None:
+    """Invalidates the group mappings cached by the processes, and makes the
+    groups and service units of all users to be synchronised again"""
+    bump_cache_version(GROUP_MAPPINGS_VERSION_CACHE_KEY)
+
+
+def get_group_mappings() -> GroupMappings:
+    """Returns the group mappings cached by the process, or reloads them if the
+    mappings have been changed since"""
+    from leasing.models.service_unit import ServiceUnitGroupMapping
+
+    global _group_mappings
+
+    version = get_cache_version(GROUP_MAPPINGS_VERSION_CACHE_KEY)
+    group_mappings = _group_mappings
+    if group_mappings is not None and group_mappings.version == version:
+        return group_mappings
+
+    group_ids_by_ad_group_id = defaultdict(set)
+    for ad_group_id, group_id in ADGroupMapping.objects.values_list(
+        "ad_group_id", "group_id"
+    ):
+        group_ids_by_ad_group_id[ad_group_id].add(group_id)
+
+    service_unit_ids_by_group_id = defaultdict(set)
+    for group_id, service_unit_id in ServiceUnitGroupMapping.objects.values_list(
+        "group_id", "service_unit_id"
+    ):
+        service_unit_ids_by_group_id[group_id].add(service_unit_id)
+
+    group_mappings = GroupMappings(
+        version=version,
+        group_ids_by_ad_group_id=MappingProxyType(
+            {key: frozenset(ids) for key, ids in group_ids_by_ad_group_id.items()}
+        ),
+        service_unit_ids_by_group_id=MappingProxyType(
+            {key: frozenset(ids) for key, ids in service_unit_ids_by_group_id.items()}
+        ),
+        managed_group_ids=frozenset(chain(*group_ids_by_ad_group_id.values())),
+        managed_service_unit_ids=frozenset(
+            chain(*service_unit_ids_by_group_id.values())
+        ),
+    )
+    _group_mappings = group_mappings
+    return group_mappings
+
 
 class OfficerUserManager(models.Manager):
     def get_queryset(self):
@@ -81,57 +172,101 @@ class User(AbstractUser, SerializableMixin):
     def has_token(self) -> bool:
         return Token.objects.filter(user=self).exists()
 
+    @staticmethod
+    def get_sync_cache_keys(user_id) -> tuple[str, str]:
+        """The cache keys of the group mapping and user sync versions that the
+        AD groups and the service units of the user were last synchronised
+        with"""
+        return (
+            f"sync_groups_from_ad_{user_id}",
+            f"update_service_units_{user_id}",
+        )
+
+    def get_sync_version(self, mappings: GroupMappings) -> tuple[int, int]:
+        """The versions of the group mappings and the AD groups, groups and
+        service units of the user. The versions are changed in all processes
+        when the mappings or the relations of the user change."""
+        return (
+            mappings.version,
+            get_cache_version(get_user_sync_version_key(self.id)),
+        )
+
     def sync_groups_from_ad(self):
         """Determine which Django groups to add or remove based on AD groups
 
-        Supports setting multiple Django groups by one AD group"""
-        cache_key = f"sync_groups_from_ad_{self.id}"
-        if cache.get(cache_key):
+        Supports setting multiple Django groups by one AD group. Nothing is
+        done if the groups have been synchronised with the current group
+        mappings and the AD groups of the user have not changed since."""
+        mappings = get_group_mappings()
+        sync_version = self.get_sync_version(mappings)
+        cache_key = self.get_sync_cache_keys(self.id)[0]
+        if cache.get(cache_key) == sync_version:
             return
 
-        cache.set(cache_key, True, timeout=600)  # 10 minutes
+        ad_group_ids = self.ad_groups.values_list("id", flat=True)
+        new_group_ids = mappings.get_group_ids(ad_group_ids)
+        old_group_ids = set(
+            self.groups.filter(id__in=mappings.managed_group_ids).values_list(
+                "id", flat=True
+            )
+        )
+
+        group_ids_to_delete = old_group_ids.difference(new_group_ids)
+        if group_ids_to_delete:
+            self.groups.remove(*group_ids_to_delete)
 
-        ad_group_mappings = ADGroupMapping.objects.select_related("ad_group", "group")
-        mappings = defaultdict(list)
-        for ad_group_mapping in ad_group_mappings:
-            mappings[ad_group_mapping.ad_group].append(ad_group_mapping.group)
+        group_ids_to_add = new_group_ids.difference(old_group_ids)
+        if group_ids_to_add:
+            self.groups.add(*group_ids_to_add)
 
-        user_ad_groups = set(self.ad_groups.filter(groups__isnull=False))
-        managed_groups = set(chain(*mappings.values()))
-        old_groups = set(
-            self.groups.filter(id__in=[group.id for group in managed_groups])
+        # The changes above bump the version of the user themselves, which
+        # is known when they are committed
+        transaction.on_commit(
+            lambda: cache.set(
+                cache_key,
+                self.get_sync_version(mappings),
+                timeout=USER_SYNC_CACHE_TIMEOUT,
+            )
         )
-        new_groups = set(chain(*[mappings[x] for x in user_ad_groups if x in mappings]))
 
-        groups_to_delete = old_groups.difference(new_groups)
-        if groups_to_delete:
-            self.groups.remove(*groups_to_delete)
+    def update_service_units(self):
+        """Updates users Service Units according to Service Unit Group Mappings
 
-        groups_to_add = new_groups.difference(old_groups)
-        if groups_to_add:
-            self.groups.add(*groups_to_add)
+        Nothing is done if the service units have been updated with the current
+        group mappings and the groups of the user have not changed since."""
+        mappings = get_group_mappings()
+        sync_version = self.get_sync_version(mappings)
+        cache_key = self.get_sync_cache_keys(self.id)[1]
+        if cache.get(cache_key) == sync_version:
+            return
 
-    @transaction.atomic
-    def update_service_units(self):
-        """Updates users Service Units according to Service Unit Group Mappings"""
-        from leasing.models.service_unit import ServiceUnitGroupMapping
-
-        group_mappings = {
-            mapping.group: mapping.service_unit
-            for mapping in ServiceUnitGroupMapping.objects.all()
-        }
-        managed_service_units = set(group_mappings.values())
-        old_service_units = set(
-            self.service_units.filter(id__in=[s.id for s in managed_service_units])
-        )
-        new_service_units = set(
-            [group_mappings[x] for x in self.groups.all() if x in group_mappings]
-        )
+        with transaction.atomic():
+            group_ids = self.groups.values_list("id", flat=True)
+            new_service_unit_ids = mappings.get_service_unit_ids(group_ids)
+            old_service_unit_ids = set(
+                self.service_units.filter(
+                    id__in=mappings.managed_service_unit_ids
+                ).values_list("id", flat=True)
+            )
 
-        service_units_to_delete = old_service_units.difference(new_service_units)
-        if service_units_to_delete:
-            self.service_units.remove(*service_units_to_delete)
+            service_unit_ids_to_delete = old_service_unit_ids.difference(
+                new_service_unit_ids
+            )
+            if service_unit_ids_to_delete:
+                self.service_units.remove(*service_unit_ids_to_delete)
 
-        service_units_to_add = new_service_units.difference(old_service_units)
-        if service_units_to_add:
-            self.service_units.add(*service_units_to_add)
+            service_unit_ids_to_add = new_service_unit_ids.difference(
+                old_service_unit_ids
+            )
+            if service_unit_ids_to_add:
+                self.service_units.add(*service_unit_ids_to_add)
+
+            # The changes above bump the version of the user themselves, which
+            # is known when they are committed
+            transaction.on_commit(
+                lambda: cache.set(
+                    cache_key,
+                    self.get_sync_version(mappings),
+                    timeout=USER_SYNC_CACHE_TIMEOUT,
+                )
+            )
@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from django.db import DatabaseError, IntegrityError
 from helusers.authz import UserAuthorization
 from helusers.oidc import ApiTokenAuthentication
@@ -14,16 +13,13 @@ class MvjApiTokenAuthentication(ApiTokenAuthentication):
             return
 
         user, auth = result
-        # Update users service units every 10 minutes
+        # The service units are only updated if the group mappings or the
+        # groups of the user have changed since the last update
         if user and user.id:
-            cache_key = f"service_units_updated_user_{user.id}"
-            cache_value = cache.get(cache_key)
-            if not cache_value:
-                # Set cache before `update_service_units()` to prevent multiple updates
-                cache.set(cache_key, True, timeout=600)  # 10 minutes
-                try:
-                    user.update_service_units()
-                except (IntegrityError, DatabaseError):
-                    cache.delete(cache_key)
+            try:
+                user.update_service_units()
+            except (IntegrityError, DatabaseError):
+                # The update is retried on the next request
+                pass
 
         return user, auth
@@ -0,0 +1,65 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db.models import Q
+
+from utils.cache import bump_cache_version, get_cache_version
+
+PERMISSION_GENERATION_CACHE_KEY = "permission_generation"
+USER_PERMISSIONS_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+# (app label, codename, name)
+PermissionEntry = tuple[str, str, str]
+
+
+def get_permission_generation() -> int:
+    """The generation of the permissions, which is changed whenever the
+    permissions of any user or group change"""
+    return get_cache_version(PERMISSION_GENERATION_CACHE_KEY)
+
+
+def bump_permission_generation() -> None:
+    """Invalidates the cached permissions of all users"""
+    bump_cache_version(PERMISSION_GENERATION_CACHE_KEY)
+
+
+def get_user_permission_entries(user) -> tuple[PermissionEntry, ...]:
+    """Returns the permissions of the user and their groups, or all the
+    permissions for superusers.
+
+    The permissions are cached across requests by the user id and the
+    permission generation."""
+    cache_key = "user_permissions_{}_{}_{}".format(
+        get_permission_generation(), user.id, int(user.is_superuser)
+    )
+    entries = cache.get(cache_key)
+    if entries is not None:
+        return entries
+
+    permissions = Permission.objects.all()
+    if not user.is_superuser:
+        permissions = permissions.filter(Q(user=user) | Q(group__user=user))
+
+    entries = tuple(
+        permissions.values_list("content_type__app_label", "codename", "name")
+        .order_by("content_type__app_label", "codename")
+        .distinct()
+    )
+    cache.set(cache_key, entries, timeout=USER_PERMISSIONS_CACHE_TIMEOUT)
+    return entries
+
+
+class CachedPermissionsModelBackend(ModelBackend):
+    """ModelBackend that reads the permissions of the user from the
+    cross-request permission cache instead of the database"""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = {
+                "{}.{}".format(app_label, codename)
+                for app_label, codename, _name in get_user_permission_entries(user_obj)
+            }
+        return user_obj._perm_cache
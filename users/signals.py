@@ -1,2 +1,40 @@
+from .permissions import bump_permission_generation
+
+
 def user_logged_in(sender, user, **kwargs):
     user.update_service_units()
+
+
+def invalidate_permissions(sender, action=None, **kwargs):
+    # m2m_changed is sent both before and after the change
+    if action is not None and not action.startswith("post_"):
+        return
+
+    bump_permission_generation()
+
+
+def invalidate_group_mappings(sender, **kwargs):
+    from .models import bump_group_mappings_version
+
+    bump_group_mappings_version()
+
+
+def invalidate_user_sync(sender, instance, action, reverse, pk_set, **kwargs):
+    """Makes the groups and the service units of the users to be synchronised
+    again when their AD groups, groups or service units change"""
+    from .models import bump_group_mappings_version, bump_user_sync_version
+
+    if not action.startswith("post_"):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+    elif pk_set is not None:
+        user_ids = pk_set
+    else:
+        # All the users of the group were removed
+        bump_group_mappings_version()
+        return
+
+    for user_id in user_ids:
+        bump_user_sync_version(user_id)
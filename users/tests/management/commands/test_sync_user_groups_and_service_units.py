@@ -0,0 +1,41 @@
+import pytest
+from django.core.management import call_command
+from helusers.models import ADGroup, ADGroupMapping
+
+
+@pytest.mark.django_db
+def test_sync_user_groups_and_service_units(
+    user_factory,
+    group_factory,
+    service_unit_factory,
+    service_unit_group_mapping_factory,
+):
+    ad_group = ADGroup.objects.create(name="ad_group", display_name="AD group")
+    mapped_group = group_factory(name="Mapped")
+    removed_group = group_factory(name="Removed")
+    ADGroupMapping.objects.create(ad_group=ad_group, group=mapped_group)
+    ADGroupMapping.objects.create(
+        ad_group=ADGroup.objects.create(name="other", display_name="Other"),
+        group=removed_group,
+    )
+    service_unit = service_unit_factory()
+    removed_service_unit = service_unit_factory()
+    service_unit_group_mapping_factory(group=mapped_group, service_unit=service_unit)
+    service_unit_group_mapping_factory(
+        group=removed_group, service_unit=removed_service_unit
+    )
+
+    ad_user = user_factory(username="ad_user")
+    ad_user.ad_groups.add(ad_group)
+    ad_user.groups.add(removed_group)
+    ad_user.service_units.add(removed_service_unit)
+    # The managed groups of the users without AD groups are kept
+    local_user = user_factory(username="local_user")
+    local_user.groups.add(removed_group)
+
+    call_command("sync_user_groups_and_service_units")
+
+    assert set(ad_user.groups.all()) == {mapped_group}
+    assert set(ad_user.service_units.all()) == {service_unit}
+    assert set(local_user.groups.all()) == {removed_group}
+    assert set(local_user.service_units.all()) == {removed_service_unit}
@@ -0,0 +1,32 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+
+from users.permissions import get_user_permission_entries
+
+
+@pytest.mark.django_db
+def test_permissions_are_cached_across_requests(
+    django_assert_num_queries, django_capture_on_commit_callbacks, user_factory
+):
+    user = user_factory()
+    group = Group.objects.create(name="Permission cache test group")
+    user.groups.add(group)
+    group.permissions.add(Permission.objects.get(codename="view_lease"))
+
+    assert user.has_perm("leasing.view_lease")
+
+    # A new user object, like in the next request
+    user = type(user).objects.get(pk=user.pk)
+    with django_assert_num_queries(0):
+        assert user.has_perm("leasing.view_lease")
+        assert not user.has_perm("leasing.change_lease")
+
+    # Changing the group permissions invalidates the cache when committed
+    with django_capture_on_commit_callbacks(execute=True):
+        group.permissions.add(Permission.objects.get(codename="change_lease"))
+    user = type(user).objects.get(pk=user.pk)
+    assert user.has_perm("leasing.change_lease")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.remove(group)
+    assert get_user_permission_entries(user) == ()
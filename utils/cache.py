@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+from utils.models import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+# The PostgreSQL channel that the new cache versions are notified on
+CACHE_INVALIDATION_CHANNEL = "mvj_cache_invalidation"
+# How long a version is trusted without the listener, in seconds
+CACHE_VERSION_POLL_INTERVAL = 5
+# How long the listener waits before reconnecting after an error, in seconds
+CACHE_VERSION_LISTENER_RECONNECT_DELAY = 10
+
+# The versions known by the process: key -> (version, time checked)
+_versions: dict[str, tuple[int, float]] = {}
+_versions_lock = threading.Lock()
+_versions_pid: int | None = None
+_listening = False
+
+BUMP_CACHE_VERSION_QUERY = """
+    INSERT INTO {table} (key, version)
+    VALUES (%s, %s)
+        ON CONFLICT (key) DO UPDATE
+       SET version = {table}.version + 1
+ RETURNING version;
+"""
+
+
+def _set_local_version(key: str, version: int) -> int:
+    with _versions_lock:
+        # The versions only grow, so a version read from the table before a
+        # newer one was notified is ignored
+        entry = _versions.get(key)
+        if entry is not None and entry[0] > version:
+            version = entry[0]
+        _versions[key] = (version, time.monotonic())
+    return version
+
+
+def _listen() -> None:
+    """Applies the versions notified by the other processes until the process
+    exits. The connection is reopened if it is lost, and the versions are
+    polled from the table in the meantime."""
+    global _listening
+
+    while True:
+        wrapper = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            wrapper.ensure_connection()
+            wrapper.connection.execute("LISTEN {}".format(CACHE_INVALIDATION_CHANNEL))
+            with _versions_lock:
+                # The notifications sent before listening are not received
+                _versions.clear()
+                _listening = True
+
+            for notify in wrapper.connection.notifies():
+                key, _separator, version = notify.payload.rpartition(":")
+                _set_local_version(key, int(version))
+        except Exception:
+            logger.exception("Cache version listener failed")
+        finally:
+            with _versions_lock:
+                _listening = False
+            wrapper.close()
+
+        time.sleep(CACHE_VERSION_LISTENER_RECONNECT_DELAY)
+
+
+def _ensure_listener() -> None:
+    """Starts the listener of the process, unless it has been started already.
+
+    The process id is checked, as the forked workers inherit neither the
+    thread nor the connection of their parent process."""
+    global _versions_pid, _listening
+
+    pid = os.getpid()
+    with _versions_lock:
+        if _versions_pid == pid:
+            return
+        _versions_pid = pid
+        _versions.clear()
+        _listening = False
+
+    if settings.CACHE_VERSION_LISTENER_ENABLED and connection.vendor == "postgresql":
+        threading.Thread(
+            target=_listen, name="cache-version-listener", daemon=True
+        ).start()
+
+
+def reset_local_cache_versions() -> None:
+    """Forgets the versions known by the process, e.g. between tests"""
+    with _versions_lock:
+        _versions.clear()
+
+
+def get_cache_version(key: str) -> int:
+    """Returns the version counter with the key.
+
+    The counter is used as a part of the keys of other cached values, or
+    stored with them, so that all of them are invalidated at once by
+    `bump_cache_version` in any process.
+
+    The counters are stored in the database. The process keeps the versions
+    it has read, and the listener thread updates them when the other
+    processes notify of a new version. If the listener is not connected,
+    the versions are read from the database again after
+    `CACHE_VERSION_POLL_INTERVAL` seconds."""
+    _ensure_listener()
+
+    with _versions_lock:
+        entry = _versions.get(key)
+        if entry is not None and (
+            _listening or time.monotonic() - entry[1] < CACHE_VERSION_POLL_INTERVAL
+        ):
+            return entry[0]
+
+    version = (
+        CacheVersion.objects.filter(key=key).values_list("version", flat=True).first()
+    )
+    return _set_local_version(key, version or 0)
+
+
+def bump_cache_version(key: str) -> None:
+    """Changes the version counter with the key. The process and the other
+    processes use the new version when the transaction is committed."""
+    with connection.cursor() as cursor:
+        # A new counter starts from the current time, so that the values
+        # cached with an earlier, deleted counter are never reused
+        cursor.execute(
+            BUMP_CACHE_VERSION_QUERY.format(table=CacheVersion._meta.db_table),
+            [key, time.time_ns()],
+        )
+        version = cursor.fetchone()[0]
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT pg_notify(%s, %s);",
+                [CACHE_INVALIDATION_CHANNEL, "{}:{}".format(key, version)],
+            )
+
+    # Like the other processes, the threads of this process use the new
+    # version only once it is committed, so that a rolled back version is
+    # never used
+    transaction.on_commit(lambda: _set_local_version(key, version))
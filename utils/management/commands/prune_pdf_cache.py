@@ -0,0 +1,26 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from utils.pdf import prune_pdf_cache
+
+
+class Command(BaseCommand):
+    help = """Remove cached PDFs that have not been written within the given number of days.
+    Entries of modified answers are never read again, as their cache key changes."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Remove cached PDFs older than this many days",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - datetime.timedelta(days=options["days"])
+        removed_count = prune_pdf_cache(older_than)
+        self.stdout.write(
+            self.style.SUCCESS(f"Removed {removed_count} cached PDF files.")
+        )
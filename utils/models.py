@@ -0,0 +1,20 @@
+from django.db import models
+from django.utils.translation import pgettext_lazy
+
+
+class CacheVersion(models.Model):
+    """
+    A version counter of the values cached by the processes. Changed by
+    `utils.cache.bump_cache_version`, which notifies the other processes of
+    the new version on the `mvj_cache_invalidation` channel.
+    """
+
+    key = models.CharField(primary_key=True, max_length=255)
+    version = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = pgettext_lazy("Model name", "Cache version")
+        verbose_name_plural = pgettext_lazy("Model name", "Cache versions")
+
+    def __str__(self):
+        return "{} {}".format(self.key, self.version)
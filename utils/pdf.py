@@ -1,10 +1,21 @@
+import datetime
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
-from typing import Any
+from typing import Any, Iterable
 
+from django.conf import settings
+from django.core.files.base import ContentFile
 from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
 from xhtml2pdf import pisa
 
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_DIRECTORY = "pdf_cache"
+
 
 class PDFGenerationError(Exception):
     pass
@@ -25,10 +36,179 @@ def generate_pdf(context: dict[str, Any], template_name: str) -> BytesIO:
     return output
 
 
+def _render_pdf_from_html(html_source: str) -> bytes:
+    """Converts rendered HTML to PDF. Runs in the rendering worker processes,
+    so it must not touch the database or Django settings."""
+    output = BytesIO()
+    pisa_status = pisa.CreatePDF(html_source, dest=output)
+    if pisa_status.err:
+        raise PDFGenerationError("PDF generation failed.")
+    return output.getvalue()
+
+
+def get_pdf_cache_key(template_name: str | list[str], html_source: str) -> str:
+    """The rendered HTML is fully determined by the template and the rendering
+    context, so its hash addresses the PDF. A change in the source answer
+    changes the HTML and thereby the key, and a stale PDF is never served."""
+    digest = hashlib.sha256()
+    digest.update(str(template_name).encode())
+    digest.update(b"\0")
+    digest.update(html_source.encode())
+    return digest.hexdigest()
+
+
+def _get_pdf_cache_storage():
+    if getattr(settings, "FLAG_PDF_CACHE", False) is not True:
+        return None
+
+    from file_operations.private_files import PrivateFileSystemStorage
+
+    return PrivateFileSystemStorage()
+
+
+def _get_pdf_cache_path(cache_key: str) -> str:
+    return "/".join([PDF_CACHE_DIRECTORY, cache_key[:2], "{}.pdf".format(cache_key)])
+
+
+def _read_cached_pdf(storage, cache_key: str) -> bytes | None:
+    if storage is None:
+        return None
+    path = _get_pdf_cache_path(cache_key)
+    if not storage.exists(path):
+        return None
+    with storage.open(path, "rb") as cached_file:
+        return cached_file.read()
+
+
+def _write_cached_pdf(storage, cache_key: str, pdf: bytes) -> None:
+    if storage is None:
+        return
+    path = _get_pdf_cache_path(cache_key)
+    if storage.exists(path):
+        return
+    try:
+        storage.save(path, ContentFile(pdf))
+    except OSError as e:
+        # Caching is an optimisation, a failed write must not fail the request
+        logger.warning(f"Failed to write PDF cache file {path}: {e}")
+
+
+def prune_pdf_cache(older_than: datetime.datetime) -> int:
+    """Deletes cached PDFs written before `older_than`. Returns the number of
+    deleted files."""
+    storage = _get_pdf_cache_storage()
+    if storage is None or not storage.exists(PDF_CACHE_DIRECTORY):
+        return 0
+
+    removed_count = 0
+    directories, _files = storage.listdir(PDF_CACHE_DIRECTORY)
+    for directory in directories:
+        directory_path = "/".join([PDF_CACHE_DIRECTORY, directory])
+        _subdirectories, filenames = storage.listdir(directory_path)
+        for filename in filenames:
+            path = "/".join([directory_path, filename])
+            if storage.get_modified_time(path) < older_than:
+                storage.delete(path)
+                removed_count += 1
+    return removed_count
+
+
+def _render_pdfs_in_process(html_sources: dict[str, str]) -> dict[str, bytes | None]:
+    rendered_pdfs: dict[str, bytes | None] = {}
+    for cache_key, html_source in html_sources.items():
+        try:
+            rendered_pdfs[cache_key] = _render_pdf_from_html(html_source)
+        except PDFGenerationError as e:
+            logger.error(f"PDF generation failed: {e}")
+            rendered_pdfs[cache_key] = None
+    return rendered_pdfs
+
+
+def _render_pdfs_in_worker_pool(
+    html_sources: dict[str, str], max_workers: int
+) -> dict[str, bytes | None]:
+    # Spawned workers do not inherit the database connections or locks of
+    # the calling process
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            cache_key: executor.submit(_render_pdf_from_html, html_source)
+            for cache_key, html_source in html_sources.items()
+        }
+
+        rendered_pdfs: dict[str, bytes | None] = {}
+        for cache_key, future in futures.items():
+            try:
+                rendered_pdfs[cache_key] = future.result()
+            except PDFGenerationError as e:
+                logger.error(f"PDF generation failed: {e}")
+                rendered_pdfs[cache_key] = None
+    return rendered_pdfs
+
+
+def generate_pdfs(
+    jobs: Iterable[tuple[dict[str, Any], str | list[str]]],
+    max_workers: int = 1,
+) -> list[BytesIO | None]:
+    """Generates PDFs for (context, template_name) pairs in the given order.
+    The PDFs that fail to generate are None, and the rest are still returned.
+
+    The HTML is rendered in the calling process, because rendering the
+    templates reads the database. PDFs found in the cache are returned
+    directly and the rest are converted and stored to the cache.
+
+    The PDFs are converted in the calling process, unless `max_workers` is
+    more than one. The worker pool is meant for the background tasks only:
+    starting the worker interpreters costs more than it saves in a request,
+    and under uWSGI `sys.executable` is not a Python interpreter. The workers
+    can't be started from a daemonic process either, e.g. a django-q worker
+    with `daemonize_workers` enabled, so the PDFs are converted in the
+    process then."""
+    storage = _get_pdf_cache_storage()
+
+    cache_keys: list[str] = []
+    pdfs: list[bytes | None] = []
+    html_sources_to_render: dict[str, str] = {}
+    for context, template_name in jobs:
+        html_source = render_to_string(template_name, context=context)
+        cache_key = get_pdf_cache_key(template_name, html_source)
+        cached_pdf = _read_cached_pdf(storage, cache_key)
+        if cached_pdf is None:
+            html_sources_to_render[cache_key] = html_source
+        cache_keys.append(cache_key)
+        pdfs.append(cached_pdf)
+
+    max_workers = min(max_workers, len(html_sources_to_render))
+    if max_workers > 1 and not multiprocessing.current_process().daemon:
+        rendered_pdfs = _render_pdfs_in_worker_pool(html_sources_to_render, max_workers)
+    else:
+        rendered_pdfs = _render_pdfs_in_process(html_sources_to_render)
+
+    for cache_key, pdf in rendered_pdfs.items():
+        if pdf is not None:
+            _write_cached_pdf(storage, cache_key, pdf)
+
+    outputs: list[BytesIO | None] = []
+    for cache_key, cached_pdf in zip(cache_keys, pdfs):
+        pdf = cached_pdf or rendered_pdfs[cache_key]
+        outputs.append(BytesIO(pdf) if pdf is not None else None)
+    return outputs
+
+
+def generate_cached_pdf(
+    context: dict[str, Any], template_name: str | list[str]
+) -> BytesIO:
+    pdf = generate_pdfs([(context, template_name)])[0]
+    if pdf is None:
+        raise PDFGenerationError("PDF generation failed.")
+    return pdf
+
+
 class PdfResponse(TemplateResponse):
     def render(self):
         retval = super(PdfResponse, self).render()
-        pdf = generate_pdf(self.context_data, self.template_name)
+        pdf = generate_cached_pdf(self.context_data, self.template_name)
         self.content = pdf.getvalue()
         return retval
 
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import bump_cache_version, get_cache_version
+from utils.models import CacheVersion
+
+
+@pytest.mark.django_db
+def test_get_cache_version_of_missing_counter():
+    assert get_cache_version("test_counter") == 0
+
+
+@pytest.mark.django_db
+def test_bump_cache_version(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_cache_version("test_counter")
+    version = CacheVersion.objects.get(key="test_counter").version
+    assert version > 0
+
+    # The bumped version is known by the process without reading it back
+    with django_assert_num_queries(0):
+        assert get_cache_version("test_counter") == version
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_cache_version("test_counter")
+    assert get_cache_version("test_counter") == version + 1
+
+
+@pytest.mark.django_db
+def test_bumped_cache_version_is_used_when_committed(
+    django_capture_on_commit_callbacks,
+):
+    assert get_cache_version("test_counter") == 0
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        bump_cache_version("test_counter")
+    assert get_cache_version("test_counter") == 0
+
+    callbacks[0]()
+    assert get_cache_version("test_counter") > 0
+
+
+@pytest.mark.django_db
+def test_get_cache_version_polls_changes_of_other_processes():
+    assert get_cache_version("test_counter") == 0
+
+    # Changed by another process
+    CacheVersion.objects.create(key="test_counter", version=10)
+    assert get_cache_version("test_counter") == 0
+
+    with patch.object(cache_module, "CACHE_VERSION_POLL_INTERVAL", 0):
+        assert get_cache_version("test_counter") == 10
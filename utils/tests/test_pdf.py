@@ -5,7 +5,7 @@ import pytest
 from django.template import Context, Template
 from pypdf import PdfReader  # via xhtml2pdf
 
-from utils.pdf import PDFGenerationError, generate_pdf
+from utils.pdf import PDFGenerationError, generate_pdf, generate_pdfs
 
 
 @pytest.fixture
@@ -61,3 +61,70 @@ def test_generate_pdf_failure(mock_render_to_string, mock_create_pdf):
 
     mock_render_to_string.assert_called_once_with(template_name, context=context)
     mock_create_pdf.assert_called_once()
+
+
+def test_generate_pdfs_reuses_cached_pdf(monkeypatch, tmp_path, settings):
+    settings.FLAG_PDF_CACHE = True
+    settings.PRIVATE_FILES_LOCATION = str(tmp_path)
+
+    template = Template("<html><body>Test {{ key }}</body></html>")
+
+    def mock_render_to_string(template_name, context):
+        return template.render(Context(context))
+
+    monkeypatch.setattr("utils.pdf.render_to_string", mock_render_to_string)
+    render_pdf_from_html = MagicMock(return_value=b"%PDF-kangaroo")
+    monkeypatch.setattr("utils.pdf._render_pdf_from_html", render_pdf_from_html)
+
+    jobs = [({"key": "kangaroo"}, "test_pdf.html"), ({"key": "koala"}, "test_pdf.html")]
+    first_pdfs = generate_pdfs(jobs)
+    second_pdfs = generate_pdfs(jobs)
+
+    assert render_pdf_from_html.call_count == 2
+    assert [pdf.getvalue() for pdf in first_pdfs] == [
+        pdf.getvalue() for pdf in second_pdfs
+    ]
+
+    assert generate_pdfs([({"key": "wombat"}, "test_pdf.html")])
+    assert render_pdf_from_html.call_count == 3
+
+
+def test_generate_pdfs_without_cache(monkeypatch, settings):
+    settings.FLAG_PDF_CACHE = False
+
+    monkeypatch.setattr(
+        "utils.pdf.render_to_string", MagicMock(return_value="<html></html>")
+    )
+    render_pdf_from_html = MagicMock(return_value=b"%PDF")
+    monkeypatch.setattr("utils.pdf._render_pdf_from_html", render_pdf_from_html)
+
+    generate_pdfs([({}, "test_pdf.html")])
+    generate_pdfs([({}, "test_pdf.html")])
+
+    assert render_pdf_from_html.call_count == 2
+
+
+def test_generate_pdfs_returns_none_for_failed_pdfs(monkeypatch, tmp_path, settings):
+    settings.FLAG_PDF_CACHE = True
+    settings.PRIVATE_FILES_LOCATION = str(tmp_path)
+
+    monkeypatch.setattr(
+        "utils.pdf.render_to_string",
+        lambda template_name, context: "<html>{}</html>".format(context["key"]),
+    )
+
+    def render_pdf_from_html(html_source):
+        if "koala" in html_source:
+            raise PDFGenerationError("PDF generation failed.")
+        return b"%PDF"
+
+    monkeypatch.setattr("utils.pdf._render_pdf_from_html", render_pdf_from_html)
+
+    jobs = [({"key": "kangaroo"}, "test_pdf.html"), ({"key": "koala"}, "test_pdf.html")]
+    pdfs = generate_pdfs(jobs)
+    assert pdfs[0].getvalue() == b"%PDF"
+    assert pdfs[1] is None
+
+    # The failed PDF is not cached
+    monkeypatch.setattr("utils.pdf._render_pdf_from_html", lambda html: b"%PDF")
+    assert generate_pdfs(jobs)[1].getvalue() == b"%PDF"